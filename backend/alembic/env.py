@@ -17,6 +17,11 @@ from app.core.config import settings
 
 # Import all models so Alembic can detect them
 from app.models.reminder import Reminder
+from app.models.rate_limit import RateLimitBucket
+from app.models.call_dispatch import CallDispatch
+from app.models.webhook_event import WebhookEvent
+from app.models.processed_webhook_event import ProcessedWebhookEvent
+from app.models.reminder_import import ReminderImport
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,30 @@
+"""Add rate_limit_buckets table
+
+Revision ID: 4c9e2b7f1a58
+Revises: d81f5a0c6e27
+Create Date: 2026-10-17 11:26:52.317940
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c9e2b7f1a58'
+down_revision = 'd81f5a0c6e27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('rate_limit_buckets',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('tokens', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('paused_until', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rate_limit_buckets')
@@ -0,0 +1,33 @@
+"""Add call status check columns to reminders
+
+Revision ID: 7a3f9c1e5b20
+Revises: 4c9e2b7f1a58
+Create Date: 2026-10-17 12:40:08.526193
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a3f9c1e5b20'
+down_revision = '4c9e2b7f1a58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('reminders', sa.Column('call_placed_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('reminders', sa.Column('status_check_at', sa.DateTime(timezone=True), nullable=True))
+    # Calls already placed and still waiting for a webhook get checked right away
+    op.execute(
+        "UPDATE reminders SET call_placed_at = COALESCE(updated_at, created_at), status_check_at = now() "
+        "WHERE status = 'SCHEDULED' AND vapi_call_id IS NOT NULL AND next_attempt_at IS NULL"
+    )
+    op.create_index(op.f('ix_reminders_status_check_at'), 'reminders', ['status_check_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_reminders_status_check_at'), table_name='reminders')
+    op.drop_column('reminders', 'status_check_at')
+    op.drop_column('reminders', 'call_placed_at')
@@ -0,0 +1,45 @@
+"""Add call_dispatches table
+
+Revision ID: 9b6e1f4c2d73
+Revises: e52d8b3f6a91
+Create Date: 2026-10-17 15:22:47.610358
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '9b6e1f4c2d73'
+down_revision = 'e52d8b3f6a91'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('call_dispatches',
+    sa.Column('idempotency_key', sa.String(length=100), nullable=False),
+    sa.Column('reminder_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('attempt', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('provider', sa.String(length=20), nullable=True),
+    sa.Column('call_id', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['reminder_id'], ['reminders.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('idempotency_key')
+    )
+    op.create_index(op.f('ix_call_dispatches_reminder_id'), 'call_dispatches', ['reminder_id'], unique=False)
+    op.create_index(op.f('ix_call_dispatches_created_at'), 'call_dispatches', ['created_at'], unique=False)
+    op.create_index(
+        'uq_call_dispatches_in_flight', 'call_dispatches', ['reminder_id'], unique=True,
+        postgresql_where=sa.text("status IN ('pending', 'unknown')")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_call_dispatches_in_flight', table_name='call_dispatches')
+    op.drop_index(op.f('ix_call_dispatches_created_at'), table_name='call_dispatches')
+    op.drop_index(op.f('ix_call_dispatches_reminder_id'), table_name='call_dispatches')
+    op.drop_table('call_dispatches')
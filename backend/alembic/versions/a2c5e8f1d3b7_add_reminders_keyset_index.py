@@ -0,0 +1,27 @@
+"""Index reminders by (scheduled_datetime, id) for keyset pagination
+
+Revision ID: a2c5e8f1d3b7
+Revises: f18b3d6e9a42
+Create Date: 2026-10-17 19:12:09.518302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2c5e8f1d3b7'
+down_revision = 'f18b3d6e9a42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_reminders_scheduled_datetime_id', 'reminders', ['scheduled_datetime', 'id'], unique=False)
+    # The composite index serves every lookup the single-column one did
+    op.drop_index(op.f('ix_reminders_scheduled_datetime'), table_name='reminders')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_reminders_scheduled_datetime'), 'reminders', ['scheduled_datetime'], unique=False)
+    op.drop_index('ix_reminders_scheduled_datetime_id', table_name='reminders')
@@ -0,0 +1,26 @@
+"""Add dispatch lease columns to reminders
+
+Revision ID: b3e1c7d9a2f4
+Revises: 6f4a4352c2c7
+Create Date: 2026-10-17 09:12:41.204118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e1c7d9a2f4'
+down_revision = '6f4a4352c2c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('reminders', sa.Column('claimed_by', sa.String(length=255), nullable=True))
+    op.add_column('reminders', sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('reminders', 'lease_expires_at')
+    op.drop_column('reminders', 'claimed_by')
@@ -0,0 +1,50 @@
+"""Add full-text and trigram search indexes to reminders
+
+Revision ID: b7d4f2a9c6e1
+Revises: a2c5e8f1d3b7
+Create Date: 2026-10-17 20:26:44.103586
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d4f2a9c6e1'
+down_revision = 'a2c5e8f1d3b7'
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(message, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Stored generated column: Postgres keeps it in sync with title and message
+    op.add_column('reminders', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(SEARCH_VECTOR, persisted=True),
+        nullable=True
+    ))
+    op.create_index('ix_reminders_search_vector', 'reminders', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_reminders_title_trgm', 'reminders', ['title'], unique=False,
+        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_reminders_message_trgm', 'reminders', ['message'], unique=False,
+        postgresql_using='gin', postgresql_ops={'message': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reminders_message_trgm', table_name='reminders')
+    op.drop_index('ix_reminders_title_trgm', table_name='reminders')
+    op.drop_index('ix_reminders_search_vector', table_name='reminders')
+    op.drop_column('reminders', 'search_vector')
+    # pg_trgm is left installed; other objects may depend on it
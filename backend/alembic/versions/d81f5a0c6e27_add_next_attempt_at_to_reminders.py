@@ -0,0 +1,31 @@
+"""Add next_attempt_at to reminders
+
+Revision ID: d81f5a0c6e27
+Revises: b3e1c7d9a2f4
+Create Date: 2026-10-17 10:03:15.881402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd81f5a0c6e27'
+down_revision = 'b3e1c7d9a2f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('reminders', sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=True))
+    # Reminders still waiting for their first call are due at their scheduled time
+    op.execute(
+        "UPDATE reminders SET next_attempt_at = scheduled_datetime "
+        "WHERE status = 'SCHEDULED' AND vapi_call_id IS NULL"
+    )
+    op.create_index(op.f('ix_reminders_next_attempt_at'), 'reminders', ['next_attempt_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_reminders_next_attempt_at'), table_name='reminders')
+    op.drop_column('reminders', 'next_attempt_at')
@@ -0,0 +1,43 @@
+"""Add reminder_imports table
+
+Revision ID: d9e3a6b1f054
+Revises: b7d4f2a9c6e1
+Create Date: 2026-10-17 22:05:37.418290
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9e3a6b1f054'
+down_revision = 'b7d4f2a9c6e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('reminder_imports',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('format', sa.String(length=10), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('bytes_total', sa.BigInteger(), nullable=True),
+    sa.Column('bytes_read', sa.BigInteger(), nullable=False),
+    sa.Column('rows_read', sa.Integer(), nullable=False),
+    sa.Column('rows_imported', sa.Integer(), nullable=False),
+    sa.Column('rows_rejected', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('error_report', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reminder_imports_created_at'), 'reminder_imports', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_reminder_imports_created_at'), table_name='reminder_imports')
+    op.drop_table('reminder_imports')
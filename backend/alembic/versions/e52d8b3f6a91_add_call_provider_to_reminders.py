@@ -0,0 +1,26 @@
+"""Add call provider to reminders
+
+Revision ID: e52d8b3f6a91
+Revises: 7a3f9c1e5b20
+Create Date: 2026-10-17 14:05:31.208417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e52d8b3f6a91'
+down_revision = '7a3f9c1e5b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('reminders', sa.Column('call_provider', sa.String(length=20), nullable=True))
+    # Every call so far went through Vapi
+    op.execute("UPDATE reminders SET call_provider = 'vapi' WHERE vapi_call_id IS NOT NULL")
+
+
+def downgrade() -> None:
+    op.drop_column('reminders', 'call_provider')
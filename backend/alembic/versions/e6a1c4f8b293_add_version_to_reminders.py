@@ -0,0 +1,24 @@
+"""Add dispatch state version to reminders
+
+Revision ID: e6a1c4f8b293
+Revises: d9e3a6b1f054
+Create Date: 2026-10-18 09:12:40.561273
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6a1c4f8b293'
+down_revision = 'd9e3a6b1f054'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('reminders', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('reminders', 'version')
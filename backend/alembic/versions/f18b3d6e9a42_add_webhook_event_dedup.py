@@ -0,0 +1,42 @@
+"""Add webhook event dedup and index reminders by call ID
+
+Revision ID: f18b3d6e9a42
+Revises: c4a7d2e9f138
+Create Date: 2026-10-17 18:05:31.227914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f18b3d6e9a42'
+down_revision = 'c4a7d2e9f138'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_reminders_vapi_call_id'), 'reminders', ['vapi_call_id'], unique=False)
+    op.create_index(op.f('ix_call_dispatches_call_id'), 'call_dispatches', ['call_id'], unique=False)
+    op.create_table('processed_webhook_events',
+    sa.Column('event_key', sa.String(length=300), nullable=False),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('call_id', sa.String(length=255), nullable=True),
+    sa.Column('processed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('event_key')
+    )
+    op.create_index(op.f('ix_processed_webhook_events_processed_at'), 'processed_webhook_events', ['processed_at'], unique=False)
+    op.add_column('webhook_events', sa.Column('event_key', sa.String(length=300), nullable=True))
+    op.alter_column('webhook_events', 'reminder_id', existing_type=postgresql.UUID(as_uuid=True), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM webhook_events WHERE reminder_id IS NULL")
+    op.alter_column('webhook_events', 'reminder_id', existing_type=postgresql.UUID(as_uuid=True), nullable=False)
+    op.drop_column('webhook_events', 'event_key')
+    op.drop_index(op.f('ix_processed_webhook_events_processed_at'), table_name='processed_webhook_events')
+    op.drop_table('processed_webhook_events')
+    op.drop_index(op.f('ix_call_dispatches_call_id'), table_name='call_dispatches')
+    op.drop_index(op.f('ix_reminders_vapi_call_id'), table_name='reminders')
@@ -0,0 +1,117 @@
+"""
+Reminder import API endpoints.
+
+Accepts CSV or NDJSON files of reminders and reports import progress.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+from pathlib import Path
+from uuid import UUID
+import uuid
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.models.reminder_import import ReminderImport
+from app.schemas.reminder_import import ReminderImportResponse
+from app.services.reminder_import import FORMATS, ImportFileError, detect_format, reminder_importer
+
+router = APIRouter()
+
+
+@router.post("/", response_model=ReminderImportResponse, status_code=202)
+async def create_import(
+    request: Request,
+    filename: str = Query(..., min_length=1, description="Name of the uploaded file"),
+    format: Optional[str] = Query(None, description="csv or ndjson (default: from the file name)")
+):
+    """
+    Import reminders from a CSV or NDJSON file sent as the request body.
+    
+    The body is streamed to disk and imported in the background; poll
+    GET /imports/{id} for progress. CSV files need a header with title,
+    message, phone_number, scheduled_datetime and timezone; NDJSON files
+    hold one object with those fields per line. Rows are validated like
+    POST /reminders, and rejected ones go to the error report.
+    
+    Example:
+        curl --data-binary @campaign.csv "http://localhost:8000/api/v1/imports/?filename=campaign.csv"
+    """
+    try:
+        format = format or detect_format(filename)
+    except ImportFileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(FORMATS)}")
+    
+    import_id = uuid.uuid4()
+    path = reminder_importer.upload_path(import_id, format)
+    size = 0
+    try:
+        with open(path, "wb") as upload:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > settings.IMPORT_MAX_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Import files are limited to {settings.IMPORT_MAX_BYTES} bytes"
+                    )
+                await run_in_threadpool(upload.write, chunk)
+        
+        job = await run_in_threadpool(reminder_importer.create, import_id, Path(filename).name, format, size)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    
+    reminder_importer.submit(job.id, path, delete_source=True)
+    return job
+
+
+@router.get("/{import_id}", response_model=ReminderImportResponse)
+def get_import(
+    import_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the status and progress of an import.
+    """
+    job = db.get(ReminderImport, import_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Import with id {import_id} not found"
+        )
+    
+    return job
+
+
+@router.get("/{import_id}/errors")
+def download_import_errors(
+    import_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """
+    Download the rejected rows of an import as CSV (line, error, data).
+    
+    While the import runs, the report holds the batches done so far.
+    """
+    job = db.get(ReminderImport, import_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Import with id {import_id} not found"
+        )
+    
+    path = reminder_importer.report_path(import_id)
+    if not path.exists():
+        raise HTTPException(
+            status_code=404,
+            detail=f"Import {import_id} has no rejected rows"
+        )
+    
+    return FileResponse(path, media_type="text/csv", filename=f"{Path(job.filename).stem}-errors.csv")
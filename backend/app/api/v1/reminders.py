@@ -4,25 +4,57 @@ Reminder API endpoints.
 Handles all CRUD operations for reminders.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, desc, asc
-from typing import Optional, List
+from sqlalchemy import desc, asc, tuple_
+from typing import Any, Iterable, List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.reminder import Reminder, ReminderStatus
 from app.schemas.reminder import (
+    BulkResponse,
+    ReminderBulkDelete,
     ReminderCreate,
     ReminderUpdate,
     ReminderResponse,
     ReminderListResponse
 )
+from app.services import reminder_bulk
+from app.services.list_counts import COUNT_STRATEGIES, count_reminders, reminder_counts
+from app.services.reminder_notifications import notify_reminder_changed
+from app.services.reminder_search import search_filter, search_rank
+from app.services.scheduler import reminder_scheduler
+from app.utils.pagination import Cursor, decode_cursor, encode_cursor
 
 router = APIRouter()
 
 
+def sync_local_queue(changes: Iterable[Tuple[UUID, Optional[datetime]]]):
+    """
+    Re-plan the in-process scheduler's dispatch queue right away.
+    
+    Only when the scheduler runs in this process: otherwise the queue
+    here is never drained, and the worker learns about the change from
+    the notification sent with the write.
+    
+    Args:
+        changes: (reminder id, next attempt time) pairs; None removes
+            the reminder from the queue
+    """
+    if not settings.SCHEDULER_IN_PROCESS:
+        return
+    
+    for reminder_id, next_attempt_at in changes:
+        if next_attempt_at:
+            reminder_scheduler.queue.schedule(reminder_id, next_attempt_at)
+        else:
+            reminder_scheduler.queue.cancel(reminder_id)
+
+
 @router.post("/", response_model=ReminderResponse, status_code=201)
 def create_reminder(
     reminder_data: ReminderCreate,
@@ -45,13 +77,19 @@ def create_reminder(
             phone_number=reminder_data.phone_number,
             scheduled_datetime=reminder_data.scheduled_datetime,
             timezone=reminder_data.timezone,
-            status=ReminderStatus.SCHEDULED
+            status=ReminderStatus.SCHEDULED,
+            next_attempt_at=reminder_data.scheduled_datetime
         )
         
         db.add(reminder)
+        db.flush()
+        notify_reminder_changed(db, reminder)
         db.commit()
+        reminder_counts.invalidate()
         db.refresh(reminder)
         
+        sync_local_queue([(reminder.id, reminder.next_attempt_at)])
+        
         return reminder
     
     except Exception as e:
@@ -62,13 +100,107 @@ def create_reminder(
         )
 
 
+def check_bulk_size(items: List[Any]):
+    if len(items) > settings.REMINDER_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.REMINDER_BULK_MAX_ITEMS} items per bulk request"
+        )
+
+
+def finish_bulk(db: Session, outcome: reminder_bulk.BulkOutcome) -> BulkResponse:
+    """Commit a bulk write and sync the dispatch queue with it."""
+    db.commit()
+    reminder_counts.invalidate()
+    
+    sync_local_queue(outcome.changes)
+    
+    return BulkResponse(
+        succeeded=outcome.succeeded,
+        failed=len(outcome.results) - outcome.succeeded,
+        results=outcome.results
+    )
+
+
+@router.post("/bulk/create", response_model=BulkResponse)
+def bulk_create_reminders(
+    items: List[Any] = Body(..., description="Reminders to create, same fields as POST /"),
+    db: Session = Depends(get_db)
+):
+    """
+    Create many reminders in one request.
+    
+    The batch is validated and inserted in one transaction. Invalid items
+    are reported in **results** by position and the valid ones are still
+    created. At most REMINDER_BULK_MAX_ITEMS items per request.
+    """
+    check_bulk_size(items)
+    try:
+        return finish_bulk(db, reminder_bulk.bulk_create(db, items))
+    
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to create reminders: {str(e)}"
+        )
+
+
+@router.post("/bulk/update", response_model=BulkResponse)
+def bulk_update_reminders(
+    items: List[Any] = Body(..., description="Reminder ids with the fields to change, same fields as PUT /{id}"),
+    db: Session = Depends(get_db)
+):
+    """
+    Update many reminders in one request.
+    
+    Each item carries the reminder **id** and the fields to change. As with
+    single updates, only scheduled reminders can be updated; other items
+    are reported in **results** without failing the batch.
+    """
+    check_bulk_size(items)
+    try:
+        return finish_bulk(db, reminder_bulk.bulk_update(db, items))
+    
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to update reminders: {str(e)}"
+        )
+
+
+@router.post("/bulk/delete", response_model=BulkResponse)
+def bulk_delete_reminders(
+    request: ReminderBulkDelete,
+    db: Session = Depends(get_db)
+):
+    """
+    Delete many reminders in one request, regardless of status.
+    
+    Unknown ids are reported in **results** without failing the batch.
+    """
+    check_bulk_size(request.ids)
+    try:
+        return finish_bulk(db, reminder_bulk.bulk_delete(db, request.ids))
+    
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to delete reminders: {str(e)}"
+        )
+
+
 @router.get("/", response_model=ReminderListResponse)
 def list_reminders(
     status: Optional[ReminderStatus] = Query(None, description="Filter by status"),
     search: Optional[str] = Query(None, description="Search in title and message"),
-    sort: Optional[str] = Query("date_desc", description="Sort by: date_asc, date_desc"),
+    sort: Optional[str] = Query(None, description="Sort by: date_asc, date_desc, relevance (default: relevance when searching, else date_desc)"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Continue after this cursor (next_cursor of the previous page)"),
+    count: Optional[str] = Query(None, description="Total to return: exact, estimated or cached"),
     db: Session = Depends(get_db)
 ):
     """
@@ -76,11 +208,40 @@ def list_reminders(
     
     Query parameters:
     - **status**: Filter by status (scheduled, completed, failed)
-    - **search**: Search in title and message fields
-    - **sort**: Sort order (date_asc or date_desc)
+    - **search**: Search in title and message fields (words, phrases,
+      substrings and near misses; see app.services.reminder_search)
+    - **sort**: Sort order (date_asc, date_desc or relevance)
     - **page**: Page number (default: 1)
     - **page_size**: Items per page (default: 50, max: 100)
+    - **cursor**: Opaque cursor from a previous page's next_cursor
+    - **count**: How to compute total (default: LIST_COUNT_STRATEGY);
+      total_type in the response says what was returned
+    
+    Every page carries next_cursor (None on the last page). Following
+    cursors instead of page numbers reads each page straight from the
+    (scheduled_datetime, id) index, so deep pages cost the same as the
+    first; page is ignored when a cursor is given. Relevance-sorted
+    pages are page-based only.
     """
+    search = search.strip() if search else None
+    if sort not in ("date_asc", "relevance"):
+        sort = "relevance" if search and not sort else "date_desc"
+    if sort == "relevance" and not search:
+        sort = "date_desc"
+    count = count or settings.LIST_COUNT_STRATEGY
+    if count not in COUNT_STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"count must be one of: {', '.join(COUNT_STRATEGIES)}")
+    position = None
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if position.sort != sort:
+            raise HTTPException(status_code=400, detail="Cursor was issued for a different sort order")
+    if position and sort == "relevance":
+        raise HTTPException(status_code=400, detail="Cursor pagination is not available for relevance sort")
+    
     try:
         # Base query
         query = db.query(Reminder)
@@ -91,33 +252,49 @@ def list_reminders(
         
         # Apply search filter
         if search:
-            search_pattern = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Reminder.title.ilike(search_pattern),
-                    Reminder.message.ilike(search_pattern)
-                )
-            )
-        
-        # Apply sorting
-        if sort == "date_asc":
-            query = query.order_by(asc(Reminder.scheduled_datetime))
-        else:  # date_desc is default
-            query = query.order_by(desc(Reminder.scheduled_datetime))
+            query = query.filter(search_filter(search))
         
         # Get total count before pagination
-        total = query.count()
+        total, total_type = count_reminders(db, query, count, filters=(status, search))
+        
+        # Apply sorting (id breaks ties so pages never overlap)
+        key = tuple_(Reminder.scheduled_datetime, Reminder.id)
+        if sort == "relevance":
+            query = query.order_by(desc(search_rank(search)), desc(Reminder.scheduled_datetime), desc(Reminder.id))
+        elif sort == "date_asc":
+            query = query.order_by(asc(Reminder.scheduled_datetime), asc(Reminder.id))
+            if position:
+                query = query.filter(key > tuple_(position.scheduled_datetime, position.id))
+        else:  # date_desc is default
+            query = query.order_by(desc(Reminder.scheduled_datetime), desc(Reminder.id))
+            if position:
+                query = query.filter(key < tuple_(position.scheduled_datetime, position.id))
+        
+        # Apply pagination, reading one extra row to know if another page follows
+        if not position:
+            query = query.offset((page - 1) * page_size)
+        reminders = query.limit(page_size + 1).all()
         
-        # Apply pagination
-        offset = (page - 1) * page_size
-        reminders = query.offset(offset).limit(page_size).all()
+        next_cursor = None
+        if len(reminders) > page_size:
+            reminders = reminders[:page_size]
+            if sort != "relevance":
+                last = reminders[-1]
+                next_cursor = encode_cursor(Cursor(sort, last.scheduled_datetime, last.id))
         
-        return ReminderListResponse(
+        response = ReminderListResponse(
             reminders=reminders,
             total=total,
-            page=page,
-            page_size=page_size
+            total_type=total_type,
+            page=None if position else page,
+            page_size=page_size,
+            next_cursor=next_cursor
         )
+        
+        # Encode the validated page directly: orjson handles datetimes and
+        # UUIDs natively, which spares FastAPI re-validating and converting
+        # every item before encoding
+        return ORJSONResponse(response.model_dump())
     
     except Exception as e:
         raise HTTPException(
@@ -179,12 +356,25 @@ def update_reminder(
         for field, value in update_data.items():
             setattr(reminder, field, value)
         
+        # A new time re-arms the reminder, including any pending retry
+        if "scheduled_datetime" in update_data:
+            reminder.next_attempt_at = reminder.scheduled_datetime
+        
         # Update the updated_at timestamp
         reminder.updated_at = datetime.now(timezone.utc)
         
+        # Buffered dispatcher writes based on the old row no longer apply
+        reminder.version = (reminder.version or 0) + 1
+        
+        notify_reminder_changed(db, reminder)
         db.commit()
+        reminder_counts.invalidate()
         db.refresh(reminder)
         
+        # Move the queue entry in case the scheduled time changed
+        if reminder.next_attempt_at:
+            sync_local_queue([(reminder.id, reminder.next_attempt_at)])
+        
         return reminder
     
     except Exception as e:
@@ -214,8 +404,11 @@ def delete_reminder(
         )
     
     try:
+        notify_reminder_changed(db, reminder, deleted=True)
         db.delete(reminder)
         db.commit()
+        reminder_counts.invalidate()
+        sync_local_queue([(reminder_id, None)])
         return None  # 204 No Content
     
     except Exception as e:
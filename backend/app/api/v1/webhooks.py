@@ -1,26 +1,79 @@
 """
 Webhook endpoints for handling external service callbacks.
 
-Handles webhook events from Vapi for call status updates.
+Handles call status webhooks from Vapi and status callbacks from Twilio.
+Events are validated and queued (see app.services.webhook_queue); the
+webhook consumer applies them to reminders in batches. Redeliveries of
+an event already queued by this node are acknowledged without a write.
 """
 
-from fastapi import APIRouter, Request, HTTPException, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Request, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from datetime import datetime, timezone
+from typing import Any, Dict
+from uuid import UUID
 import logging
 
-from app.core.database import get_db
-from app.models.reminder import Reminder, ReminderStatus
+import orjson
+
+from app.core.config import settings
+from app.services.twilio_service import validate_signature
+from app.services.webhook_queue import CALL_ENDED, CALL_FAILED, event_key, webhook_queue
 
 router = APIRouter(tags=["webhooks"])
 logger = logging.getLogger(__name__)
 
+# Final Twilio CallStatus values that mean the reminder was not delivered
+TWILIO_FAILED_STATUSES = ("busy", "no-answer", "failed", "canceled")
+
+
+def ignored(reason: str) -> ORJSONResponse:
+    """Acknowledge an event that needs no processing."""
+    return ORJSONResponse(status_code=status.HTTP_200_OK, content={"status": "ignored", "reason": reason})
+
+
+async def enqueue(event: Dict[str, Any]) -> ORJSONResponse:
+    """
+    Queue a validated event and acknowledge it with 202.
+    
+    Answers 503 if the event could not be stored, so the provider
+    retries it.
+    """
+    event["event_key"] = event_key(event["provider"], event["call_id"])
+    if webhook_queue.seen(event["event_key"]):
+        logger.debug(f"Duplicate {event['event_type']} for call {event['call_id']}")
+        return ORJSONResponse(status_code=status.HTTP_200_OK, content={"status": "duplicate"})
+    
+    try:
+        await webhook_queue.append(event)
+    except Exception as e:
+        logger.error(f"Could not queue {event['provider']} webhook: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not queue webhook, retry later"
+        )
+    
+    return ORJSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "status": "accepted",
+            "event_type": event["event_type"],
+            "reminder_id": str(event["reminder_id"]) if event["reminder_id"] else None,
+            "call_id": event["call_id"]
+        }
+    )
+
+
+def parse_reminder_id(value: Any) -> Any:
+    """Reminder ID as a UUID, or None if missing or malformed."""
+    try:
+        return UUID(str(value)) if value else None
+    except ValueError:
+        return None
 
-@router.post("/vapi")
-async def vapi_webhook(
-    request: Request,
-    db: Session = Depends(get_db)
-):
+
+@router.post("/vapi", status_code=status.HTTP_202_ACCEPTED)
+async def vapi_webhook(request: Request):
     """
     Handle Vapi webhook events.
     
@@ -29,87 +82,102 @@ async def vapi_webhook(
     - call.ended: Call has ended successfully
     - call.failed: Call failed
     
-    This endpoint updates the reminder status based on the call outcome.
+    Outcome events are queued and acknowledged with 202; the reminder
+    is updated by the webhook consumer shortly after. Other events are
+    acknowledged and dropped. Events without metadata.reminder_id are
+    matched to their reminder by call ID.
     """
     try:
-        # Parse webhook payload
-        payload = await request.json()
-        
-        logger.info(f"Received Vapi webhook: {payload.get('type')}")
-        logger.debug(f"Full payload: {payload}")
-        
-        # Extract event type and call data
-        event_type = payload.get("type")
-        call = payload.get("call", {})
-        call_id = call.get("id")
-        call_status = call.get("status")
-        
-        # Get reminder ID from metadata
-        metadata = call.get("metadata", {})
-        reminder_id = metadata.get("reminder_id")
-        
-        if not reminder_id:
-            logger.warning("Webhook received without reminder_id in metadata")
-            return {"status": "ignored", "reason": "no_reminder_id"}
-        
-        # Find the reminder
-        reminder = db.query(Reminder).filter(Reminder.id == reminder_id).first()
-        
-        if not reminder:
-            logger.warning(f"Reminder {reminder_id} not found for webhook")
-            return {"status": "ignored", "reason": "reminder_not_found"}
-        
-        # Handle different webhook events
+        payload = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON payload")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON payload")
+    
+    logger.debug(f"Received Vapi webhook: {payload.get('type')}")
+    
+    # Extract event type and call data
+    event_type = payload.get("type")
+    call = payload.get("call") or {}
+    
+    if event_type not in (CALL_ENDED, CALL_FAILED):
         if event_type == "call.started":
-            logger.info(f"Call started for reminder {reminder_id}")
-            # Optional: Add a call_started_at field to track this
-            
-        elif event_type == "call.ended":
-            # Call completed successfully
-            logger.info(f"Call ended successfully for reminder {reminder_id}")
-            
-            if reminder.status == ReminderStatus.SCHEDULED:
-                reminder.status = ReminderStatus.COMPLETED
-                reminder.completed_at = datetime.now(timezone.utc)
-                reminder.vapi_call_id = call_id
-                db.commit()
-                logger.info(f"Reminder {reminder_id} marked as COMPLETED")
-        
-        elif event_type == "call.failed":
-            # Call failed
-            logger.warning(f"Call failed for reminder {reminder_id}")
-            
-            error_message = call.get("error", {}).get("message", "Unknown error")
-            
-            # Increment call attempts
-            reminder.call_attempts = (reminder.call_attempts or 0) + 1
-            reminder.last_error = f"Call failed: {error_message}"
-            reminder.vapi_call_id = call_id
-            
-            # Check if max retries exceeded
-            from app.core.config import settings
-            if reminder.call_attempts >= settings.SCHEDULER_MAX_RETRIES:
-                reminder.status = ReminderStatus.FAILED
-                logger.warning(f"Reminder {reminder_id} marked as FAILED after {reminder.call_attempts} attempts")
-            
-            db.commit()
-        
+            logger.debug(f"Call started: {call.get('id')}")
         else:
             logger.info(f"Unhandled webhook event type: {event_type}")
-        
-        return {
-            "status": "processed",
-            "event_type": event_type,
-            "reminder_id": reminder_id,
-            "call_id": call_id
-        }
+        return ignored("unhandled_event_type")
     
-    except Exception as e:
-        logger.error(f"Error processing Vapi webhook: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error processing webhook: {str(e)}"
-        )
+    # Get reminder ID from metadata, falling back to the call ID
+    reminder_id = parse_reminder_id((call.get("metadata") or {}).get("reminder_id"))
+    if not reminder_id and not call.get("id"):
+        logger.warning("Webhook received without a reminder_id or call ID")
+        return ignored("no_reminder_id")
+    
+    return await enqueue({
+        "provider": "vapi",
+        "event_type": event_type,
+        "reminder_id": reminder_id,
+        "call_id": call.get("id"),
+        "error_message": (call.get("error") or {}).get("message", "Unknown error") if event_type == CALL_FAILED else None,
+        "payload": payload
+    })
+
+
+@router.post("/twilio", status_code=status.HTTP_202_ACCEPTED)
+async def twilio_status_callback(request: Request):
+    """
+    Handle Twilio call status callbacks.
+    
+    Twilio posts form data with CallSid and CallStatus once the call
+    ends (the callback URL carries the reminder_id). "completed"
+    completes the reminder; busy, no-answer, failed and canceled count
+    as a failed attempt, like Vapi's call.failed. Outcomes are queued
+    like Vapi events.
+    
+    Requests are rejected unless X-Twilio-Signature matches, and
+    always when TWILIO_AUTH_TOKEN is not set.
+    """
+    if not settings.TWILIO_AUTH_TOKEN:
+        logger.warning("Rejected Twilio callback: Twilio is not configured")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Twilio is not configured")
+    
+    form = dict(await request.form())
+    
+    # Twilio signs the URL it was given, which may differ from ours behind a proxy
+    url = str(request.url)
+    if settings.TWILIO_STATUS_CALLBACK_URL:
+        url = f"{settings.TWILIO_STATUS_CALLBACK_URL}?{request.url.query}"
+    if not validate_signature(url, form, request.headers.get("X-Twilio-Signature", "")):
+        logger.warning("Rejected Twilio callback with an invalid signature")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid signature")
+    
+    call_status = form.get("CallStatus")
+    logger.debug(f"Received Twilio status callback: {call_status}")
+    
+    if call_status == "completed":
+        event_type, error_message = CALL_ENDED, None
+    elif call_status in TWILIO_FAILED_STATUSES:
+        event_type, error_message = CALL_FAILED, call_status
+        if form.get("ErrorCode"):
+            error_message = f"{call_status} (Twilio error {form['ErrorCode']})"
+    else:
+        logger.info(f"Unhandled Twilio call status: {call_status}")
+        return ignored("unhandled_call_status")
+    
+    # CallSid identifies the reminder if the callback URL lost its reminder_id
+    reminder_id = parse_reminder_id(request.query_params.get("reminder_id"))
+    if not reminder_id and not form.get("CallSid"):
+        logger.warning("Twilio callback received without a reminder_id or CallSid")
+        return ignored("no_reminder_id")
+    
+    return await enqueue({
+        "provider": "twilio",
+        "event_type": event_type,
+        "reminder_id": reminder_id,
+        "call_id": form.get("CallSid"),
+        "error_message": error_message,
+        "payload": form
+    })
 
 
 @router.get("/vapi/health")
@@ -122,5 +190,6 @@ async def webhook_health():
     return {
         "status": "healthy",
         "service": "vapi_webhook",
+        "queue": webhook_queue.get_metrics(),
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
@@ -19,11 +19,87 @@ class Settings(BaseSettings):
     VAPI_PHONE_NUMBER_ID: str = ""
     VAPI_BASE_URL: str = "https://api.vapi.ai"
     VAPI_WEBHOOK_URL: str = ""  # Optional: webhook URL for call events (e.g., ngrok URL)
+    VAPI_CALLS_PER_SECOND: float = 10.0  # outbound call creation rate limit
+    VAPI_RATE_LIMIT_BURST: int = 10  # token bucket capacity
+    VAPI_MAX_CONCURRENT_CALLS: int = 20  # max create_call requests in flight
+    VAPI_ADAPTIVE_CONCURRENCY: bool = True  # adjust the in-flight cap (AIMD) from latency and errors
+    VAPI_MIN_CONCURRENT_CALLS: int = 2  # floor for the adaptive cap
+    VAPI_LATENCY_TARGET: float = 3.0  # seconds; slower create_call responses shrink the cap
+    VAPI_CONCURRENCY_BACKOFF: float = 0.7  # cap multiplier on a slow or failed call
+    VAPI_BREAKER_FAILURE_RATE: float = 0.5  # open the circuit at this error rate...
+    VAPI_BREAKER_MIN_CALLS: int = 10  # ...over at least this many calls...
+    VAPI_BREAKER_WINDOW: int = 60  # ...in the last this many seconds
+    VAPI_BREAKER_OPEN_SECONDS: int = 30  # how long the circuit stays open
+    VAPI_BREAKER_HALF_OPEN_CALLS: int = 3  # probe calls that must succeed to close it
+    VAPI_RATE_LIMIT_BACKEND: str = "memory"  # memory (per process) or postgres (shared by all nodes)
+    VAPI_RATE_LIMIT_COOLDOWN: int = 60  # seconds at half rate after a 429 pause
+    VAPI_RETRY_AFTER_DEFAULT: int = 5  # seconds to pause on 429 without Retry-After
+    VAPI_HTTP2: bool = True  # multiplex requests over HTTP/2 connections
+    VAPI_MAX_CONNECTIONS: int = 100  # connection pool size
+    VAPI_MAX_KEEPALIVE_CONNECTIONS: int = 100  # idle connections kept for reuse (keep at the pool size)
+    VAPI_KEEPALIVE_EXPIRY: float = 30.0  # seconds an idle connection is kept
+    VAPI_CONNECT_TIMEOUT: float = 5.0  # seconds to establish a connection
+    VAPI_READ_TIMEOUT: float = 30.0  # seconds to wait for a response
+    VAPI_POOL_TIMEOUT: float = 10.0  # seconds to wait for a free pooled connection
+    VAPI_ASSISTANT_ID: str = ""  # Optional: use this assistant instead of registering one
+    VAPI_ASSISTANT_MODEL_PROVIDER: str = "openai"
+    VAPI_ASSISTANT_MODEL: str = "gpt-3.5-turbo"
+    VAPI_ASSISTANT_VOICE_PROVIDER: str = "11labs"
+    VAPI_ASSISTANT_VOICE_ID: str = "adam"
     
-    # Twilio Configuration (optional)
+    # Twilio Configuration (optional second provider)
     TWILIO_ACCOUNT_SID: str = ""
     TWILIO_AUTH_TOKEN: str = ""
     TWILIO_PHONE_NUMBER: str = ""
+    TWILIO_BASE_URL: str = "https://api.twilio.com"
+    TWILIO_STATUS_CALLBACK_URL: str = ""  # Optional: URL of /api/v1/webhooks/twilio for call outcomes
+    TWILIO_VOICE: str = "Polly.Joanna"  # text-to-speech voice for <Say>
+    TWILIO_CALLS_PER_SECOND: float = 1.0  # Twilio's default CPS per account
+    TWILIO_RATE_LIMIT_BURST: int = 1
+    TWILIO_MAX_CONCURRENT_CALLS: int = 10  # max create_call requests in flight
+    TWILIO_BREAKER_FAILURE_RATE: float = 0.5  # open the circuit at this error rate...
+    TWILIO_BREAKER_MIN_CALLS: int = 5  # ...over at least this many calls...
+    TWILIO_BREAKER_WINDOW: int = 60  # ...in the last this many seconds
+    TWILIO_BREAKER_OPEN_SECONDS: int = 30  # how long the circuit stays open
+    TWILIO_BREAKER_HALF_OPEN_CALLS: int = 2  # probe calls that must succeed to close it
+    TWILIO_RETRY_AFTER_DEFAULT: int = 5  # seconds to pause on 429 without Retry-After
+    TWILIO_KEEPALIVE_EXPIRY: float = 30.0  # seconds an idle connection is kept
+    TWILIO_CONNECT_TIMEOUT: float = 5.0  # seconds to establish a connection
+    TWILIO_READ_TIMEOUT: float = 15.0  # seconds to wait for a response
+    TWILIO_POOL_TIMEOUT: float = 10.0  # seconds to wait for a free pooled connection
+    
+    # Call Routing
+    CALL_PROVIDERS: str = "vapi,twilio"  # priority order; providers without credentials are skipped
+    CALL_ROUTING_STRATEGY: str = "latency"  # latency (fastest healthy provider) or priority (first healthy)
+    CALL_ROUTER_STATS_WINDOW: int = 100  # recent calls per provider used for routing
+    CALL_ROUTER_ERROR_PENALTY: float = 10.0  # latency score multiplier per unit of error rate
+    CALL_ROUTER_EXPLORE_RATE: float = 0.05  # share of calls sent to another healthy provider
+    CALL_DEDUP_CACHE_SIZE: int = 10000  # call attempts remembered in process
+    CALL_DEDUP_RESOLVE_DELAY: int = 30  # seconds before looking up a call whose creation answer was lost
+    CALL_DEDUP_RESOLVE_TIMEOUT: int = 300  # treat such a call as not placed if still not found after this (unknown if the lookup was inconclusive)
+    CALL_DEDUP_RETENTION_HOURS: int = 168  # keep settled call attempts this long
+    
+    # Webhook Ingestion
+    WEBHOOK_INGEST_BATCH_SIZE: int = 500  # events stored per INSERT at most
+    WEBHOOK_INGEST_FLUSH_INTERVAL: float = 0.01  # seconds an event waits for others to share its commit
+    WEBHOOK_CONSUMER_BATCH_SIZE: int = 500  # events applied per transaction
+    WEBHOOK_CONSUMER_INTERVAL: float = 0.5  # seconds between polls when the queue is drained
+    WEBHOOK_MAX_ATTEMPTS: int = 5  # set an event aside after this many failed applications
+    WEBHOOK_DEDUP_CACHE_SIZE: int = 10000  # event keys remembered in process to drop redeliveries
+    WEBHOOK_DEDUP_RETENTION_HOURS: int = 72  # keep processed event keys this long
+    
+    # Reminder Listing
+    LIST_COUNT_STRATEGY: str = "cached"  # default total for listings: exact, estimated or cached
+    LIST_COUNT_CACHE_TTL: float = 15.0  # seconds a cached total is served
+    LIST_COUNT_CACHE_SIZE: int = 1000  # filter combinations cached per process
+    LIST_COUNT_EXACT_BELOW: int = 1000  # estimates smaller than this are counted exactly
+    REMINDER_BULK_MAX_ITEMS: int = 5000  # items accepted per bulk create/update/delete request
+    
+    # Reminder Import
+    IMPORT_DIR: str = "imports"  # spooled uploads and error reports
+    IMPORT_BATCH_SIZE: int = 10000  # rows validated, copied and committed together
+    IMPORT_MAX_CONCURRENT: int = 2  # imports running at once per API process
+    IMPORT_MAX_BYTES: int = 2_147_483_648  # largest accepted upload (2 GiB)
     
     # Application
     ENVIRONMENT: str = "development"
@@ -31,8 +107,36 @@ class Settings(BaseSettings):
     CORS_ORIGINS: List[str] = ["http://localhost:3000"]
     
     # Scheduler
-    SCHEDULER_CHECK_INTERVAL: int = 30  # seconds
+    SCHEDULER_IN_PROCESS: bool = True  # run the scheduler inside the API (False when using app.worker)
+    SCHEDULER_CHECK_INTERVAL: int = 30  # seconds between dispatch queue refills
     SCHEDULER_MAX_RETRIES: int = 3
+    SCHEDULER_RETRY_BASE_DELAY: int = 60  # seconds before the first retry, doubled per attempt
+    SCHEDULER_RETRY_MAX_DELAY: int = 1800  # cap for the retry backoff in seconds
+    SCHEDULER_QUEUE_HORIZON: int = 600  # seconds of upcoming reminders kept in memory
+    SCHEDULER_MAX_CONCURRENT_CALLS: int = 50  # max calls in flight (1 = sequential)
+    SCHEDULER_NODE_ID: str = ""  # defaults to hostname:pid
+    SCHEDULER_LEASE_SECONDS: int = 900  # must exceed SCHEDULER_QUEUE_HORIZON
+    SCHEDULER_CLAIM_BATCH_SIZE: int = 1000  # reminders claimed per statement; a refill claims batches until one comes back short
+    SCHEDULER_LISTEN_NOTIFY: bool = True  # re-plan on Postgres NOTIFY instead of waiting for a refill
+    SCHEDULER_SAFETY_NET_INTERVAL: int = 300  # seconds between refills while LISTEN is connected
+    SCHEDULER_MISSED_THRESHOLD: int = 300  # seconds overdue before a reminder counts as missed
+    SCHEDULER_CATCHUP_POLICY: str = "deliver"  # deliver, expire or skip missed reminders on startup
+    SCHEDULER_CATCHUP_BATCH_SIZE: int = 200
+    SCHEDULER_CATCHUP_RATE: float = 5.0  # missed reminders delivered per second
+    SCHEDULER_CATCHUP_MAX_CONCURRENT: int = 10  # catch-up share of SCHEDULER_MAX_CONCURRENT_CALLS
+    SCHEDULER_WRITE_BATCH_SIZE: int = 500  # flush buffered status updates at this many reminders
+    SCHEDULER_WRITE_FLUSH_INTERVAL: float = 0.5  # or after this many seconds
+    SCHEDULER_RECONCILE_INTERVAL: int = 60  # seconds between sweeps for calls with no webhook
+    SCHEDULER_RECONCILE_THRESHOLD: int = 300  # poll a call's status once it is this old without a webhook
+    SCHEDULER_RECONCILE_MAX_INTERVAL: int = 1800  # cap on the per-call polling backoff
+    SCHEDULER_RECONCILE_MAX_AGE: int = 7200  # give up on a call (count it as failed) after this long
+    SCHEDULER_RECONCILE_BATCH_SIZE: int = 200  # calls checked per sweep
+    SCHEDULER_RECONCILE_CONCURRENCY: int = 10  # status requests in flight
+    
+    # Standalone worker (python -m app.worker)
+    WORKER_SINGLETON: bool = True  # only the advisory lock holder dispatches
+    WORKER_LOCK_KEY: int = 8_115_220  # pg advisory lock key for leadership
+    WORKER_LEADER_CHECK_INTERVAL: int = 10  # seconds between leadership checks
     
     class Config:
         env_file = ".env"
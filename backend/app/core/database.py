@@ -1,10 +1,18 @@
 """
 Database configuration and session management.
 
-Sets up SQLAlchemy engine, session maker, and base model.
+Sets up SQLAlchemy engines, session makers, and base model.
+
+The sync engine (psycopg2) serves the regular API endpoints, which run
+in FastAPI's threadpool. Code that runs on the event loop (webhooks,
+scheduler) uses the async engine (asyncpg) so queries never block it.
+JSON columns on the async engine (e.g. queued webhook payloads) are
+encoded and decoded with orjson.
 """
 
+import orjson
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -23,6 +31,41 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def asyncpg_dsn(url: str) -> str:
+    """Strip the SQLAlchemy driver suffix so asyncpg accepts the URL."""
+    scheme, _, rest = url.partition("://")
+    return f"{scheme.split('+')[0]}://{rest}"
+
+
+def async_database_url(url: str) -> str:
+    """Point a database URL at the asyncpg driver."""
+    scheme, _, rest = asyncpg_dsn(url).partition("://")
+    return f"{scheme}+asyncpg://{rest}"
+
+
+def orjson_dumps(value) -> str:
+    """Encode a JSON column value with orjson."""
+    return orjson.dumps(value).decode()
+
+
+# Async engine for code running on the event loop
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    echo=settings.DEBUG,
+    pool_pre_ping=True,
+    json_serializer=orjson_dumps,
+    json_deserializer=orjson.loads,
+)
+
+# Async session factory (objects stay usable after commit)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
 def get_db():
     """
     Dependency for getting database sessions.
@@ -37,3 +80,16 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency for getting async database sessions.
+    
+    Usage in async FastAPI endpoints:
+        @app.post("/events")
+        async def handle_event(db: AsyncSession = Depends(get_async_db)):
+            ...
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
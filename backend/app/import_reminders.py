@@ -0,0 +1,75 @@
+"""
+Command-line import of reminders from a CSV or NDJSON file.
+
+Runs the same pipeline as POST /api/v1/imports on a local file, without
+uploading it:
+    
+    python -m app.import_reminders campaign.csv [--format csv|ndjson]
+
+The import is recorded in reminder_imports like API imports, so it can
+be followed through GET /api/v1/imports/{id} as well. Rejected rows are
+written to the error report under IMPORT_DIR.
+"""
+
+import argparse
+import logging
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from app.models.reminder_import import ReminderImport
+from app.services.reminder_import import FORMATS, ImportFileError, detect_format, reminder_importer
+
+
+def print_progress(started: float):
+    """Progress callback printing one line per batch."""
+    def progress(job: ReminderImport):
+        elapsed = time.monotonic() - started
+        share = f"{job.bytes_read / job.bytes_total:6.1%}" if job.bytes_total else "     -"
+        print(
+            f"{share}  {job.rows_read:>12,} rows  {job.rows_imported:>12,} imported  "
+            f"{job.rows_rejected:>10,} rejected  {job.rows_read / elapsed:>9,.0f} rows/s",
+            flush=True
+        )
+    return progress
+
+
+def main():
+    """Entry point for ``python -m app.import_reminders``."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file", type=Path, help="CSV or NDJSON file of reminders")
+    parser.add_argument("--format", choices=FORMATS, help="file format (default: from the extension)")
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s [%(name)s] %(message)s"
+    )
+    
+    try:
+        format = args.format or detect_format(args.file.name)
+    except ImportFileError as e:
+        parser.error(str(e))
+    if not args.file.is_file():
+        parser.error(f"{args.file} is not a file")
+    
+    job = reminder_importer.create(uuid.uuid4(), args.file.name, format, args.file.stat().st_size)
+    print(f"Importing {args.file} as {format} (import {job.id})", flush=True)
+    
+    started = time.monotonic()
+    job = reminder_importer.run(job.id, args.file, progress=print_progress(started))
+    
+    print(
+        f"\nImport {job.status} in {time.monotonic() - started:.1f}s: {job.rows_imported:,} imported, "
+        f"{job.rows_rejected:,} rejected of {job.rows_read:,} rows"
+    )
+    if job.error:
+        print(f"Error: {job.error}")
+    if job.error_report:
+        print(f"Rejected rows: {job.error_report}")
+    sys.exit(0 if job.status == "completed" else 1)
+
+
+if __name__ == "__main__":
+    main()
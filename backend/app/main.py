@@ -4,17 +4,24 @@ Main FastAPI application entry point.
 This module sets up the FastAPI app with:
 - CORS middleware
 - API routes
-- Background scheduler for reminder processing
-- Lifespan events
+- Background scheduler for reminder processing (unless it runs in app.worker)
+- Lifespan events (including stopping running imports)
+- orjson as the default response encoder
 """
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from starlette.concurrency import run_in_threadpool
 
-from app.api.v1 import reminders, webhooks
+from app.api.v1 import imports, reminders, scheduler, webhooks
 from app.core.config import settings
+from app.core.database import async_engine
 from app.services.scheduler import reminder_scheduler
+from app.services.call_router import call_router
+from app.services.reminder_import import reminder_importer
+from app.services.webhook_queue import webhook_queue
 
 
 @asynccontextmanager
@@ -28,16 +35,29 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     print("Starting application...")
-    print("Starting reminder scheduler...")
-    reminder_scheduler.start()
-    print(f"Scheduler will check for due reminders every {settings.SCHEDULER_CHECK_INTERVAL} seconds")
+    await call_router.start()
+    try:
+        await run_in_threadpool(reminder_importer.recover)
+    except Exception as e:
+        print(f"Could not clean up interrupted imports: {e}")
+    if settings.SCHEDULER_IN_PROCESS:
+        print("Starting reminder scheduler...")
+        reminder_scheduler.start()
+        print(f"Scheduler will refill its dispatch queue every {settings.SCHEDULER_CHECK_INTERVAL} seconds")
+    else:
+        print("In-process scheduler disabled; run the worker with: python -m app.worker")
     
     yield
     
     # Shutdown
     print("Shutting down application...")
-    print("Stopping reminder scheduler...")
-    reminder_scheduler.shutdown()
+    if settings.SCHEDULER_IN_PROCESS:
+        print("Stopping reminder scheduler...")
+        await reminder_scheduler.shutdown()
+    await webhook_queue.close()
+    await run_in_threadpool(reminder_importer.shutdown)
+    await call_router.close()
+    await async_engine.dispose()
     print("Application shutdown complete")
 
 
@@ -45,7 +65,8 @@ app = FastAPI(
     title="Call Me Reminder API",
     description="API for managing voice call reminders",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS Configuration
@@ -70,12 +91,24 @@ app.include_router(
     tags=["reminders"]
 )
 
+app.include_router(
+    scheduler.router,
+    prefix="/api/v1/scheduler",
+    tags=["scheduler"]
+)
+
 app.include_router(
     webhooks.router,
     prefix="/api/v1/webhooks",
     tags=["webhooks"]
 )
 
+app.include_router(
+    imports.router,
+    prefix="/api/v1/imports",
+    tags=["imports"]
+)
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,55 @@
+"""
+Call dispatch model definition.
+
+SQLAlchemy model for the idempotency records of placed calls.
+"""
+
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class CallDispatch(Base):
+    """
+    One call attempt of a reminder, keyed by "<reminder id>:<attempt>".
+    
+    A row is reserved when the attempt is claimed, before anything is
+    dialed, and updated with the outcome of the create_call request.
+    At most one attempt per reminder can be in flight (pending or
+    unknown) at a time.
+    
+    Attributes:
+        idempotency_key: "<reminder id>:<attempt>"
+        reminder_id: Reminder being called
+        attempt: Attempt number (the reminder's call_attempts when claimed)
+        status: pending (dialing), placed, unknown (the request may have
+            gone through; resolved by looking the key up at the provider)
+            or failed (definitely not placed)
+        provider: Provider that placed (or may have placed) the call
+        call_id: Provider call ID once known
+        created_at: When the attempt was reserved
+        updated_at: Last status change
+    """
+    __tablename__ = "call_dispatches"
+    __table_args__ = (
+        Index(
+            "uq_call_dispatches_in_flight",
+            "reminder_id",
+            unique=True,
+            postgresql_where=text("status IN ('pending', 'unknown')")
+        ),
+    )
+    
+    idempotency_key = Column(String(100), primary_key=True)
+    reminder_id = Column(UUID(as_uuid=True), ForeignKey("reminders.id", ondelete="CASCADE"), nullable=False, index=True)
+    attempt = Column(Integer, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")
+    provider = Column(String(20), nullable=True)
+    call_id = Column(String(255), nullable=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<CallDispatch(key={self.idempotency_key}, status={self.status})>"
@@ -0,0 +1,36 @@
+"""
+Processed webhook event model definition.
+
+SQLAlchemy model for remembering which webhook events were applied.
+"""
+
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class ProcessedWebhookEvent(Base):
+    """
+    A webhook event that was already applied (or found to be stale).
+    
+    Providers redeliver events they are unsure we received; the webhook
+    consumer skips any event whose key is recorded here. Rows are purged
+    after WEBHOOK_DEDUP_RETENTION_HOURS.
+    
+    Attributes:
+        event_key: Identity of the event across redeliveries
+            (see app.services.webhook_queue.event_key)
+        event_type: Event type of the first delivery
+        call_id: Provider call ID
+        processed_at: When the event was applied
+    """
+    __tablename__ = "processed_webhook_events"
+    
+    event_key = Column(String(300), primary_key=True)
+    event_type = Column(String(50), nullable=False)
+    call_id = Column(String(255), nullable=True)
+    processed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<ProcessedWebhookEvent(key={self.event_key}, type={self.event_type})>"
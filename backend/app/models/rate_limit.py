@@ -0,0 +1,31 @@
+"""
+Rate limit bucket model definition.
+
+SQLAlchemy model for token buckets shared by all scheduler nodes.
+"""
+
+from sqlalchemy import Column, String, DateTime, Float
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class RateLimitBucket(Base):
+    """
+    Token bucket state shared through Postgres.
+    
+    Attributes:
+        name: Bucket name (e.g. "vapi_calls")
+        tokens: Tokens left as of updated_at
+        updated_at: When tokens was last computed
+        paused_until: No tokens are handed out before this time (429 cooldown)
+    """
+    __tablename__ = "rate_limit_buckets"
+    
+    name = Column(String(100), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    paused_until = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self):
+        return f"<RateLimitBucket(name={self.name}, tokens={self.tokens})>"
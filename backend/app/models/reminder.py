@@ -4,14 +4,18 @@ Reminder model definition.
 SQLAlchemy model for storing reminder data.
 """
 
-from sqlalchemy import Column, String, DateTime, Enum, Text, Integer
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, String, DateTime, Enum, Text, Integer, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 import uuid
 import enum
 
 from app.core.database import Base
 
+# Text search configuration of search_vector (see app.services.reminder_search)
+SEARCH_CONFIG = "english"
+
 
 class ReminderStatus(str, enum.Enum):
     """Reminder status enum."""
@@ -33,18 +37,38 @@ class Reminder(Base):
         timezone: User's timezone
         status: Current status (scheduled, completed, failed)
         call_attempts: Number of call attempts made
+        next_attempt_at: When the next call attempt is due (None if no call is pending)
         last_error: Last error message if failed
+        vapi_call_id: Call ID at the provider that placed the last call
+        call_provider: Telephony provider of the last call (vapi or twilio)
+        call_placed_at: When the pending call was placed
+        status_check_at: When to poll the pending call's status if no webhook arrived
+        claimed_by: Scheduler node currently holding the dispatch lease
+        lease_expires_at: When the dispatch lease lapses and can be reclaimed
+        version: Version of the dispatch state, bumped by every attempt
+            claim and outcome write; buffered writes only apply to the
+            version they were based on
         created_at: When reminder was created
         updated_at: Last update timestamp
         completed_at: When reminder was completed
+        search_vector: Full-text document of title and message, kept up
+            to date by Postgres (not loaded unless asked for)
     """
     __tablename__ = "reminders"
+    __table_args__ = (
+        # Sort key of the reminder list, for keyset pagination in both directions
+        Index("ix_reminders_scheduled_datetime_id", "scheduled_datetime", "id"),
+        # Search (see app.services.reminder_search)
+        Index("ix_reminders_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_reminders_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_reminders_message_trgm", "message", postgresql_using="gin", postgresql_ops={"message": "gin_trgm_ops"}),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     title = Column(String(255), nullable=False)
     message = Column(Text, nullable=False)
     phone_number = Column(String(20), nullable=False)
-    scheduled_datetime = Column(DateTime(timezone=True), nullable=False, index=True)
+    scheduled_datetime = Column(DateTime(timezone=True), nullable=False)
     timezone = Column(String(50), nullable=False)
     status = Column(
         Enum(ReminderStatus), 
@@ -53,11 +77,26 @@ class Reminder(Base):
         index=True
     )
     call_attempts = Column(Integer, default=0)
-    vapi_call_id = Column(String(255), nullable=True)  # Vapi call ID for tracking
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    vapi_call_id = Column(String(255), nullable=True, index=True)  # Provider call ID for tracking
+    call_provider = Column(String(20), nullable=True)  # Provider that placed the call
+    call_placed_at = Column(DateTime(timezone=True), nullable=True)
+    status_check_at = Column(DateTime(timezone=True), nullable=True, index=True)
     last_error = Column(Text, nullable=True)
+    claimed_by = Column(String(255), nullable=True)  # Scheduler node holding the lease
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(message, '')), 'B')",
+            persisted=True
+        )
+    ))
     
     def __repr__(self):
         return f"<Reminder(id={self.id}, title={self.title}, status={self.status})>"
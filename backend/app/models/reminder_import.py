@@ -0,0 +1,56 @@
+"""
+Reminder import model definition.
+
+SQLAlchemy model for file imports of reminders and their progress.
+"""
+
+from sqlalchemy import Column, String, DateTime, Integer, BigInteger, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+
+from app.core.database import Base
+
+
+class ReminderImport(Base):
+    """
+    One CSV or NDJSON file being loaded into reminders.
+    
+    Counters are updated after every committed batch, so they double as
+    progress while the import runs.
+    
+    Attributes:
+        id: Unique identifier (UUID)
+        filename: Name of the imported file
+        format: csv or ndjson
+        status: pending, running, completed or failed
+        bytes_total: Size of the file
+        bytes_read: Bytes of the file read so far
+        rows_read: Data rows read so far
+        rows_imported: Rows created as reminders
+        rows_rejected: Rows written to the error report instead
+        error: Why the import failed
+        error_report: Path of the CSV report of rejected rows
+        created_at: When the import was submitted
+        started_at: When loading started
+        finished_at: When the import completed or failed
+    """
+    __tablename__ = "reminder_imports"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    filename = Column(String(255), nullable=False)
+    format = Column(String(10), nullable=False)
+    status = Column(String(20), nullable=False, default="pending")
+    bytes_total = Column(BigInteger, nullable=True)
+    bytes_read = Column(BigInteger, nullable=False, default=0)
+    rows_read = Column(Integer, nullable=False, default=0)
+    rows_imported = Column(Integer, nullable=False, default=0)
+    rows_rejected = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    error_report = Column(String(500), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self):
+        return f"<ReminderImport(id={self.id}, status={self.status}, rows_read={self.rows_read})>"
@@ -0,0 +1,53 @@
+"""
+Webhook event model definition.
+
+SQLAlchemy model for call events received by webhook and waiting to be
+applied to their reminders.
+"""
+
+from sqlalchemy import Column, String, DateTime, Integer, BigInteger, Identity, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class WebhookEvent(Base):
+    """
+    A call outcome event queued for the webhook consumer.
+    
+    Events are deleted once applied. Events that keep failing are kept
+    with failed_at set for inspection.
+    
+    Attributes:
+        id: Arrival order
+        provider: Provider that sent the event (vapi or twilio)
+        event_type: call.ended or call.failed
+        event_key: Identity across redeliveries, for deduplication
+        reminder_id: Reminder the call was for (None if only the call ID
+            was sent; resolved through reminders.vapi_call_id)
+        call_id: Provider call ID
+        error_message: Failure reason for call.failed
+        payload: Raw event as received
+        received_at: When the event was accepted
+        attempts: Failed attempts to apply it
+        last_error: Error of the last failed attempt
+        failed_at: When the consumer gave up on it
+    """
+    __tablename__ = "webhook_events"
+    
+    id = Column(BigInteger, Identity(), primary_key=True)
+    provider = Column(String(20), nullable=False)
+    event_type = Column(String(50), nullable=False)
+    event_key = Column(String(300), nullable=True)
+    reminder_id = Column(UUID(as_uuid=True), nullable=True)
+    call_id = Column(String(255), nullable=True)
+    error_message = Column(Text, nullable=True)
+    payload = Column(JSONB, nullable=False)
+    received_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text, nullable=True)
+    failed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self):
+        return f"<WebhookEvent(id={self.id}, type={self.event_type}, reminder_id={self.reminder_id})>"
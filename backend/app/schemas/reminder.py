@@ -4,7 +4,7 @@ Pydantic schemas for reminder validation and serialization.
 
 from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 import re
 
@@ -65,5 +65,32 @@ class ReminderListResponse(BaseModel):
     """Schema for list of reminders."""
     reminders: list[ReminderResponse]
     total: int
-    page: int
+    total_type: str = "exact"  # exact, estimated or cached
+    page: Optional[int] = None  # None for pages fetched by cursor
     page_size: int
+    next_cursor: Optional[str] = None
+
+
+class ReminderBulkUpdateItem(ReminderUpdate):
+    """One item of a bulk update: the reminder ID and the fields to change."""
+    id: UUID
+
+
+class ReminderBulkDelete(BaseModel):
+    """IDs of the reminders to delete in bulk."""
+    ids: list[UUID]
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of one item of a bulk request."""
+    index: int  # position in the request
+    id: Optional[UUID] = None
+    ok: bool
+    error: Optional[Any] = None  # message, or validation errors of the item
+
+
+class BulkResponse(BaseModel):
+    """Per-item outcome of a bulk request."""
+    succeeded: int
+    failed: int
+    results: list[BulkItemResult]
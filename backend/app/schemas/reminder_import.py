@@ -0,0 +1,45 @@
+"""
+Pydantic schemas for reminder imports.
+"""
+
+from pydantic import BaseModel, Field, computed_field
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+
+class ReminderImportResponse(BaseModel):
+    """Schema for import status and progress."""
+    id: UUID
+    filename: str
+    format: str
+    status: str  # pending, running, completed or failed
+    bytes_total: Optional[int] = None
+    bytes_read: int
+    rows_read: int
+    rows_imported: int
+    rows_rejected: int
+    error: Optional[str] = None
+    error_report: Optional[str] = Field(None, exclude=True)
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    @computed_field
+    @property
+    def progress(self) -> Optional[float]:
+        """Share of the file read, from 0 to 1."""
+        if not self.bytes_total:
+            return None
+        return round(min(self.bytes_read / self.bytes_total, 1.0), 4)
+    
+    @computed_field
+    @property
+    def error_report_url(self) -> Optional[str]:
+        """Where to download the rejected rows, once there are any."""
+        if not self.error_report:
+            return None
+        return f"/api/v1/imports/{self.id}/errors"
+    
+    class Config:
+        from_attributes = True
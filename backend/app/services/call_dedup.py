@@ -0,0 +1,223 @@
+"""
+Idempotency of call creation.
+
+Every call attempt gets a key, "<reminder id>:<attempt>", reserved in
+the call_dispatches table before anything is dialed. A reminder whose
+previous attempt is still in flight, or whose attempt was already
+placed, is not dialed again; an attempt whose create_call request may
+or may not have gone through is resolved by looking the key up at the
+provider instead of placing another call.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+from uuid import UUID
+import logging
+
+from sqlalchemy import Row, column, delete, literal, select, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.call_dispatch import CallDispatch
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+PLACED = "placed"
+UNKNOWN = "unknown"
+FAILED = "failed"
+
+IN_FLIGHT = (PENDING, UNKNOWN)
+
+
+def dispatch_key(reminder_id: UUID, attempt: int) -> str:
+    """Idempotency key of one call attempt."""
+    return f"{reminder_id}:{attempt}"
+
+
+@dataclass
+class DispatchRecord:
+    """Cached state of a call attempt."""
+    
+    status: str
+    provider: Optional[str] = None
+    call_id: Optional[str] = None
+
+
+class CallDedup:
+    """
+    Reserves call attempts and tracks what became of them.
+    
+    The table is the source of truth, shared by every scheduler node;
+    an in-process LRU of the last CALL_DEDUP_CACHE_SIZE keys answers
+    repeated checks for attempts this node dispatched without a query.
+    """
+    
+    def __init__(self, cache_size: int):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, DispatchRecord]" = OrderedDict()
+        self.reserved = 0
+        self.blocked = 0
+        self.cache_hits = 0
+        self.unknown = 0
+    
+    def _remember(self, key: str, record: DispatchRecord):
+        self._cache[key] = record
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+    
+    def lookup(self, key: str) -> Optional[DispatchRecord]:
+        """Cached state of an attempt, if this node has seen it."""
+        record = self._cache.get(key)
+        if record is not None:
+            self.cache_hits += 1
+            self._cache.move_to_end(key)
+        return record
+    
+    async def reserve(self, db: AsyncSession, claimed: List[Row]) -> Set[UUID]:
+        """
+        Reserve the attempts of freshly claimed reminders.
+        
+        Runs in the claim's transaction. An attempt cannot be reserved
+        if its key exists already or the reminder has another attempt
+        in flight (unique partial index); such reminders must not be
+        dialed.
+        
+        Args:
+            db: Session of the dispatch claim
+            claimed: Claimed rows with id and call_attempts
+        
+        Returns:
+            IDs of the reminders whose attempt was reserved
+        """
+        if not claimed:
+            return set()
+        
+        candidates = []
+        for row in claimed:
+            key = dispatch_key(row.id, row.call_attempts)
+            cached = self.lookup(key)
+            if cached is not None and cached.status != PENDING:
+                continue
+            candidates.append(row)
+        
+        reserved: Set[UUID] = set()
+        if candidates:
+            table = CallDispatch.__table__.c
+            rows = values(
+                column("idempotency_key", table.idempotency_key.type),
+                column("reminder_id", table.reminder_id.type),
+                column("attempt", table.attempt.type),
+                name="attempts"
+            ).data([
+                (dispatch_key(row.id, row.call_attempts), row.id, row.call_attempts)
+                for row in candidates
+            ])
+            
+            result = await db.execute(
+                pg_insert(CallDispatch)
+                .from_select(
+                    ["idempotency_key", "reminder_id", "attempt", "status"],
+                    select(rows.c.idempotency_key, rows.c.reminder_id, rows.c.attempt, literal(PENDING))
+                )
+                .on_conflict_do_nothing()
+                .returning(CallDispatch.reminder_id)
+            )
+            reserved = set(result.scalars().all())
+        
+        for row in claimed:
+            if row.id in reserved:
+                self._remember(dispatch_key(row.id, row.call_attempts), DispatchRecord(PENDING))
+        
+        self.reserved += len(reserved)
+        self.blocked += len(claimed) - len(reserved)
+        return reserved
+    
+    async def _update(self, key: str, **changes):
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(CallDispatch)
+                    .where(CallDispatch.idempotency_key == key)
+                    .values(updated_at=func.now(), **changes)
+                )
+                await db.commit()
+        except Exception as e:
+            # The reminder row still records the call; reconciliation copes
+            logger.error(f"Could not record call attempt {key}: {e}")
+    
+    async def mark_placed(self, key: str, provider: str, call_id: Optional[str]):
+        """Record that the provider accepted the call."""
+        self._remember(key, DispatchRecord(PLACED, provider, call_id))
+        await self._update(key, status=PLACED, provider=provider, call_id=call_id)
+    
+    async def mark_unknown(self, key: str, provider: str):
+        """Record that the create_call request may or may not have gone through."""
+        self.unknown += 1
+        self._remember(key, DispatchRecord(UNKNOWN, provider))
+        await self._update(key, status=UNKNOWN, provider=provider)
+    
+    async def mark_failed(self, key: str):
+        """Record that the call was definitely not placed."""
+        self._remember(key, DispatchRecord(FAILED))
+        await self._update(key, status=FAILED)
+    
+    async def release(self, key: str):
+        """
+        Drop the reservation of an attempt that dialed nothing.
+        
+        Used for deferrals, which give the attempt back: the next claim
+        reserves the same key again.
+        """
+        self._cache.pop(key, None)
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    delete(CallDispatch).where(
+                        CallDispatch.idempotency_key == key,
+                        CallDispatch.status == PENDING
+                    )
+                )
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Could not release call attempt {key}: {e}")
+    
+    async def find_in_flight(self, db: AsyncSession, reminder_id: UUID) -> Optional[CallDispatch]:
+        """Get the reminder's attempt that is pending or unknown, if any."""
+        result = await db.execute(
+            select(CallDispatch).where(
+                CallDispatch.reminder_id == reminder_id,
+                CallDispatch.status.in_(IN_FLIGHT)
+            )
+        )
+        return result.scalar_one_or_none()
+    
+    async def purge(self, db: AsyncSession, before: datetime) -> int:
+        """Delete settled attempts created before ``before``."""
+        result = await db.execute(
+            delete(CallDispatch).where(
+                CallDispatch.created_at < before,
+                CallDispatch.status.in_((PLACED, FAILED))
+            )
+        )
+        return result.rowcount
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get dedup counters for the metrics endpoint."""
+        return {
+            "reserved": self.reserved,
+            "blocked": self.blocked,
+            "outcome_unknown": self.unknown,
+            "cache_hits": self.cache_hits,
+            "cache_size": len(self._cache),
+        }
+
+
+# Singleton instance
+call_dedup = CallDedup(cache_size=settings.CALL_DEDUP_CACHE_SIZE)
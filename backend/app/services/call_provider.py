@@ -0,0 +1,205 @@
+"""
+Common interface for telephony providers.
+
+Each provider (Vapi, Twilio) places reminder calls through its own API
+but reports results in the same shape, so the scheduler, the call
+router and the reconciler do not care which one dialed.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Optional
+import logging
+import time
+
+import httpx
+
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.rate_limiter import CallRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Normalized call statuses returned by get_call_status
+CALL_PENDING_STATUSES = ("scheduled", "queued", "ringing", "in-progress", "forwarding")
+CALL_ENDED = "ended"
+CALL_FAILED = "failed"
+
+# Request errors after which the provider may still have created the call
+OUTCOME_UNKNOWN_ERRORS = (httpx.ReadTimeout, httpx.WriteTimeout, httpx.ReadError, httpx.RemoteProtocolError)
+
+
+class CallDeferredError(Exception):
+    """
+    Raised when a call was not placed and should simply be tried later.
+    
+    Unlike other errors, a deferral must not use up one of the
+    reminder's attempts.
+    """
+    
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CallRateLimitError(CallDeferredError):
+    """Raised when a provider answers 429 Too Many Requests."""
+
+
+class CircuitOpenError(CallDeferredError):
+    """Raised when the circuit breaker is not letting calls through."""
+
+
+class ProviderUnavailableError(Exception):
+    """
+    Raised when a provider could not be reached, failed with a 5xx or
+    rejected our credentials.
+    """
+
+
+class CallOutcomeUnknownError(Exception):
+    """
+    Raised when a create_call request failed after it was sent.
+    
+    The provider may have placed the call anyway, so it must not be
+    placed again (nor through another provider) until the attempt has
+    been looked up by its idempotency key. The router sets ``provider``.
+    """
+    
+    provider: Optional["CallProvider"] = None
+
+
+class CallNotFoundError(Exception):
+    """Raised when the provider does not know the requested call."""
+
+
+class CallLookupInconclusiveError(Exception):
+    """
+    Raised when find_call could not search every call the attempt may
+    have placed, so finding nothing does not prove it was not placed.
+    """
+
+
+class CallProvider(ABC):
+    """
+    Base class for telephony providers.
+    
+    Subclasses set ``name``, ``rate_limiter`` and ``breaker`` and
+    implement call creation and status lookup. Results are normalized:
+    - create_call returns the provider's call with at least ``id`` and
+      ``status``
+    - get_call_status returns ``status`` (one of CALL_PENDING_STATUSES,
+      CALL_ENDED or CALL_FAILED), plus ``endedReason``, ``endedAt``
+      (ISO 8601) and ``error`` when known
+    
+    Errors follow the same contract for every provider:
+    CallDeferredError when nothing was dialed and the call should be
+    retried later, ProviderUnavailableError when the provider itself
+    failed, CallOutcomeUnknownError when the request was sent but its
+    answer was lost, CallNotFoundError for unknown calls.
+    
+    Calls carry an idempotency key ("<reminder id>:<attempt>", see
+    app.services.call_dedup) that find_call can look up later.
+    """
+    
+    name: str
+    rate_limiter: CallRateLimiter
+    breaker: CircuitBreaker
+    
+    @property
+    @abstractmethod
+    def is_configured(self) -> bool:
+        """Whether the credentials needed to place calls are set."""
+    
+    @property
+    @abstractmethod
+    def awaits_outcome(self) -> bool:
+        """Whether the provider reports call outcomes by webhook."""
+    
+    async def start(self):
+        """Open long-lived resources (e.g. HTTP clients)."""
+    
+    async def close(self):
+        """Release long-lived resources."""
+    
+    @abstractmethod
+    async def create_call(
+        self,
+        phone_number: str,
+        message: str,
+        reminder_id: str,
+        title: Optional[str] = None,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Place a reminder call."""
+    
+    @abstractmethod
+    async def get_call_status(self, call_id: str) -> Dict[str, Any]:
+        """Get the normalized status of a call."""
+    
+    async def find_call(
+        self,
+        idempotency_key: str,
+        phone_number: str,
+        since: datetime,
+        until: datetime
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a call by idempotency key.
+        
+        Args:
+            idempotency_key: Key of the call attempt
+            phone_number: Number that was called
+            since: Calls created before this are not searched
+            until: Calls created after this are not searched
+        
+        Returns:
+            Normalized call status (as get_call_status), or None if the
+            provider has no such call
+        
+        Raises:
+            CallLookupInconclusiveError: If the provider cannot search
+                every call created in the window
+        """
+        raise CallLookupInconclusiveError(f"{self.name} cannot look calls up by key")
+    
+    def saturated(self) -> bool:
+        """Whether every concurrency slot is taken."""
+        concurrency = self.rate_limiter.concurrency
+        return concurrency.active >= int(concurrency.limit)
+    
+    def acquire_circuit(self):
+        """
+        Ask the circuit breaker to let a call through.
+        
+        Raises:
+            CircuitOpenError: If calls to this provider are on hold
+        """
+        wait = self.breaker.try_acquire()
+        if wait:
+            raise CircuitOpenError(
+                f"{self.name} circuit open, retry after {wait:.0f}s",
+                retry_after=wait
+            )
+    
+    def record_call(self, started: float, status_code: Optional[int]):
+        """
+        Report a call's outcome to the circuit breaker and concurrency limit.
+        
+        Network errors (no status code) and 5xx count as provider
+        failures; 429 only shrinks the concurrency limit; other client
+        errors say nothing about the provider's health.
+        """
+        latency = time.monotonic() - started
+        
+        if status_code is None or status_code >= 500:
+            self.breaker.record_failure()
+            self.rate_limiter.record_outcome(latency, ok=False)
+        elif status_code == 429:
+            self.breaker.release()
+            self.rate_limiter.record_outcome(latency, ok=False)
+        else:
+            if status_code < 400:
+                self.breaker.record_success()
+            else:
+                self.breaker.release()
+            self.rate_limiter.record_outcome(latency, ok=True)
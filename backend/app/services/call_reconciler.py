@@ -0,0 +1,341 @@
+"""
+Reconciliation of placed calls whose outcome webhook never arrived.
+
+When the provider reports outcomes by webhook (VAPI_WEBHOOK_URL,
+TWILIO_STATUS_CALLBACK_URL), a reminder stays SCHEDULED after its call
+is placed until the outcome arrives. If that webhook is lost the
+reminder would wait forever, so calls older than
+SCHEDULER_RECONCILE_THRESHOLD are polled with get_call_status and their
+outcome is written back in bulk.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+import asyncio
+import logging
+
+from sqlalchemy import Row, select, update
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.reminder import Reminder, ReminderStatus
+from app.services.call_dedup import call_dedup
+from app.services.call_provider import CALL_FAILED, CALL_PENDING_STATUSES, CallLookupInconclusiveError, CallNotFoundError
+from app.services.call_router import call_router
+from app.utils.backoff import next_attempt_time
+
+if TYPE_CHECKING:
+    from app.services.scheduler import ReminderScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class CallStatusReconciler:
+    """
+    Polls the status of calls that have been waiting too long for a webhook.
+    
+    Each sweep claims due calls by pushing their status_check_at forward
+    (FOR UPDATE SKIP LOCKED, so several nodes never poll the same call),
+    polls them with at most SCHEDULER_RECONCILE_CONCURRENCY requests in
+    flight, and hands outcomes to the scheduler's write-behind buffer:
+    - finished calls complete the reminder, or count as a failed attempt
+      and schedule a retry with backoff
+    - calls still in progress are checked again after a delay that grows
+      with the call's age (half its age, capped at
+      SCHEDULER_RECONCILE_MAX_INTERVAL)
+    - calls unknown to the provider, or older than SCHEDULER_RECONCILE_MAX_AGE,
+      count as failed attempts
+    
+    Reminders without a call ID have an attempt whose create_call answer
+    was lost (see app.services.call_dedup). The call is looked up by the
+    attempt's idempotency key, among the calls created around the
+    attempt. If the provider has none after CALL_DEDUP_RESOLVE_TIMEOUT
+    seconds, the attempt counts as failed and is retried. If the lookup
+    stays inconclusive (the provider could not search the whole window),
+    the attempt is left unknown and the reminder fails without another
+    call, since redialing could call the person twice.
+    """
+    
+    def __init__(self, scheduler: "ReminderScheduler"):
+        self.scheduler = scheduler
+        self.threshold = timedelta(seconds=settings.SCHEDULER_RECONCILE_THRESHOLD)
+        self.min_interval = timedelta(seconds=settings.SCHEDULER_RECONCILE_INTERVAL)
+        self.max_interval = timedelta(seconds=settings.SCHEDULER_RECONCILE_MAX_INTERVAL)
+        self.max_age = timedelta(seconds=settings.SCHEDULER_RECONCILE_MAX_AGE)
+        self.batch_size = settings.SCHEDULER_RECONCILE_BATCH_SIZE
+        self.concurrency = settings.SCHEDULER_RECONCILE_CONCURRENCY
+        self.resolve_timeout = timedelta(seconds=settings.CALL_DEDUP_RESOLVE_TIMEOUT)
+        self.dedup_retention = timedelta(hours=settings.CALL_DEDUP_RETENTION_HOURS)
+        self.webhook_dedup_retention = timedelta(hours=settings.WEBHOOK_DEDUP_RETENTION_HOURS)
+        
+        self.checked = 0
+        self.completed = 0
+        self.failed = 0
+        self.still_pending = 0
+        self.errors = 0
+        self.resolved_by_key = 0
+        self.unresolved = 0
+        self.last_run_at: Optional[datetime] = None
+    
+    def check_delay(self, age: timedelta) -> timedelta:
+        """Time until the next status check of a call that is still going."""
+        return min(self.max_interval, max(self.min_interval, age / 2))
+    
+    async def run(self):
+        """Sweep all calls whose status check is due."""
+        self.last_run_at = datetime.now(timezone.utc)
+        
+        try:
+            while True:
+                calls = await self.claim_batch()
+                if calls:
+                    await self.reconcile(calls)
+                if len(calls) < self.batch_size:
+                    break
+            
+            async with AsyncSessionLocal() as db:
+                purged = await call_dedup.purge(db, self.last_run_at - self.dedup_retention)
+                forgotten = await self.scheduler.webhook_consumer.purge(
+                    db, self.last_run_at - self.webhook_dedup_retention
+                )
+                await db.commit()
+            if purged:
+                logger.info(f"Purged {purged} settled call attempts")
+            if forgotten:
+                logger.info(f"Purged {forgotten} processed webhook event keys")
+        except Exception as e:
+            logger.error(f"Error reconciling call statuses: {e}")
+    
+    async def claim_batch(self) -> List[Row]:
+        """
+        Claim calls due for a status check.
+        
+        Claiming pushes status_check_at forward by the threshold, which
+        doubles as a lease: if this node dies mid-sweep the calls come up
+        again once it lapses.
+        
+        Returns:
+            Rows with id, phone_number, vapi_call_id, call_provider,
+            call_placed_at, call_attempts and version
+        """
+        candidates = (
+            select(Reminder.id)
+            .where(
+                Reminder.status == ReminderStatus.SCHEDULED,
+                Reminder.status_check_at <= func.now(),
+                Reminder.next_attempt_at.is_(None)
+            )
+            .order_by(Reminder.status_check_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(Reminder)
+                .where(Reminder.id.in_(candidates))
+                .values(
+                    status_check_at=func.now() + self.threshold,
+                    updated_at=Reminder.updated_at  # Bookkeeping, not a user-visible edit
+                )
+                .returning(
+                    Reminder.id,
+                    Reminder.phone_number,
+                    Reminder.vapi_call_id,
+                    Reminder.call_provider,
+                    Reminder.call_placed_at,
+                    Reminder.call_attempts,
+                    Reminder.version
+                )
+                .execution_options(synchronize_session=False)
+            )
+            calls = result.all()
+            await db.commit()
+        
+        return calls
+    
+    async def reconcile(self, calls: List[Row]):
+        """Poll a batch of calls concurrently and record their outcomes."""
+        slots = asyncio.Semaphore(self.concurrency)
+        
+        async def check(call: Row):
+            async with slots:
+                await self.reconcile_one(call)
+        
+        await asyncio.gather(*(check(call) for call in calls))
+        logger.info(f"Reconciled {len(calls)} calls awaiting webhooks")
+    
+    async def reconcile_one(self, call: Row):
+        """Poll one call and buffer the resulting reminder update."""
+        now = datetime.now(timezone.utc)
+        age = now - call.call_placed_at if call.call_placed_at else self.threshold
+        self.checked += 1
+        
+        try:
+            if call.vapi_call_id is None:
+                result = await self.resolve_by_key(call, now)
+                if result is None:
+                    return
+            else:
+                result = await call_router.get_call_status(call.call_provider, call.vapi_call_id)
+        except CallNotFoundError:
+            self.record_failure(call, "Call not found at provider")
+            return
+        except Exception as e:
+            # Leave it to the next sweep once the claim lapses
+            self.errors += 1
+            logger.warning(f"Could not check call {call.vapi_call_id} of reminder {call.id}: {e}")
+            return
+        
+        call_status = (result.get("status") or "").lower()
+        ended_reason = (result.get("endedReason") or "").lower()
+        
+        if call_status in CALL_PENDING_STATUSES:
+            if age >= self.max_age:
+                self.record_failure(call, f"No call outcome after {int(age.total_seconds())}s")
+                return
+            self.still_pending += 1
+            self.scheduler.status_writer.add(
+                call.id,
+                call.call_attempts,
+                call.version,
+                status_check_at=now + self.check_delay(age)
+            )
+            return
+        
+        if call_status == CALL_FAILED:
+            error = (result.get("error") or {}).get("message") or ended_reason or call_status
+            self.record_failure(call, f"Call failed: {error}")
+            return
+        
+        ended_at = result.get("endedAt")
+        self.completed += 1
+        self.scheduler.status_writer.add(
+            call.id,
+            call.call_attempts,
+            call.version,
+            status=ReminderStatus.COMPLETED,
+            completed_at=datetime.fromisoformat(ended_at.replace("Z", "+00:00")) if ended_at else now,
+            status_check_at=None
+        )
+        logger.info(f"Reminder {call.id} marked as COMPLETED by reconciliation")
+    
+    async def resolve_by_key(self, call: Row, now: datetime) -> Optional[Dict[str, Any]]:
+        """
+        Find the call of an attempt whose create_call answer was lost.
+        
+        Returns:
+            Normalized call status if the provider has the call, None if
+            the outcome was recorded here (not placed, unknown, or check
+            later)
+        """
+        async with AsyncSessionLocal() as db:
+            dispatch = await call_dedup.find_in_flight(db, call.id)
+        
+        if dispatch is None:
+            self.record_failure(call, "Call outcome unknown")
+            return None
+        
+        # The call was created between the reservation and the lost answer; allow for clock skew
+        placed_by = call.call_placed_at or dispatch.updated_at
+        inconclusive = None
+        try:
+            found = await call_router.find_call(
+                dispatch.provider,
+                dispatch.idempotency_key,
+                call.phone_number,
+                since=dispatch.created_at - timedelta(minutes=1),
+                until=placed_by + timedelta(minutes=1)
+            )
+        except CallLookupInconclusiveError as e:
+            found, inconclusive = None, e
+        
+        if found is not None:
+            provider, result = found
+            self.resolved_by_key += 1
+            await call_dedup.mark_placed(dispatch.idempotency_key, provider.name, result.get("id"))
+            self.scheduler.status_writer.add(
+                call.id,
+                call.call_attempts,
+                call.version,
+                vapi_call_id=result.get("id"),
+                call_provider=provider.name
+            )
+            logger.info(f"Found call {result.get('id')} of reminder {call.id} by key {dispatch.idempotency_key}")
+            return result
+        
+        if now - dispatch.created_at >= self.resolve_timeout:
+            if inconclusive is not None:
+                self.record_unresolved(call, f"Call outcome unknown: {inconclusive}")
+                return None
+            await call_dedup.mark_failed(dispatch.idempotency_key)
+            self.record_failure(call, "Call was not placed")
+            return None
+        
+        self.still_pending += 1
+        self.scheduler.status_writer.add(call.id, call.call_attempts, call.version, status_check_at=now + self.min_interval)
+        return None
+    
+    def record_unresolved(self, call: Row, error: str):
+        """
+        Fail a reminder whose call may or may not have been placed.
+        
+        The attempt stays unknown in call_dispatches, which also keeps
+        the reminder from being dialed again.
+        """
+        self.unresolved += 1
+        self.scheduler.status_writer.add(
+            call.id,
+            call.call_attempts,
+            call.version,
+            status=ReminderStatus.FAILED,
+            last_error=error,
+            next_attempt_at=None,
+            status_check_at=None
+        )
+        logger.warning(f"Reminder {call.id} marked as FAILED by reconciliation: {error}")
+    
+    def record_failure(self, call: Row, error: str):
+        """Count the call as a failed attempt and retry or give up."""
+        self.failed += 1
+        attempts = call.call_attempts or 0
+        
+        if attempts >= self.scheduler.max_retries:
+            self.scheduler.status_writer.add(
+                call.id,
+                attempts,
+                call.version,
+                status=ReminderStatus.FAILED,
+                last_error=error,
+                next_attempt_at=None,
+                status_check_at=None
+            )
+            logger.warning(f"Reminder {call.id} marked as FAILED by reconciliation: {error}")
+            return
+        
+        retry_at = next_attempt_time(attempts)
+        self.scheduler.status_writer.add(
+            call.id,
+            attempts,
+            call.version,
+            last_error=error,
+            next_attempt_at=retry_at,
+            status_check_at=None
+        )
+        self.scheduler.queue.schedule(call.id, retry_at)
+        logger.info(f"Reminder {call.id} will be retried at {retry_at.isoformat()}: {error}")
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get reconciliation counters for the metrics endpoint."""
+        return {
+            "checked": self.checked,
+            "completed": self.completed,
+            "failed": self.failed,
+            "still_pending": self.still_pending,
+            "errors": self.errors,
+            "resolved_by_key": self.resolved_by_key,
+            "unresolved": self.unresolved,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+        }
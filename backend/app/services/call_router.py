@@ -0,0 +1,272 @@
+"""
+Routing of reminder calls across telephony providers.
+
+Picks a provider per call from recent latency and error rates, and
+fails over to the next one when a provider is saturated, rate limited
+or down, so one vendor's capacity limits do not cap dispatch.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import random
+import time
+
+from app.core.config import settings
+from app.services.call_provider import (
+    CallDeferredError,
+    CallLookupInconclusiveError,
+    CallOutcomeUnknownError,
+    CallProvider,
+    CircuitOpenError,
+    ProviderUnavailableError,
+)
+from app.services.metrics import RollingStats
+from app.services.twilio_service import twilio_service
+from app.services.vapi_service import vapi_service
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderStats:
+    """Rolling call creation latency and error rate of one provider."""
+    
+    def __init__(self, window: int):
+        self.latency = RollingStats(maxlen=window)
+        self.errors = RollingStats(maxlen=window)
+        self.selected = 0
+        self.failovers = 0
+    
+    def record(self, latency: float, ok: bool):
+        self.latency.add(latency)
+        self.errors.add(0.0 if ok else 1.0)
+    
+    def error_rate(self) -> float:
+        return self.errors.summary()["mean"] or 0.0
+
+
+class CallRouter:
+    """
+    Places calls through the best available provider.
+    
+    Providers are listed in priority order (CALL_PROVIDERS); those without
+    credentials are skipped. For each call:
+    1. Healthy providers (circuit closed, free concurrency slot) come
+       first, ordered by strategy:
+       - latency: median create_call latency of the last
+         CALL_ROUTER_STATS_WINDOW calls, inflated by the error rate
+         (CALL_ROUTER_ERROR_PENALTY); a provider without samples ranks
+         first so it gets measured. A share of calls
+         (CALL_ROUTER_EXPLORE_RATE) goes to another healthy provider so
+         its stats stay current.
+       - priority: the configured order
+    2. Saturated or open providers follow as a last resort.
+    3. A provider that defers (429, open circuit) or fails with a
+       network error or 5xx hands the call to the next one. Other errors
+       (e.g. an invalid number) are final, and so is a request whose
+       answer was lost (CallOutcomeUnknownError): the call may exist,
+       so it is looked up by key instead of dialed elsewhere.
+    
+    If every provider deferred, the call is deferred with the shortest
+    retry delay; otherwise the last provider failure is raised.
+    """
+    
+    def __init__(self, providers: List[CallProvider]):
+        self.providers = providers
+        self.strategy = settings.CALL_ROUTING_STRATEGY
+        self.error_penalty = settings.CALL_ROUTER_ERROR_PENALTY
+        self.explore_rate = settings.CALL_ROUTER_EXPLORE_RATE
+        self.stats = {provider.name: ProviderStats(settings.CALL_ROUTER_STATS_WINDOW) for provider in providers}
+        if self.strategy not in ("latency", "priority"):
+            raise ValueError("CALL_ROUTING_STRATEGY must be 'latency' or 'priority'")
+    
+    def get_provider(self, name: Optional[str]) -> CallProvider:
+        """
+        Look up a provider by name.
+        
+        Reminders placed before providers were recorded have no name;
+        they were all placed through Vapi.
+        """
+        for provider in self.providers:
+            if provider.name == (name or "vapi"):
+                return provider
+        raise ValueError(f"Unknown call provider: {name}")
+    
+    def score(self, provider: CallProvider) -> float:
+        """Lower is better: median latency inflated by the error rate."""
+        stats = self.stats[provider.name]
+        latency = stats.latency.percentile(50) or 0.0
+        return latency * (1 + self.error_penalty * stats.error_rate())
+    
+    def rank(self) -> List[CallProvider]:
+        """Providers in the order they should be tried for the next call."""
+        candidates = [provider for provider in self.providers if provider.is_configured] or self.providers[:1]
+        healthy = [
+            provider for provider in candidates
+            if not provider.breaker.blocked_for() and not provider.saturated()
+        ]
+        fallback = [provider for provider in candidates if provider not in healthy]
+        
+        if self.strategy == "latency":
+            healthy.sort(key=self.score)
+            fallback.sort(key=self.score)
+            if len(healthy) > 1 and random.random() < self.explore_rate:
+                healthy.insert(0, healthy.pop(random.randrange(1, len(healthy))))
+        
+        return healthy + fallback
+    
+    async def create_call(
+        self,
+        phone_number: str,
+        message: str,
+        reminder_id: str,
+        title: Optional[str] = None,
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[CallProvider, Dict[str, Any]]:
+        """
+        Place a reminder call, failing over between providers.
+        
+        Returns:
+            The provider that placed the call and its call details
+        
+        Raises:
+            CallDeferredError: If every provider deferred the call
+            CallOutcomeUnknownError: If a provider may have placed the call
+            ProviderUnavailableError: If every provider failed
+            Exception: If a provider rejected the call
+        """
+        retry_after: Optional[float] = None
+        last_error: Optional[Exception] = None
+        
+        for provider in self.rank():
+            stats = self.stats[provider.name]
+            started = time.monotonic()
+            try:
+                result = await provider.create_call(
+                    phone_number=phone_number,
+                    message=message,
+                    reminder_id=reminder_id,
+                    title=title,
+                    idempotency_key=idempotency_key
+                )
+            except CircuitOpenError as e:
+                retry_after = e.retry_after if retry_after is None else min(retry_after, e.retry_after)
+                continue
+            except CallDeferredError as e:
+                stats.record(time.monotonic() - started, ok=False)
+                retry_after = e.retry_after if retry_after is None else min(retry_after, e.retry_after)
+            except ProviderUnavailableError as e:
+                stats.record(time.monotonic() - started, ok=False)
+                last_error = e
+            except CallOutcomeUnknownError as e:
+                stats.record(time.monotonic() - started, ok=False)
+                e.provider = provider
+                raise
+            except Exception:
+                # The provider answered; the call itself was rejected
+                stats.record(time.monotonic() - started, ok=True)
+                raise
+            else:
+                stats.record(time.monotonic() - started, ok=True)
+                stats.selected += 1
+                return provider, result
+            
+            stats.failovers += 1
+            logger.warning(f"Call for reminder {reminder_id} not placed by {provider.name}, trying next provider")
+        
+        if retry_after is not None:
+            raise CallDeferredError(
+                f"No call provider available, retry after {retry_after:.0f}s",
+                retry_after=retry_after
+            )
+        raise last_error or ProviderUnavailableError("No call provider available")
+    
+    async def get_call_status(self, provider_name: Optional[str], call_id: str) -> Dict[str, Any]:
+        """Get the normalized status of a call from the provider that placed it."""
+        return await self.get_provider(provider_name).get_call_status(call_id)
+    
+    async def find_call(
+        self,
+        provider_name: Optional[str],
+        idempotency_key: str,
+        phone_number: str,
+        since: datetime,
+        until: datetime
+    ) -> Optional[Tuple[CallProvider, Dict[str, Any]]]:
+        """
+        Look up a call attempt by key.
+        
+        Searches the given provider, or every configured one if it is
+        not known which provider the attempt went to.
+        
+        Returns:
+            The provider holding the call and its normalized status, or None
+        
+        Raises:
+            CallLookupInconclusiveError: If no provider had the call but
+                one of them could not search the whole window
+        """
+        if provider_name:
+            providers = [self.get_provider(provider_name)]
+        else:
+            providers = [provider for provider in self.providers if provider.is_configured]
+        
+        inconclusive = None
+        for provider in providers:
+            try:
+                call = await provider.find_call(idempotency_key, phone_number, since, until)
+            except CallLookupInconclusiveError as e:
+                inconclusive = e
+                continue
+            if call is not None:
+                return provider, call
+        
+        if inconclusive is not None:
+            raise inconclusive
+        return None
+    
+    async def start(self):
+        """Open every provider's long-lived resources."""
+        for provider in self.providers:
+            await provider.start()
+        configured = [provider.name for provider in self.providers if provider.is_configured]
+        logger.info(f"Call providers: {', '.join(configured) or 'none configured'} (routing: {self.strategy})")
+    
+    async def close(self):
+        """Release every provider's long-lived resources."""
+        for provider in self.providers:
+            await provider.close()
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get routing stats, rate limiter and breaker state per provider."""
+        return {
+            "strategy": self.strategy,
+            "providers": {
+                provider.name: {
+                    "configured": provider.is_configured,
+                    "saturated": provider.saturated(),
+                    "score": round(self.score(provider), 4),
+                    "selected": self.stats[provider.name].selected,
+                    "failovers": self.stats[provider.name].failovers,
+                    "error_rate": round(self.stats[provider.name].error_rate(), 4),
+                    "latency_seconds": self.stats[provider.name].latency.summary(),
+                    "rate_limiter": provider.rate_limiter.get_metrics(),
+                    "circuit_breaker": provider.breaker.get_metrics(),
+                }
+                for provider in self.providers
+            },
+        }
+
+
+def create_call_router() -> CallRouter:
+    """Build the router from CALL_PROVIDERS."""
+    available = {provider.name: provider for provider in (vapi_service, twilio_service)}
+    names = [name.strip() for name in settings.CALL_PROVIDERS.split(",") if name.strip()]
+    unknown = [name for name in names if name not in available]
+    if unknown or not names:
+        raise ValueError(f"CALL_PROVIDERS must list providers from: {', '.join(available)}")
+    return CallRouter([available[name] for name in names])
+
+
+# Singleton instance
+call_router = create_call_router()
@@ -0,0 +1,233 @@
+"""
+Catch-up for reminders missed while the scheduler was down.
+
+The live dispatch path only claims reminders whose next attempt is at
+most SCHEDULER_MISSED_THRESHOLD seconds in the past. Anything older was
+missed (deploy, outage) and is drained here, in due-time order and at
+its own rate, so live reminders keep going out on time.
+
+The drain runs on startup and then every half lease
+(SCHEDULER_LEASE_SECONDS / 2), so reminders still leased to a node that
+went away are swept up once their lease expires.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+import asyncio
+import logging
+
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.reminder import Reminder, ReminderStatus
+
+if TYPE_CHECKING:
+    from app.services.scheduler import ReminderScheduler
+
+logger = logging.getLogger(__name__)
+
+CATCHUP_POLICIES = ("deliver", "expire", "skip")
+
+
+class MissedReminderCatchUp:
+    """
+    Drains the missed-reminder backlog according to a policy.
+    
+    Policies (SCHEDULER_CATCHUP_POLICY):
+    - deliver: call them late, at most SCHEDULER_CATCHUP_RATE per second
+      and SCHEDULER_CATCHUP_MAX_CONCURRENT at a time
+    - expire: mark them FAILED without calling
+    - skip: leave them untouched (they stay out of the live due set)
+    """
+    
+    def __init__(self, scheduler: "ReminderScheduler"):
+        if settings.SCHEDULER_CATCHUP_POLICY not in CATCHUP_POLICIES:
+            raise ValueError(
+                f"SCHEDULER_CATCHUP_POLICY must be one of {', '.join(CATCHUP_POLICIES)}"
+            )
+        
+        self.scheduler = scheduler
+        self.policy = settings.SCHEDULER_CATCHUP_POLICY
+        self.batch_size = settings.SCHEDULER_CATCHUP_BATCH_SIZE
+        self.rate = settings.SCHEDULER_CATCHUP_RATE
+        self.missed_threshold = timedelta(seconds=settings.SCHEDULER_MISSED_THRESHOLD)
+        self._slots = asyncio.Semaphore(settings.SCHEDULER_CATCHUP_MAX_CONCURRENT)
+        self._tasks: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+        
+        self.state = "idle"
+        self.backlog = 0
+        self.processed = 0
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+    
+    def start(self):
+        """Start draining the backlog in the background, unless a drain is running."""
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self.run())
+    
+    async def sweep(self):
+        """Periodic job: drain whatever became missed since the last pass."""
+        self.start()
+    
+    def stop(self):
+        """Stop draining and cancel catch-up calls in flight."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        for task in list(self._tasks):
+            task.cancel()
+    
+    async def run(self):
+        """Stream the backlog in next_attempt_at order, one batch at a time."""
+        self.state = "running"
+        self.started_at = datetime.now(timezone.utc)
+        self.finished_at = None
+        self.processed = 0
+        
+        try:
+            self.backlog = await self.count_missed()
+            if self.backlog:
+                logger.info(f"Catch-up found {self.backlog} missed reminders (policy: {self.policy})")
+            
+            if self.policy == "skip" or not self.backlog:
+                self.state = "done"
+                return
+            
+            cursor: Optional[Tuple[datetime, UUID]] = None
+            while True:
+                batch = await self.claim_batch(cursor)
+                if not batch:
+                    break
+                
+                if self.policy == "expire":
+                    # Expired rows leave the filter, so no cursor is needed
+                    self.processed += len(batch)
+                else:
+                    last_id, last_attempt_at = batch[-1]
+                    cursor = (last_attempt_at, last_id)
+                    await self.deliver(batch)
+            
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self.state = "done"
+            logger.info(f"Catch-up finished: {self.processed} missed reminders handled")
+        
+        except asyncio.CancelledError:
+            self.state = "cancelled"
+            raise
+        except Exception as e:
+            self.state = "error"
+            logger.error(f"Error during catch-up: {e}")
+        finally:
+            self.finished_at = datetime.now(timezone.utc)
+    
+    async def count_missed(self) -> int:
+        """Count missed reminders that are still pending."""
+        cutoff = datetime.now(timezone.utc) - self.missed_threshold
+        async with AsyncSessionLocal() as db:
+            return await db.scalar(
+                select(func.count(Reminder.id)).where(
+                    Reminder.status == ReminderStatus.SCHEDULED,
+                    Reminder.next_attempt_at <= cutoff
+                )
+            )
+    
+    async def claim_batch(self, cursor: Optional[Tuple[datetime, UUID]]) -> List[Tuple[UUID, datetime]]:
+        """
+        Lease (or, with the expire policy, fail) the next batch of missed reminders.
+        
+        Keyset pagination on (next_attempt_at, id) keeps each batch an
+        index range scan no matter how deep into the backlog we are.
+        
+        Args:
+            cursor: (next_attempt_at, id) of the last reminder of the previous batch
+        
+        Returns:
+            (reminder id, next attempt time) pairs in due order; with the
+            expire policy the returned times are None
+        """
+        cutoff = datetime.now(timezone.utc) - self.missed_threshold
+        conditions = [
+            Reminder.status == ReminderStatus.SCHEDULED,
+            Reminder.next_attempt_at <= cutoff,
+            self.scheduler.claimable()
+        ]
+        if cursor:
+            conditions.append(tuple_(Reminder.next_attempt_at, Reminder.id) > tuple_(*cursor))
+        
+        candidates = (
+            select(Reminder.id)
+            .where(*conditions)
+            .order_by(Reminder.next_attempt_at, Reminder.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        
+        if self.policy == "expire":
+            values = {
+                "status": ReminderStatus.FAILED,
+                "next_attempt_at": None,
+                "last_error": "Missed scheduled time while the scheduler was unavailable",
+            }
+        else:
+            values = {
+                "claimed_by": self.scheduler.node_id,
+                "lease_expires_at": func.now() + self.scheduler.lease_duration,
+                "updated_at": Reminder.updated_at,
+            }
+        
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(Reminder)
+                .where(Reminder.id.in_(candidates))
+                .values(**values)
+                .returning(Reminder.id, Reminder.next_attempt_at)
+                .execution_options(synchronize_session=False)
+            )
+            rows = [(row.id, row.next_attempt_at) for row in result]
+            await db.commit()
+        
+        # RETURNING order is not guaranteed; the cursor needs the last row
+        if self.policy != "expire":
+            rows.sort(key=lambda row: (row[1], row[0]))
+        return rows
+    
+    async def deliver(self, batch: List[Tuple[UUID, datetime]]):
+        """Dispatch a batch late, paced to SCHEDULER_CATCHUP_RATE per second."""
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.rate if self.rate > 0 else 0
+        next_slot = loop.time()
+        
+        for reminder_id, due_at in batch:
+            await asyncio.sleep(max(0.0, next_slot - loop.time()))
+            next_slot = max(next_slot, loop.time()) + interval
+            
+            await self._slots.acquire()
+            task = loop.create_task(self._deliver_one(reminder_id, due_at))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _deliver_one(self, reminder_id: UUID, due_at: datetime):
+        """Dispatch one missed reminder through the shared call slots."""
+        try:
+            await self.scheduler.dispatch_batch([(reminder_id, due_at)], late=True)
+        finally:
+            self.processed += 1
+            self._slots.release()
+    
+    def progress(self) -> Dict[str, Any]:
+        """Get catch-up progress for the metrics endpoint."""
+        return {
+            "policy": self.policy,
+            "state": self.state,
+            "backlog": self.backlog,
+            "processed": self.processed,
+            "remaining": max(self.backlog - self.processed, 0) if self.policy != "skip" else self.backlog,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -0,0 +1,173 @@
+"""
+Circuit breaker for outbound provider calls.
+
+Stops sending requests to a provider that is failing, so due reminders
+are deferred right away instead of each waiting for a timeout and
+burning one of their attempts.
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker driven by the error rate.
+    
+    - closed: requests flow; outcomes are kept for ``window`` seconds and
+      the circuit opens once at least ``min_calls`` of them failed at a
+      rate of ``failure_rate`` or more
+    - open: every request is rejected for ``open_seconds``
+    - half-open: up to ``half_open_calls`` probe requests are let through;
+      if they all succeed the circuit closes, any failure reopens it
+    
+    Usage:
+        wait = breaker.try_acquire()
+        if wait:
+            ...  # defer for ``wait`` seconds
+        try:
+            ...
+        except ProviderDown:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+    
+    Outcomes that say nothing about the provider's health (e.g. a
+    rejected phone number) are reported with ``release()``.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float,
+        min_calls: int,
+        window: float,
+        open_seconds: float,
+        half_open_calls: int,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        
+        self.state = CLOSED
+        self.opened_count = 0
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probes_succeeded = 0
+    
+    def _prune(self, now: float):
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            self._outcomes.popleft()
+    
+    def _open(self, now: float):
+        self.state = OPEN
+        self.opened_count += 1
+        self._opened_at = now
+        self._probes_in_flight = 0
+        self._probes_succeeded = 0
+        logger.warning(f"Circuit '{self.name}' opened for {self.open_seconds:.0f}s")
+    
+    def _close(self):
+        self.state = CLOSED
+        self._outcomes.clear()
+        self._probes_in_flight = 0
+        self._probes_succeeded = 0
+        logger.info(f"Circuit '{self.name}' closed")
+    
+    def try_acquire(self) -> float:
+        """
+        Ask to send a request.
+        
+        Returns:
+            0 if the request may go ahead, otherwise seconds to wait
+            before trying again
+        """
+        now = time.monotonic()
+        
+        if self.state == OPEN:
+            remaining = self._opened_at + self.open_seconds - now
+            if remaining > 0:
+                # Spread deferred work so it does not all return at once
+                return remaining + random.uniform(0, remaining * 0.1)
+            self.state = HALF_OPEN
+            logger.info(f"Circuit '{self.name}' half-open, sending probes")
+        
+        if self.state == HALF_OPEN:
+            if self._probes_in_flight + self._probes_succeeded >= self.half_open_calls:
+                return random.uniform(1, max(1.0, self.open_seconds / 2))
+            self._probes_in_flight += 1
+        
+        return 0.0
+    
+    def blocked_for(self) -> float:
+        """Seconds until the circuit lets requests through again (0 if it does now)."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+    
+    def record_success(self):
+        """Report a request that succeeded."""
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            self._probes_succeeded += 1
+            if self._probes_succeeded >= self.half_open_calls:
+                self._close()
+            return
+        
+        now = time.monotonic()
+        self._outcomes.append((now, True))
+        self._prune(now)
+    
+    def record_failure(self):
+        """Report a request that failed because of the provider."""
+        now = time.monotonic()
+        
+        if self.state == HALF_OPEN:
+            self._open(now)
+            return
+        if self.state == OPEN:
+            return
+        
+        self._outcomes.append((now, False))
+        self._prune(now)
+        
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+            self._open(now)
+    
+    def release(self):
+        """Report a request whose outcome says nothing about provider health."""
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get breaker state for the metrics endpoint."""
+        now = time.monotonic()
+        self._prune(now)
+        calls = len(self._outcomes)
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        
+        return {
+            "name": self.name,
+            "state": self.state,
+            "calls_in_window": calls,
+            "failure_rate": failures / calls if calls else 0.0,
+            "opened_count": self.opened_count,
+            "open_for_seconds": (
+                round(max(0.0, self._opened_at + self.open_seconds - now), 2)
+                if self.state == OPEN else 0.0
+            ),
+        }
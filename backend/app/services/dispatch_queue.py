@@ -0,0 +1,142 @@
+"""
+In-memory dispatch queue for upcoming reminders.
+
+Keeps reminders due within a short horizon in a min-heap keyed on
+their next attempt time, so the scheduler can sleep until exactly the
+next one is due instead of polling the database.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+
+class DispatchQueue:
+    """
+    Min-heap of (due time, reminder id) entries.
+    
+    Entries are cancelled lazily: moving or removing a reminder only
+    updates the ``_entries`` index, and stale heap items are dropped
+    when they reach the top.
+    
+    All mutating methods are thread-safe, because the sync API
+    endpoints run in FastAPI's threadpool while the dispatch loop
+    runs on the event loop.
+    """
+    
+    def __init__(self, horizon_seconds: int):
+        self.horizon = timedelta(seconds=horizon_seconds)
+        self._heap: List[Tuple[datetime, int, UUID]] = []
+        self._entries: Dict[UUID, Tuple[datetime, int]] = {}
+        self._in_flight: Set[UUID] = set()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+    
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """Attach the queue to the event loop running the dispatcher."""
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+    
+    def schedule(self, reminder_id: UUID, due_at: datetime) -> bool:
+        """
+        Insert or move a reminder.
+        
+        Reminders beyond the horizon are dropped (and any existing
+        entry cancelled); the next refill will pick them up.
+        
+        Returns:
+            True if the reminder is now queued
+        """
+        if due_at.tzinfo is None:
+            due_at = due_at.replace(tzinfo=timezone.utc)
+        
+        with self._lock:
+            if reminder_id in self._in_flight:
+                return False
+            
+            if due_at > datetime.now(timezone.utc) + self.horizon:
+                self._entries.pop(reminder_id, None)
+                return False
+            
+            current = self._entries.get(reminder_id)
+            if current and current[0] == due_at:
+                return True
+            
+            seq = next(self._counter)
+            self._entries[reminder_id] = (due_at, seq)
+            heapq.heappush(self._heap, (due_at, seq, reminder_id))
+            is_head = self._heap[0][1] == seq
+        
+        # Only the dispatcher's sleep deadline changes when the new
+        # entry became the head of the heap.
+        if is_head:
+            self._notify()
+        return True
+    
+    def cancel(self, reminder_id: UUID):
+        """Remove a reminder from the queue if present."""
+        with self._lock:
+            self._entries.pop(reminder_id, None)
+    
+    def pop_due(self, now: datetime) -> List[Tuple[UUID, datetime]]:
+        """
+        Remove and return every entry due at or before ``now``.
+        
+        Returned reminders are marked in flight until ``release``
+        is called, so a concurrent refill cannot queue them twice.
+        """
+        due: List[Tuple[UUID, datetime]] = []
+        
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due_at, seq, reminder_id = heapq.heappop(self._heap)
+                if self._entries.get(reminder_id) != (due_at, seq):
+                    continue  # Stale entry (moved or cancelled)
+                del self._entries[reminder_id]
+                self._in_flight.add(reminder_id)
+                due.append((reminder_id, due_at))
+        
+        return due
+    
+    def release(self, reminder_id: UUID):
+        """Mark an in-flight reminder as done."""
+        with self._lock:
+            self._in_flight.discard(reminder_id)
+    
+    def next_due_at(self) -> Optional[datetime]:
+        """Get the due time of the earliest live entry."""
+        with self._lock:
+            while self._heap:
+                due_at, seq, reminder_id = self._heap[0]
+                if self._entries.get(reminder_id) == (due_at, seq):
+                    return due_at
+                heapq.heappop(self._heap)
+        return None
+    
+    async def wait(self, timeout: Optional[float]):
+        """Sleep until ``timeout`` elapses or the head of the queue changes."""
+        if self._wakeup is None:
+            raise RuntimeError("DispatchQueue is not bound to an event loop")
+        
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._wakeup.clear()
+    
+    def _notify(self):
+        """Wake the dispatcher from any thread."""
+        if self._loop is None or self._wakeup is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
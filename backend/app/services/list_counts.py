@@ -0,0 +1,178 @@
+"""
+Total counts for reminder listings.
+
+An exact COUNT(*) over the filtered set is the most expensive query
+behind the dashboard's polling, so listings can ask for a cheaper total:
+- exact: COUNT(*) every time
+- estimated: the planner's row estimate (pg_class.reltuples without
+  filters, EXPLAIN with them); small estimates are counted exactly,
+  since that is cheap and estimates are least accurate there
+- cached: exact counts kept per filter combination for
+  LIST_COUNT_CACHE_TTL seconds and dropped whenever a reminder is
+  written through this process
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+import logging
+import threading
+import time
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.models.reminder import Reminder
+
+logger = logging.getLogger(__name__)
+
+EXACT = "exact"
+ESTIMATED = "estimated"
+CACHED = "cached"
+
+COUNT_STRATEGIES = (EXACT, ESTIMATED, CACHED)
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, with its parameters bound as usual."""
+    
+    inherit_cache = False
+    
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def exact_count(db: Session, query: Query) -> int:
+    """COUNT(*) of a filtered reminder query."""
+    return query.order_by(None).with_entities(func.count(Reminder.id)).scalar()
+
+
+def estimated_count(db: Session, query: Query, filtered: bool) -> Optional[int]:
+    """
+    The planner's row estimate for a query.
+    
+    Args:
+        db: Database session
+        query: Filtered reminder query
+        filtered: Whether the query has filters (otherwise the table's
+            reltuples is used, without planning anything)
+    
+    Returns:
+        Estimated row count, or None if the table was never analyzed
+    """
+    if not filtered:
+        reltuples = db.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = 'reminders'::regclass")
+        ).scalar_one()
+        if reltuples >= 0:
+            return int(reltuples)
+    
+    plan = db.execute(Explain(query.order_by(None).statement)).scalar_one()
+    if isinstance(plan, str):
+        plan = orjson.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class ReminderCountCache:
+    """
+    Per-process TTL cache of exact listing counts.
+    
+    Keys are filter combinations; the LIST_COUNT_CACHE_SIZE most
+    recently used are kept. Writes through the API call invalidate(),
+    so this process never serves a count older than its own writes;
+    changes made elsewhere (other API nodes, the scheduler) show up
+    within the TTL.
+    """
+    
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+    
+    def get(self, key: Hashable) -> Optional[int]:
+        """Cached count for a filter combination, if still fresh."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: Hashable, total: int):
+        with self._lock:
+            self._entries[key] = (total, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self):
+        """Drop every cached count (after a reminder was written)."""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache counters for the metrics endpoint."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+def count_reminders(db: Session, query: Query, strategy: str, filters: Tuple) -> Tuple[int, str]:
+    """
+    Total of a filtered reminder listing.
+    
+    Args:
+        db: Database session
+        query: Filtered reminder query (ordering is ignored)
+        strategy: exact, estimated or cached
+        filters: The filter values, used as the cache key
+    
+    Returns:
+        The total and the kind of count it is (exact, estimated or cached)
+    """
+    if strategy == CACHED:
+        total = reminder_counts.get(filters)
+        if total is not None:
+            return total, CACHED
+        total = exact_count(db, query)
+        reminder_counts.put(filters, total)
+        return total, EXACT
+    
+    if strategy == ESTIMATED:
+        try:
+            # In a savepoint, so a failed EXPLAIN does not abort the exact count's transaction
+            with db.begin_nested():
+                estimate = estimated_count(db, query, filtered=any(value is not None for value in filters))
+        except Exception as e:
+            logger.warning(f"Could not estimate reminder count, counting exactly: {e}")
+            estimate = None
+        if estimate is not None and estimate >= settings.LIST_COUNT_EXACT_BELOW:
+            return estimate, ESTIMATED
+    
+    return exact_count(db, query), EXACT
+
+
+# Singleton instance
+reminder_counts = ReminderCountCache(
+    ttl=settings.LIST_COUNT_CACHE_TTL,
+    max_entries=settings.LIST_COUNT_CACHE_SIZE
+)
@@ -0,0 +1,64 @@
+"""
+Lightweight in-process metrics helpers.
+
+Used by the scheduler to expose dispatch timing without pulling in
+a full metrics stack.
+"""
+
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class RollingStats:
+    """
+    Rolling window of numeric samples with percentile summaries.
+    
+    Only the most recent ``maxlen`` samples are kept, so the summary
+    reflects current behavior rather than the whole process lifetime.
+    """
+    
+    def __init__(self, maxlen: int = 1000):
+        self._samples: Deque[float] = deque(maxlen=maxlen)
+        self.total_count = 0
+    
+    def add(self, value: float):
+        """Record a new sample."""
+        self._samples.append(value)
+        self.total_count += 1
+    
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        Get the p-th percentile (0-100) of the current window.
+        
+        Returns:
+            Percentile value, or None if no samples were recorded
+        """
+        if not self._samples:
+            return None
+        
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+    
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Get count, mean, p50, p95, p99 and max of the current window."""
+        samples = list(self._samples)
+        
+        if not samples:
+            return {
+                "count": self.total_count,
+                "mean": None,
+                "p50": None,
+                "p95": None,
+                "p99": None,
+                "max": None,
+            }
+        
+        return {
+            "count": self.total_count,
+            "mean": sum(samples) / len(samples),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": max(samples),
+        }
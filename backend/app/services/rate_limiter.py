@@ -0,0 +1,375 @@
+"""
+Outbound rate limiting for call creation.
+
+Token buckets keep call creation under the provider's limits, either
+per process (memory) or shared by every node through Postgres. An
+adaptive concurrency limit caps how many calls are in flight.
+"""
+
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Deque, Dict, Optional
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str], default: float) -> float:
+    """
+    Parse a Retry-After header (delta seconds or HTTP date).
+    
+    Args:
+        value: Raw header value, if any
+        default: Seconds to use when the header is missing or invalid
+    
+    Returns:
+        Seconds to wait
+    """
+    if not value:
+        return default
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return default
+
+
+class TokenBucket:
+    """
+    In-process token bucket.
+    
+    After a 429 the bucket hands out nothing until the Retry-After delay
+    has passed, then runs at half rate for the cooldown period.
+    """
+    
+    def __init__(self, rate: float, capacity: float, cooldown: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.cooldown = cooldown
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._slow_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    def _current_rate(self, now: float) -> float:
+        return self.rate / 2 if now < self._slow_until else self.rate
+    
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                rate = self._current_rate(now)
+                self._tokens = min(self.capacity, self._tokens + max(0.0, now - self._updated) * rate)
+                self._updated = now
+                
+                if now < self._paused_until:
+                    # Nothing accrues while paused
+                    self._tokens = 0
+                    self._updated = self._paused_until
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self._tokens) / rate)
+    
+    async def penalize(self, retry_after: float):
+        """Pause for ``retry_after`` seconds, then slow down for the cooldown."""
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + retry_after)
+        self._slow_until = max(self._slow_until, self._paused_until + self.cooldown)
+        # Refill restarts when the pause ends
+        self._tokens = 0
+        self._updated = self._paused_until
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the bucket state for metrics."""
+        now = time.monotonic()
+        return {
+            "backend": "memory",
+            "tokens": round(self._tokens, 2),
+            "rate": self._current_rate(now),
+            "paused_for_seconds": round(max(0.0, self._paused_until - now), 2),
+        }
+
+
+class PostgresTokenBucket:
+    """
+    Token bucket stored in the rate_limit_buckets table.
+    
+    Refill and take happen in one conditional UPDATE, so every node
+    draws from the same global budget.
+    """
+    
+    def __init__(self, name: str, rate: float, capacity: float, cooldown: float):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self.cooldown = cooldown
+        self._initialized = False
+    
+    async def _ensure_row(self, db):
+        if self._initialized:
+            return
+        await db.execute(
+            text(
+                "INSERT INTO rate_limit_buckets (name, tokens, updated_at) "
+                "VALUES (:name, :capacity, clock_timestamp()) "
+                "ON CONFLICT (name) DO NOTHING"
+            ),
+            {"name": self.name, "capacity": self.capacity}
+        )
+        self._initialized = True
+    
+    async def _try_take(self) -> float:
+        """
+        Take a token if one is available.
+        
+        Returns:
+            0 if a token was taken, otherwise seconds to wait before retrying
+        """
+        async with AsyncSessionLocal() as db:
+            await self._ensure_row(db)
+            
+            # Half rate during the cooldown that follows a 429 pause; a pause
+            # moves updated_at to its end, so nothing accrues before then
+            refilled = (
+                "LEAST(:capacity, tokens + GREATEST(0, EXTRACT(EPOCH FROM clock_timestamp() - updated_at)) * "
+                "CASE WHEN paused_until IS NOT NULL "
+                "AND clock_timestamp() < paused_until + make_interval(secs => :cooldown) "
+                "THEN CAST(:rate AS double precision) / 2 ELSE CAST(:rate AS double precision) END)"
+            )
+            params = {
+                "name": self.name,
+                "capacity": self.capacity,
+                "rate": self.rate,
+                "cooldown": self.cooldown,
+            }
+            
+            taken = (await db.execute(
+                text(
+                    f"UPDATE rate_limit_buckets SET tokens = {refilled} - 1, "
+                    f"updated_at = clock_timestamp() "
+                    f"WHERE name = :name "
+                    f"AND (paused_until IS NULL OR paused_until <= clock_timestamp()) "
+                    f"AND {refilled} >= 1 "
+                    f"RETURNING tokens"
+                ),
+                params
+            )).first()
+            
+            if taken is not None:
+                await db.commit()
+                return 0.0
+            
+            row = (await db.execute(
+                text(
+                    f"SELECT {refilled} AS tokens, "
+                    f"EXTRACT(EPOCH FROM paused_until - clock_timestamp()) AS paused_for "
+                    f"FROM rate_limit_buckets WHERE name = :name"
+                ),
+                params
+            )).first()
+            await db.commit()
+            
+            if row.paused_for and row.paused_for > 0:
+                return float(row.paused_for)
+            return max(0.01, (1 - float(row.tokens)) / self.rate)
+    
+    async def _pause(self, retry_after: float):
+        async with AsyncSessionLocal() as db:
+            await self._ensure_row(db)
+            await db.execute(
+                text(
+                    "UPDATE rate_limit_buckets SET tokens = 0, "
+                    "updated_at = GREATEST(COALESCE(paused_until, clock_timestamp()), "
+                    "clock_timestamp() + make_interval(secs => :retry_after)), "
+                    "paused_until = GREATEST(COALESCE(paused_until, clock_timestamp()), "
+                    "clock_timestamp() + make_interval(secs => :retry_after)) "
+                    "WHERE name = :name"
+                ),
+                {"name": self.name, "retry_after": retry_after}
+            )
+            await db.commit()
+    
+    async def acquire(self):
+        """Wait until a token is available in the shared bucket and take it."""
+        while True:
+            wait = await self._try_take()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+    
+    async def penalize(self, retry_after: float):
+        """Pause the shared bucket for every node."""
+        await self._pause(retry_after)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the bucket configuration for metrics."""
+        return {"backend": "postgres", "name": self.name, "rate": self.rate}
+
+
+class AdaptiveConcurrencyLimit:
+    """
+    Concurrency limit adjusted with AIMD.
+    
+    Every call that succeeds within ``latency_target`` seconds raises the
+    limit by 1/limit (additive increase, about +1 per round of calls);
+    a slower or failed call multiplies it by ``backoff`` (multiplicative
+    decrease). The limit stays between ``min_limit`` and ``max_limit``
+    and starts at the maximum. With ``adaptive`` off it is a plain
+    semaphore of ``max_limit``.
+    """
+    
+    def __init__(self, min_limit: int, max_limit: int, latency_target: float, backoff: float, adaptive: bool = True):
+        self.min_limit = min(min_limit, max_limit)
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.adaptive = adaptive
+        self.limit = float(max_limit)
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+    
+    def _wake(self):
+        while self._waiters and self.active < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+    
+    async def acquire(self):
+        """Wait until fewer than ``limit`` calls are in flight and take a slot."""
+        if not self._waiters and self.active < int(self.limit):
+            self.active += 1
+            return
+        
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted just before the cancellation
+                self.release()
+            raise
+    
+    def release(self):
+        """Give a slot back."""
+        self.active -= 1
+        self._wake()
+    
+    def record(self, latency: float, ok: bool):
+        """Adjust the limit from a finished call."""
+        if not self.adaptive:
+            return
+        
+        if ok and latency <= self.latency_target:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        else:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        self._wake()
+
+
+class CallRateLimiter:
+    """
+    Combines a token bucket (calls per second) with a cap on concurrent calls.
+    
+    The cap adapts to the provider's latency and errors (see
+    AdaptiveConcurrencyLimit); callers report each call's outcome with
+    record_outcome().
+    
+    Usage:
+        async with limiter.slot():
+            response = await client.post(...)
+    """
+    
+    def __init__(self, bucket, concurrency: AdaptiveConcurrencyLimit):
+        self.bucket = bucket
+        self.concurrency = concurrency
+        self.rate_limited_count = 0
+    
+    @asynccontextmanager
+    async def slot(self):
+        """Wait for a concurrency slot and a token, and hold the slot."""
+        await self.concurrency.acquire()
+        try:
+            await self.bucket.acquire()
+            yield
+        finally:
+            self.concurrency.release()
+    
+    def record_outcome(self, latency: float, ok: bool):
+        """Feed a call's latency and success into the concurrency limit."""
+        self.concurrency.record(latency, ok)
+    
+    async def on_rate_limited(self, retry_after: float):
+        """Back off after the provider answered 429."""
+        self.rate_limited_count += 1
+        logger.warning(f"Provider rate limit hit; pausing call creation for {retry_after:.1f}s")
+        await self.bucket.penalize(retry_after)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get limiter state for the metrics endpoint."""
+        return {
+            **self.bucket.snapshot(),
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "min_concurrent": self.concurrency.min_limit,
+            "max_concurrent": self.concurrency.max_limit,
+            "active": self.concurrency.active,
+            "rate_limited_count": self.rate_limited_count,
+        }
+
+
+def create_call_rate_limiter(
+    name: str = "vapi_calls",
+    calls_per_second: Optional[float] = None,
+    burst: Optional[int] = None,
+    max_concurrent_calls: Optional[int] = None,
+) -> CallRateLimiter:
+    """
+    Build a call rate limiter from settings.
+    
+    Rate, burst and concurrency default to the VAPI_* settings; other
+    providers pass their own. Backend, cooldown and the adaptive
+    concurrency tuning are shared.
+    """
+    rate = calls_per_second if calls_per_second is not None else settings.VAPI_CALLS_PER_SECOND
+    capacity = burst if burst is not None else settings.VAPI_RATE_LIMIT_BURST
+    cooldown = settings.VAPI_RATE_LIMIT_COOLDOWN
+    
+    if settings.VAPI_RATE_LIMIT_BACKEND == "postgres":
+        bucket = PostgresTokenBucket(name, rate=rate, capacity=capacity, cooldown=cooldown)
+    elif settings.VAPI_RATE_LIMIT_BACKEND == "memory":
+        bucket = TokenBucket(rate=rate, capacity=capacity, cooldown=cooldown)
+    else:
+        raise ValueError("VAPI_RATE_LIMIT_BACKEND must be 'memory' or 'postgres'")
+    
+    max_limit = max_concurrent_calls or settings.VAPI_MAX_CONCURRENT_CALLS
+    concurrency = AdaptiveConcurrencyLimit(
+        min_limit=min(settings.VAPI_MIN_CONCURRENT_CALLS, max_limit),
+        max_limit=max_limit,
+        latency_target=settings.VAPI_LATENCY_TARGET,
+        backoff=settings.VAPI_CONCURRENCY_BACKOFF,
+        adaptive=settings.VAPI_ADAPTIVE_CONCURRENCY
+    )
+    return CallRateLimiter(bucket, concurrency)
@@ -0,0 +1,279 @@
+"""
+Bulk writes of reminders.
+
+A batch is validated in one pass and written with multi-row statements
+(INSERT ... RETURNING, UPDATE ... FROM VALUES ... RETURNING,
+DELETE ... RETURNING) in the caller's transaction. Results are reported
+per item: items that fail validation or do not apply (unknown ID,
+reminder no longer scheduled) get an error while the rest are written.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Type
+from uuid import UUID
+import uuid
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy import cast, column, delete, insert, select, update, values
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.models.reminder import Reminder, ReminderStatus
+from app.schemas.reminder import BulkItemResult, ReminderBulkUpdateItem, ReminderCreate
+from app.services.reminder_notifications import notify_reminders_changed
+
+# Rows per statement
+CHUNK_SIZE = 1000
+
+# Fields a bulk update may change, in column order
+UPDATABLE_COLUMNS = ("title", "message", "phone_number", "scheduled_datetime", "timezone")
+
+_adapters: Dict[Type[BaseModel], TypeAdapter] = {}
+
+
+@dataclass
+class BulkOutcome:
+    """Per-item results plus the changes to apply to the dispatch queue."""
+    
+    results: List[BulkItemResult]
+    # (reminder id, next attempt time or None if it should leave the queue)
+    changes: List[Tuple[UUID, Optional[datetime]]] = field(default_factory=list)
+    
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for result in self.results if result.ok)
+
+
+def chunks(items: List[Any], size: int = CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def validate_items(model: Type[BaseModel], items: List[Any]) -> Tuple[Dict[int, BaseModel], Dict[int, Any]]:
+    """
+    Validate a batch in one pass.
+    
+    Only if some items are invalid are the others validated again one
+    by one, to tell them apart.
+    
+    Returns:
+        Valid items and validation errors, both keyed by position
+    """
+    adapter = _adapters.setdefault(model, TypeAdapter(List[model]))
+    try:
+        return dict(enumerate(adapter.validate_python(items))), {}
+    except ValidationError as e:
+        errors: Dict[int, Any] = {}
+        for error in e.errors(include_url=False):
+            index, *loc = error["loc"]
+            errors.setdefault(index, []).append({"loc": loc, "msg": error["msg"], "type": error["type"]})
+    
+    valid = {
+        index: model.model_validate(item)
+        for index, item in enumerate(items)
+        if index not in errors
+    }
+    return valid, errors
+
+
+def error_results(errors: Dict[int, Any], ids: Optional[Dict[int, UUID]] = None) -> List[BulkItemResult]:
+    return [
+        BulkItemResult(index=index, id=(ids or {}).get(index), ok=False, error=error)
+        for index, error in errors.items()
+    ]
+
+
+def sorted_results(results: List[BulkItemResult]) -> List[BulkItemResult]:
+    return sorted(results, key=lambda result: result.index)
+
+
+def bulk_create(db: Session, items: List[Any]) -> BulkOutcome:
+    """
+    Create reminders (no commit).
+    
+    Args:
+        db: Database session
+        items: Raw ReminderCreate payloads
+    
+    Returns:
+        Per-item results, with the ID of each created reminder
+    """
+    valid, errors = validate_items(ReminderCreate, items)
+    table = Reminder.__table__
+    
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "title": item.title,
+            "message": item.message,
+            "phone_number": item.phone_number,
+            "scheduled_datetime": item.scheduled_datetime,
+            "timezone": item.timezone,
+            "status": ReminderStatus.SCHEDULED,
+            "call_attempts": 0,
+            "next_attempt_at": item.scheduled_datetime,
+        }
+        for item in valid.values()
+    ]
+    
+    created = set()
+    for chunk in chunks(rows):
+        result = db.execute(insert(table).returning(table.c.id), chunk)
+        created.update(result.scalars().all())
+    
+    outcome = BulkOutcome(results=error_results(errors))
+    for index, row in zip(valid, rows):
+        if row["id"] in created:
+            outcome.results.append(BulkItemResult(index=index, id=row["id"], ok=True))
+            outcome.changes.append((row["id"], row["next_attempt_at"]))
+    
+    outcome.results = sorted_results(outcome.results)
+    notify_reminders_changed(db, outcome.changes)
+    return outcome
+
+
+def drop_duplicates(valid: Dict[int, Any], errors: Dict[int, Any], id_of) -> Dict[int, Any]:
+    """Reject items that repeat an ID seen earlier in the batch."""
+    seen = set()
+    unique = {}
+    for index, item in valid.items():
+        reminder_id = id_of(item)
+        if reminder_id in seen:
+            errors[index] = "Duplicate id in batch"
+            continue
+        seen.add(reminder_id)
+        unique[index] = item
+    return unique
+
+
+def explain_missing(db: Session, missing: Dict[UUID, int], action: str) -> Dict[int, str]:
+    """Tell unknown reminders apart from ones that are no longer scheduled."""
+    statuses = {}
+    for chunk in chunks(list(missing)):
+        result = db.execute(select(Reminder.id, Reminder.status).where(Reminder.id.in_(chunk)))
+        statuses.update({row.id: row.status for row in result})
+    
+    return {
+        index: (
+            f"Reminder with id {reminder_id} not found"
+            if reminder_id not in statuses
+            else f"Cannot {action} reminder with status '{statuses[reminder_id].value}'. Only scheduled reminders can be {action}d."
+        )
+        for reminder_id, index in missing.items()
+    }
+
+
+def bulk_update(db: Session, items: List[Any]) -> BulkOutcome:
+    """
+    Update reminders (no commit).
+    
+    Like the single update, only scheduled reminders can be changed and
+    a new scheduled_datetime re-arms the next attempt. Items are grouped
+    by the set of fields they change, with one UPDATE ... FROM VALUES per
+    group and chunk.
+    
+    Args:
+        db: Database session
+        items: Raw payloads of ReminderUpdate fields plus the reminder id
+    
+    Returns:
+        Per-item results
+    """
+    valid, errors = validate_items(ReminderBulkUpdateItem, items)
+    valid = drop_duplicates(valid, errors, lambda item: item.id)
+    ids = {index: item.id for index, item in valid.items()}
+    
+    groups: Dict[FrozenSet[str], List[int]] = {}
+    for index, item in valid.items():
+        fields = frozenset(item.model_dump(exclude_unset=True)) & set(UPDATABLE_COLUMNS)
+        if not fields:
+            errors[index] = "No fields to update"
+            continue
+        groups.setdefault(fields, []).append(index)
+    
+    table = Reminder.__table__
+    updated: Dict[UUID, Optional[datetime]] = {}
+    for fields, indexes in groups.items():
+        names = [name for name in UPDATABLE_COLUMNS if name in fields]
+        for chunk in chunks(indexes):
+            rows = values(
+                column("id", table.c.id.type),
+                *(column(name, table.c[name].type) for name in names),
+                name="changes"
+            ).data([
+                (valid[index].id, *(getattr(valid[index], name) for name in names))
+                for index in chunk
+            ])
+            
+            # VALUES columns are untyped in Postgres; cast them to the column types
+            assignments = {name: cast(rows.c[name], table.c[name].type) for name in names}
+            if "scheduled_datetime" in fields:
+                assignments["next_attempt_at"] = assignments["scheduled_datetime"]
+            assignments["updated_at"] = func.now()
+            assignments["version"] = table.c.version + 1  # Invalidates buffered dispatcher writes
+            
+            result = db.execute(
+                update(table)
+                .where(
+                    table.c.id == cast(rows.c.id, table.c.id.type),
+                    table.c.status == ReminderStatus.SCHEDULED
+                )
+                .values(assignments)
+                .returning(table.c.id, table.c.next_attempt_at)
+            )
+            updated.update({row.id: row.next_attempt_at for row in result})
+    
+    missing = {
+        ids[index]: index
+        for indexes in groups.values()
+        for index in indexes
+        if ids[index] not in updated
+    }
+    errors.update(explain_missing(db, missing, "update"))
+    
+    outcome = BulkOutcome(results=error_results(errors, ids))
+    for indexes in groups.values():
+        for index in indexes:
+            if ids[index] in updated:
+                outcome.results.append(BulkItemResult(index=index, id=ids[index], ok=True))
+                outcome.changes.append((ids[index], updated[ids[index]]))
+    
+    outcome.results = sorted_results(outcome.results)
+    notify_reminders_changed(db, outcome.changes)
+    return outcome
+
+
+def bulk_delete(db: Session, reminder_ids: List[UUID]) -> BulkOutcome:
+    """
+    Delete reminders regardless of status (no commit).
+    
+    Args:
+        db: Database session
+        reminder_ids: IDs of the reminders to delete
+    
+    Returns:
+        Per-item results, indexed by position in ``reminder_ids``
+    """
+    errors: Dict[int, Any] = {}
+    valid = drop_duplicates(dict(enumerate(reminder_ids)), errors, lambda reminder_id: reminder_id)
+    table = Reminder.__table__
+    
+    deleted = set()
+    for chunk in chunks(list(valid.values())):
+        result = db.execute(delete(table).where(table.c.id.in_(chunk)).returning(table.c.id))
+        deleted.update(result.scalars().all())
+    
+    for index, reminder_id in valid.items():
+        if reminder_id not in deleted:
+            errors[index] = f"Reminder with id {reminder_id} not found"
+    
+    outcome = BulkOutcome(results=error_results(errors, dict(enumerate(reminder_ids))))
+    for index, reminder_id in valid.items():
+        if reminder_id in deleted:
+            outcome.results.append(BulkItemResult(index=index, id=reminder_id, ok=True))
+            outcome.changes.append((reminder_id, None))
+    
+    outcome.results = sorted_results(outcome.results)
+    notify_reminders_changed(db, outcome.changes)
+    return outcome
@@ -0,0 +1,437 @@
+"""
+Streaming import of reminders from CSV or NDJSON files.
+
+Files are read row by row and handled in batches of IMPORT_BATCH_SIZE:
+1. The batch is validated with the ReminderCreate rules
+   (app.services.reminder_bulk.validate_items).
+2. Valid rows are loaded with COPY into a temporary staging table and
+   merged into reminders with one INSERT ... SELECT.
+3. Rejected rows are appended to a CSV error report (line, error, data)
+   once the batch has committed, so the report never lists rows of a
+   batch that was rolled back.
+
+Each batch commits on its own together with the import's counters, so
+memory stays flat whatever the size of the file and progress can be
+followed while the import runs.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator, List, Optional, Tuple
+from uuid import UUID
+import csv
+import io
+import logging
+import threading
+import uuid
+
+import orjson
+from sqlalchemy import text, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.reminder_import import ReminderImport
+from app.schemas.reminder import ReminderCreate
+from app.services.list_counts import reminder_counts
+from app.services.reminder_bulk import validate_items
+from app.services.reminder_notifications import notify_reminders_changed
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "ndjson")
+
+# Fields every row must provide (CSV header columns)
+COLUMNS = ("title", "message", "phone_number", "scheduled_datetime", "timezone")
+
+# Per-connection staging table, emptied by every commit
+_CREATE_STAGING = text("""
+    CREATE TEMP TABLE IF NOT EXISTS reminder_import_staging (
+        id uuid NOT NULL,
+        title text NOT NULL,
+        message text NOT NULL,
+        phone_number text NOT NULL,
+        scheduled_datetime timestamptz NOT NULL,
+        timezone text NOT NULL
+    ) ON COMMIT DELETE ROWS
+""")
+
+_COPY_STAGING = (
+    "COPY reminder_import_staging (id, title, message, phone_number, scheduled_datetime, timezone) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+
+_MERGE = text("""
+    INSERT INTO reminders (
+        id, title, message, phone_number, scheduled_datetime, timezone,
+        status, call_attempts, next_attempt_at
+    )
+    SELECT
+        id, title, message, phone_number, scheduled_datetime, timezone,
+        'SCHEDULED', 0, scheduled_datetime
+    FROM reminder_import_staging
+    RETURNING id, next_attempt_at
+""")
+
+
+class ImportFileError(ValueError):
+    """The file cannot be imported at all (unknown format, bad CSV header)."""
+
+
+class ImportInterrupted(Exception):
+    """The import was stopped by a shutdown before reaching the end of the file."""
+
+
+def detect_format(filename: str) -> str:
+    """
+    Pick the import format from a file name.
+    
+    Raises:
+        ImportFileError: If the extension is not .csv, .ndjson or .jsonl
+    """
+    suffix = Path(filename).suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".ndjson", ".jsonl"):
+        return "ndjson"
+    raise ImportFileError(f"Cannot tell the format of '{filename}'; use a .csv or .ndjson file or give the format")
+
+
+def read_csv(raw: BinaryIO) -> Iterator[Tuple[int, Any, Optional[str]]]:
+    """
+    Read CSV rows as dicts keyed by the header.
+    
+    Yields:
+        (line number, row, None)
+    
+    Raises:
+        ImportFileError: If the header lacks a required column
+    """
+    text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        missing = [name for name in COLUMNS if name not in (reader.fieldnames or [])]
+        if missing:
+            raise ImportFileError(f"CSV header is missing columns: {', '.join(missing)}")
+        
+        for row in reader:
+            # Values beyond the header end up under None
+            row.pop(None, None)
+            yield reader.line_num, row, None
+    finally:
+        # Collecting the wrapper would close raw, which the caller still reads tell() from
+        if not raw.closed:
+            text.detach()
+
+
+def read_ndjson(raw: BinaryIO) -> Iterator[Tuple[int, Any, Optional[str]]]:
+    """
+    Read one JSON object per line, skipping blank lines.
+    
+    Yields:
+        (line number, object, None), or (line number, raw line, error)
+        for lines that are not valid JSON
+    """
+    for line_number, line in enumerate(raw, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, orjson.loads(line), None
+        except orjson.JSONDecodeError as e:
+            yield line_number, line.decode("utf-8", errors="replace").rstrip("\r\n"), f"Invalid JSON: {e}"
+
+
+READERS = {"csv": read_csv, "ndjson": read_ndjson}
+
+
+def batched(rows: Iterator[Any], size: int) -> Iterator[List[Any]]:
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def describe_errors(errors: Any) -> str:
+    """Flatten an item's validation errors into one line of the report."""
+    if isinstance(errors, str):
+        return errors
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in errors
+    )
+
+
+class ErrorReport:
+    """CSV of rejected rows, created on the first rejection."""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+        self._writer = None
+    
+    def add(self, line: int, error: str, data: Any):
+        if self._file is None:
+            self._file = open(self.path, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(("line", "error", "data"))
+        if not isinstance(data, str):
+            data = orjson.dumps(data, default=str).decode()
+        self._writer.writerow((line, error, data))
+    
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+    
+    @property
+    def written(self) -> bool:
+        return self._file is not None
+
+
+class ReminderImporter:
+    """
+    Runs file imports in a small pool of background threads.
+    
+    The API spools the uploaded file to IMPORT_DIR and submits it; the
+    CLI (app.import_reminders) runs the same pipeline in the foreground.
+    On shutdown, running imports stop after their current batch and are
+    marked failed; the rows merged until then stay imported. Imports cut
+    short by a crash are failed at the next startup (recover).
+    """
+    
+    def __init__(self, directory: str, batch_size: int, max_concurrent: int):
+        self.directory = Path(directory)
+        self.batch_size = batch_size
+        self.horizon = timedelta(seconds=settings.SCHEDULER_QUEUE_HORIZON)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="reminder-import")
+        self._stopping = threading.Event()
+    
+    def upload_path(self, import_id: UUID, format: str) -> Path:
+        """Where the API spools an uploaded file."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return self.directory / f"{import_id}.{format}"
+    
+    def report_path(self, import_id: UUID) -> Path:
+        """Where the error report of an import is written."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return self.directory / f"{import_id}.errors.csv"
+    
+    def create(self, import_id: UUID, filename: str, format: str, bytes_total: Optional[int]) -> ReminderImport:
+        """Record a pending import."""
+        db = SessionLocal()
+        try:
+            job = ReminderImport(
+                id=import_id,
+                filename=filename[:255],
+                format=format,
+                status="pending",
+                bytes_total=bytes_total,
+                bytes_read=0,
+                rows_read=0,
+                rows_imported=0,
+                rows_rejected=0
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            return job
+        finally:
+            db.close()
+    
+    def recover(self) -> int:
+        """
+        Clean up after imports interrupted by a crash.
+        
+        Uploads are removed from IMPORT_DIR once their import finishes,
+        so at startup any upload left there belongs to an import that
+        will never finish: the import is marked failed if still pending
+        or running, and the file is deleted. Error reports are kept.
+        
+        Returns:
+            Number of imports marked failed
+        """
+        if not self.directory.is_dir():
+            return 0
+        
+        uploads = {}
+        for path in self.directory.iterdir():
+            stem, _, suffix = path.name.partition(".")
+            if suffix not in FORMATS:
+                continue
+            try:
+                uploads[UUID(stem)] = path
+            except ValueError:
+                continue
+        if not uploads:
+            return 0
+        
+        db = SessionLocal()
+        try:
+            result = db.execute(
+                update(ReminderImport)
+                .where(
+                    ReminderImport.id.in_(list(uploads)),
+                    ReminderImport.status.in_(("pending", "running"))
+                )
+                .values(status="failed", error="Interrupted by a restart", finished_at=func.now())
+            )
+            db.commit()
+            failed = result.rowcount
+        finally:
+            db.close()
+        
+        for path in uploads.values():
+            path.unlink(missing_ok=True)
+        
+        logger.warning(f"Marked {failed} interrupted imports as failed; deleted {len(uploads)} leftover uploads")
+        return failed
+    
+    def submit(self, import_id: UUID, path: Path, delete_source: bool = True) -> Future:
+        """Run an import in the background."""
+        return self._executor.submit(self.run, import_id, path, delete_source)
+    
+    def run(
+        self,
+        import_id: UUID,
+        path: Path,
+        delete_source: bool = False,
+        progress: Optional[Callable[[ReminderImport], None]] = None
+    ) -> ReminderImport:
+        """
+        Import a file batch by batch.
+        
+        Args:
+            import_id: Pending import created with create()
+            path: File to read
+            delete_source: Remove the file afterwards (API uploads)
+            progress: Called with the import after every batch
+        
+        Returns:
+            The finished import (completed or failed)
+        """
+        db = SessionLocal()
+        report = ErrorReport(self.report_path(import_id))
+        try:
+            job = db.get(ReminderImport, import_id)
+            job.status = "running"
+            job.started_at = datetime.now(timezone.utc)
+            db.commit()
+            
+            try:
+                with open(path, "rb") as raw:
+                    for batch in batched(READERS[job.format](raw), self.batch_size):
+                        if self._stopping.is_set():
+                            raise ImportInterrupted("Interrupted by shutdown")
+                        rejected = self.load_batch(db, job, batch)
+                        job.bytes_read = raw.tell()
+                        if rejected:
+                            job.error_report = str(report.path)
+                        db.commit()
+                        
+                        for line, error, data in rejected:
+                            report.add(line, error, data)
+                        report.flush()
+                        if progress:
+                            progress(job)
+                
+                job.status = "completed"
+                job.bytes_read = job.bytes_total or job.bytes_read
+            except BaseException as e:
+                db.rollback()
+                logger.error(f"Import {import_id} failed after {job.rows_read} rows: {e}")
+                job.status = "failed"
+                job.error = str(e) or type(e).__name__
+                if not isinstance(e, Exception):
+                    raise
+            finally:
+                report.close()
+                job.error_report = str(report.path) if report.written else None
+                job.finished_at = datetime.now(timezone.utc)
+                db.commit()
+                if job.rows_imported:
+                    reminder_counts.invalidate()
+            
+            logger.info(
+                f"Import {import_id} {job.status}: {job.rows_imported} imported, "
+                f"{job.rows_rejected} rejected of {job.rows_read} rows"
+            )
+            return job
+        
+        finally:
+            db.close()
+            if delete_source:
+                Path(path).unlink(missing_ok=True)
+    
+    def load_batch(
+        self,
+        db: Session,
+        job: ReminderImport,
+        batch: List[Tuple[int, Any, Optional[str]]]
+    ) -> List[Tuple[int, str, Any]]:
+        """
+        Validate, stage and merge one batch (no commit).
+        
+        Args:
+            db: Database session
+            job: Import being run; its counters are updated
+            batch: (line number, row, read error) tuples
+        
+        Returns:
+            Rejected rows as (line number, error, row), for the error
+            report once the batch has committed
+        """
+        readable = [(line, row) for line, row, error in batch if error is None]
+        valid, errors = validate_items(ReminderCreate, [row for _, row in readable])
+        
+        rejected = [(line, error, row) for line, row, error in batch if error is not None]
+        for index, item_errors in errors.items():
+            line, row = readable[index]
+            rejected.append((line, describe_errors(item_errors), row))
+        rejected.sort(key=lambda rejection: rejection[0])
+        
+        imported = 0
+        if valid:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for index, item in valid.items():
+                writer.writerow((
+                    uuid.uuid4(),
+                    item.title,
+                    item.message,
+                    item.phone_number,
+                    item.scheduled_datetime.isoformat(),
+                    item.timezone,
+                ))
+            buffer.seek(0)
+            
+            connection = db.connection()
+            connection.execute(_CREATE_STAGING)
+            connection.connection.cursor().copy_expert(_COPY_STAGING, buffer)
+            merged = connection.execute(_MERGE).all()
+            imported = len(merged)
+            
+            # Only reminders due within the queue horizon concern the schedulers now
+            soon = datetime.now(timezone.utc) + self.horizon
+            notify_reminders_changed(db, [(row.id, row.next_attempt_at) for row in merged if row.next_attempt_at <= soon])
+        
+        job.rows_read += len(batch)
+        job.rows_imported += imported
+        job.rows_rejected += len(rejected)
+        return rejected
+    
+    def shutdown(self):
+        """Stop running imports after their current batch and wait for them."""
+        self._stopping.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Singleton instance
+reminder_importer = ReminderImporter(
+    directory=settings.IMPORT_DIR,
+    batch_size=settings.IMPORT_BATCH_SIZE,
+    max_concurrent=settings.IMPORT_MAX_CONCURRENT
+)
@@ -0,0 +1,154 @@
+"""
+Postgres LISTEN/NOTIFY wake-ups for reminder changes.
+
+The reminder write paths publish a notification inside their
+transaction (delivered on commit), and every scheduler instance holds a
+dedicated LISTEN connection so it can re-plan its dispatch queue
+immediately instead of waiting for the next refill.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Iterable, Optional, Tuple
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import asyncpg_dsn
+from app.models.reminder import Reminder, ReminderStatus
+
+logger = logging.getLogger(__name__)
+
+REMINDER_CHANNEL = "reminder_changes"
+
+_NOTIFY = text("SELECT pg_notify(:channel, :payload)")
+_NOTIFY_MANY = text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload")
+
+
+def _notify_params(reminder: Reminder, deleted: bool) -> dict:
+    """Build the pg_notify parameters for a reminder change."""
+    pending = not deleted and reminder.status == ReminderStatus.SCHEDULED and reminder.next_attempt_at
+    payload = {
+        "id": str(reminder.id),
+        "next_attempt_at": reminder.next_attempt_at.isoformat() if pending else None,
+    }
+    return {"channel": REMINDER_CHANNEL, "payload": json.dumps(payload)}
+
+
+def notify_reminder_changed(db: Session, reminder: Reminder, deleted: bool = False):
+    """
+    Queue a change notification in the current transaction.
+    
+    Postgres only delivers it once the transaction commits, so listeners
+    never see changes that were rolled back.
+    
+    Args:
+        db: Database session holding the write
+        reminder: Reminder that was created, updated or deleted
+        deleted: Whether the reminder is being deleted
+    """
+    db.execute(_NOTIFY, _notify_params(reminder, deleted))
+
+
+def notify_reminders_changed(db: Session, changes: Iterable[Tuple[UUID, Optional[datetime]]]):
+    """
+    Queue change notifications for many reminders with one statement.
+    
+    Args:
+        db: Database session holding the writes
+        changes: (reminder id, next attempt time) pairs; the time is None
+            for reminders that are deleted or no longer pending
+    """
+    payloads = [
+        json.dumps({"id": str(reminder_id), "next_attempt_at": next_attempt_at.isoformat() if next_attempt_at else None})
+        for reminder_id, next_attempt_at in changes
+    ]
+    if payloads:
+        db.execute(_NOTIFY_MANY, {"channel": REMINDER_CHANNEL, "payloads": payloads})
+
+
+async def notify_reminder_changed_async(db: AsyncSession, reminder: Reminder, deleted: bool = False):
+    """Async variant of notify_reminder_changed for AsyncSession writes."""
+    await db.execute(_NOTIFY, _notify_params(reminder, deleted))
+
+
+class ReminderChangeListener:
+    """
+    Holds a LISTEN connection and forwards reminder changes.
+    
+    Reconnects with a capped backoff if the connection drops, and
+    reports connectivity through ``on_connection_change`` so the
+    scheduler can tighten its polling while notifications are down.
+    """
+    
+    def __init__(
+        self,
+        on_change: Callable[[UUID, Optional[datetime]], None],
+        on_connection_change: Callable[[bool], Awaitable[None]],
+    ):
+        self.on_change = on_change
+        self.on_connection_change = on_connection_change
+        self.connected = False
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start listening in the background."""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    def stop(self):
+        """Stop listening and close the connection."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+    
+    async def _run(self):
+        """Keep a LISTEN connection open for as long as the task runs."""
+        delay = 1
+        
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(asyncpg_dsn(settings.DATABASE_URL))
+                terminated = asyncio.Event()
+                connection.add_termination_listener(lambda _: terminated.set())
+                await connection.add_listener(REMINDER_CHANNEL, self._handle)
+                
+                logger.info(f"Listening for reminder changes on '{REMINDER_CHANNEL}'")
+                self.connected = True
+                delay = 1
+                await self.on_connection_change(True)
+                
+                await terminated.wait()
+                logger.warning("Reminder change listener connection lost")
+            
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Reminder change listener error: {e}")
+            finally:
+                if self.connected:
+                    self.connected = False
+                    await self.on_connection_change(False)
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60)
+    
+    def _handle(self, connection, pid, channel, payload: str):
+        """Parse a notification and forward it to the scheduler."""
+        try:
+            data = json.loads(payload)
+            next_attempt_at = data.get("next_attempt_at")
+            self.on_change(
+                UUID(data["id"]),
+                datetime.fromisoformat(next_attempt_at) if next_attempt_at else None
+            )
+        except Exception as e:
+            logger.error(f"Invalid reminder change notification {payload!r}: {e}")
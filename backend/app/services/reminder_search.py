@@ -0,0 +1,44 @@
+"""
+Indexed search over reminder titles and messages.
+
+Three index-backed matches are combined (see the reminders migrations):
+- full-text: the stored search_vector column (title weighted above
+  message) against websearch_to_tsquery, through a GIN index; matches
+  words and their stems, and understands "quoted phrases", OR and -term
+- substring: ILIKE '%term%' on title and message, through pg_trgm GIN
+  indexes, so partial words still match as before
+- fuzzy: word similarity of the term to the title (pg_trgm's <%
+  operator), so small typos still find the reminder
+
+Results are ranked by full-text rank plus title similarity.
+"""
+
+from sqlalchemy import or_
+from sqlalchemy.sql import func
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.reminder import Reminder, SEARCH_CONFIG
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so the term matches literally."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_filter(term: str) -> ColumnElement:
+    """Reminders whose title or message match the search term."""
+    pattern = f"%{escape_like(term)}%"
+    return or_(
+        Reminder.search_vector.op("@@")(func.websearch_to_tsquery(SEARCH_CONFIG, term)),
+        Reminder.title.ilike(pattern, escape="\\"),
+        Reminder.message.ilike(pattern, escape="\\"),
+        Reminder.title.op("%>")(term),
+    )
+
+
+def search_rank(term: str) -> ColumnElement:
+    """Relevance of a reminder to the search term (higher is better)."""
+    return (
+        func.ts_rank_cd(Reminder.search_vector, func.websearch_to_tsquery(SEARCH_CONFIG, term))
+        + func.word_similarity(term, Reminder.title)
+    )
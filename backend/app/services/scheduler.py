@@ -1,20 +1,38 @@
 """
 Background scheduler for processing due reminders.
 
-Checks database periodically and triggers calls for reminders
-that are due.
+Keeps upcoming reminders in an in-memory dispatch queue and triggers
+calls at their exact due time. The database is only polled
+periodically to refill the queue.
 """
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
 from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+import asyncio
 import logging
+import os
+import socket
 
 from app.core.config import settings
-from app.core.database import SessionLocal
+from app.core.database import AsyncSessionLocal
 from app.models.reminder import Reminder, ReminderStatus
-from app.services.vapi_service import vapi_service
+from app.services.call_dedup import call_dedup, dispatch_key
+from app.services.call_provider import CallDeferredError, CallOutcomeUnknownError
+from app.services.call_reconciler import CallStatusReconciler
+from app.services.call_router import call_router
+from app.services.catch_up import MissedReminderCatchUp
+from app.services.dispatch_queue import DispatchQueue
+from app.services.metrics import RollingStats
+from app.services.reminder_notifications import ReminderChangeListener
+from app.services.status_writer import StatusWriteBuffer
+from app.services.webhook_queue import WebhookEventConsumer
+from app.utils.backoff import next_attempt_time
 
 logger = logging.getLogger(__name__)
 
@@ -23,84 +41,470 @@ class ReminderScheduler:
     """
     Scheduler for processing reminders.
     
-    Runs a background job that:
-    1. Checks for due reminders every 30 seconds
-    2. Triggers Vapi calls for due reminders
-    3. Updates reminder status based on call outcome
-    4. Implements retry logic for failed calls
+    Runs:
+    1. A refill job that loads reminders due within the queue horizon
+       from the database every SCHEDULER_CHECK_INTERVAL seconds
+    2. A dispatch loop that sleeps until the next queued reminder is
+       due and triggers its call, with at most
+       SCHEDULER_MAX_CONCURRENT_CALLS calls in flight
+    3. Status updates based on call outcome, written in bulk through a
+       write-behind buffer
+    4. Retry logic for failed calls, with exponential backoff and
+       jitter tracked in next_attempt_at
+    
+    Reminders are claimed with a lease (claimed_by/lease_expires_at)
+    before they are queued and again before they are called, so several
+    scheduler instances can share the due set without dialing twice.
+    Leases of a crashed instance expire and are reclaimed by the others.
+    
+    While the LISTEN connection for reminder changes is up, the queue is
+    re-planned as soon as a reminder is written and the refill job only
+    runs every SCHEDULER_SAFETY_NET_INTERVAL seconds as a safety net.
+    
+    Reminders whose next attempt is more than SCHEDULER_MISSED_THRESHOLD
+    seconds in the past are left to the missed-reminder catch-up, which
+    runs on startup and every half lease (see app.services.catch_up).
+    
+    Calls go through the call router (see app.services.call_router),
+    which picks a telephony provider per call and fails over between them.
+    
+    Placed calls that never got an outcome webhook are polled every
+    SCHEDULER_RECONCILE_INTERVAL seconds (see app.services.call_reconciler).
+    
+    Call outcome webhooks are queued by the API and applied here in
+    batches (see app.services.webhook_queue).
     """
     
     def __init__(self):
         self.scheduler = AsyncIOScheduler()
         self.max_retries = settings.SCHEDULER_MAX_RETRIES
         self.check_interval = settings.SCHEDULER_CHECK_INTERVAL
+        self.safety_net_interval = settings.SCHEDULER_SAFETY_NET_INTERVAL
+        self.node_id = settings.SCHEDULER_NODE_ID or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_duration = timedelta(seconds=settings.SCHEDULER_LEASE_SECONDS)
+        self.missed_threshold = timedelta(seconds=settings.SCHEDULER_MISSED_THRESHOLD)
+        self.claim_batch_size = settings.SCHEDULER_CLAIM_BATCH_SIZE
+        self.queue = DispatchQueue(horizon_seconds=settings.SCHEDULER_QUEUE_HORIZON)
+        self.max_concurrent_calls = settings.SCHEDULER_MAX_CONCURRENT_CALLS
+        self.lateness = RollingStats()
+        self.throughput = RollingStats(maxlen=100)
+        self._dispatch_task: Optional[asyncio.Task] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._call_slots: Optional[asyncio.Semaphore] = None
+        self._in_flight_calls = 0
+        self.listener: Optional[ReminderChangeListener] = None
+        if settings.SCHEDULER_LISTEN_NOTIFY:
+            self.listener = ReminderChangeListener(
+                on_change=self.on_reminder_changed,
+                on_connection_change=self.on_listener_connection_changed
+            )
+        self.catch_up = MissedReminderCatchUp(self)
+        self.reconciler = CallStatusReconciler(self)
+        self.webhook_consumer = WebhookEventConsumer(
+            batch_size=settings.WEBHOOK_CONSUMER_BATCH_SIZE,
+            interval=settings.WEBHOOK_CONSUMER_INTERVAL,
+            max_attempts=settings.WEBHOOK_MAX_ATTEMPTS
+        )
+        self.status_writer = StatusWriteBuffer(
+            max_batch=settings.SCHEDULER_WRITE_BATCH_SIZE,
+            flush_interval=settings.SCHEDULER_WRITE_FLUSH_INTERVAL
+        )
     
     async def check_due_reminders(self):
         """
-        Check for reminders that are due and process them.
+        Refill the dispatch queue from the database.
         
         This method runs periodically and:
-        - Finds reminders scheduled within the next minute
-        - Processes each due reminder
-        - Updates status based on call result
+        - Claims scheduled reminders due within the queue horizon
+          (renewing the leases this node already holds), batch after
+          batch until one comes back short
+        - Inserts them into the dispatch queue (existing entries are kept)
+        
+        The dispatch loop takes care of firing them on time.
         """
-        logger.info("Checking for due reminders...")
+        logger.info("Refilling dispatch queue...")
         
-        db: Session = SessionLocal()
         try:
             now = datetime.now(timezone.utc)
+            queued = 0
+            cursor = None
             
-            # Find reminders due in the next minute
-            # This window accounts for scheduler interval
-            due_reminders = db.query(Reminder).filter(
+            while True:
+                async with AsyncSessionLocal() as db:
+                    upcoming = await self.claim_upcoming(db, now, cursor)
+                
+                queued += sum(
+                    1 for reminder_id, next_attempt_at in upcoming
+                    if self.queue.schedule(reminder_id, next_attempt_at)
+                )
+                
+                if len(upcoming) < self.claim_batch_size:
+                    break
+                cursor = max((next_attempt_at, reminder_id) for reminder_id, next_attempt_at in upcoming)
+            
+            logger.info(f"Queued {queued} upcoming reminders ({len(self.queue)} in queue)")
+        
+        except Exception as e:
+            logger.error(f"Error refilling dispatch queue: {e}")
+    
+    def on_reminder_changed(self, reminder_id: UUID, next_attempt_at: Optional[datetime]):
+        """
+        Re-plan a reminder after a change notification.
+        
+        Args:
+            reminder_id: ID of the changed reminder
+            next_attempt_at: New due time, or None if the reminder was
+                deleted or has no call pending
+        """
+        if next_attempt_at is None:
+            self.queue.cancel(reminder_id)
+        else:
+            self.queue.schedule(reminder_id, next_attempt_at)
+    
+    async def on_listener_connection_changed(self, connected: bool):
+        """
+        Switch the refill job between safety-net and regular polling.
+        
+        On (re)connect an immediate refill picks up anything written
+        while notifications were not being received.
+        """
+        interval = self.safety_net_interval if connected else self.check_interval
+        logger.info(
+            f"Reminder notifications {'up' if connected else 'down'}; "
+            f"refilling every {interval}s"
+        )
+        
+        changes = {"trigger": IntervalTrigger(seconds=interval)}
+        if connected:
+            changes["next_run_time"] = datetime.now(timezone.utc)
+        self.scheduler.modify_job('check_reminders', **changes)
+    
+    def claimable(self):
+        """Filter for reminders this node may claim."""
+        return or_(
+            Reminder.claimed_by.is_(None),
+            Reminder.claimed_by == self.node_id,
+            Reminder.lease_expires_at < func.now()
+        )
+    
+    async def claim_upcoming(
+        self,
+        db: AsyncSession,
+        now: datetime,
+        cursor: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[Tuple[UUID, datetime]]:
+        """
+        Atomically lease up to SCHEDULER_CLAIM_BATCH_SIZE upcoming reminders.
+        
+        Rows locked by another instance's claim are skipped rather than
+        waited on (FOR UPDATE SKIP LOCKED), so concurrent instances split
+        the due set instead of serializing on it.
+        
+        Reminders past the missed threshold are left to the catch-up,
+        except those whose lease expired: another node claimed them in
+        time and went away, and by the time the lease (longer than the
+        missed threshold) lapses they would otherwise never be claimed.
+        
+        Args:
+            db: Database session
+            now: Reference time for the claim window
+            cursor: (next_attempt_at, id) of the last reminder of the
+                previous batch of this refill
+        
+        Returns:
+            (reminder id, next attempt time) pairs now leased to this node
+        """
+        conditions = [
+            Reminder.status == ReminderStatus.SCHEDULED,
+            Reminder.next_attempt_at <= now + self.queue.horizon,
+            or_(
+                Reminder.next_attempt_at > now - self.missed_threshold,
+                Reminder.lease_expires_at < func.now()
+            ),
+            self.claimable()
+        ]
+        if cursor:
+            # Leases this node holds stay claimable, so page past the ones just renewed
+            conditions.append(tuple_(Reminder.next_attempt_at, Reminder.id) > tuple_(*cursor))
+        
+        candidates = (
+            select(Reminder.id)
+            .where(*conditions)
+            .order_by(Reminder.next_attempt_at, Reminder.id)
+            .limit(self.claim_batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        
+        result = await db.execute(
+            update(Reminder)
+            .where(Reminder.id.in_(candidates))
+            .values(
+                claimed_by=self.node_id,
+                lease_expires_at=func.now() + self.lease_duration,
+                updated_at=Reminder.updated_at  # Leases are not user-visible edits
+            )
+            .returning(Reminder.id, Reminder.next_attempt_at)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = [(row.id, row.next_attempt_at) for row in result]
+        await db.commit()
+        
+        return claimed
+    
+    async def claim_for_dispatch(self, db: AsyncSession, due: List[Tuple[UUID, datetime]]) -> List[Row]:
+        """
+        Atomically lease reminders right before calling them and count the attempt.
+        
+        This is the final gate against duplicate calls: entries queued
+        locally by the API were never claimed, and a lease may have been
+        taken over by another instance since the last refill. A reminder
+        only matches if it is still due at the time it was queued with,
+        so edits that raced with the queue are respected.
+        
+        The attempt counter is incremented in the same statement and
+        committed before any call is placed, together with the attempt's
+        idempotency key (see app.services.call_dedup). Reminders with
+        another attempt still in flight are not returned; their attempt
+        is given back and they are left to the call reconciler, which
+        resolves the earlier attempt by key.
+        
+        Args:
+            db: Database session
+            due: (reminder id, due time) pairs to claim
+        
+        Returns:
+            Claimed rows with the fields needed to place the call
+        """
+        result = await db.execute(
+            update(Reminder)
+            .where(
+                tuple_(Reminder.id, Reminder.next_attempt_at).in_(due),
                 Reminder.status == ReminderStatus.SCHEDULED,
-                Reminder.scheduled_datetime <= now + timedelta(minutes=1),
-                Reminder.scheduled_datetime > now - timedelta(minutes=5)
-            ).all()
+                self.claimable()
+            )
+            .values(
+                claimed_by=self.node_id,
+                lease_expires_at=func.now() + self.lease_duration,
+                call_attempts=func.coalesce(Reminder.call_attempts, 0) + 1,
+                version=Reminder.version + 1,
+                updated_at=Reminder.updated_at  # Leases are not user-visible edits
+            )
+            .returning(
+                Reminder.id,
+                Reminder.title,
+                Reminder.message,
+                Reminder.phone_number,
+                Reminder.call_attempts,
+                Reminder.next_attempt_at,
+                Reminder.version
+            )
+            .execution_options(synchronize_session=False)
+        )
+        claimed = result.all()
+        
+        reserved = await call_dedup.reserve(db, claimed)
+        blocked = [row.id for row in claimed if row.id not in reserved]
+        if blocked:
+            await db.execute(
+                update(Reminder)
+                .where(Reminder.id.in_(blocked))
+                .values(
+                    call_attempts=Reminder.call_attempts - 1,
+                    next_attempt_at=None,
+                    vapi_call_id=None,
+                    status_check_at=func.now(),
+                    version=Reminder.version + 1,
+                    updated_at=Reminder.updated_at
+                )
+                .execution_options(synchronize_session=False)
+            )
+            logger.warning(f"Not calling {len(blocked)} reminders with an earlier call attempt in flight")
+        await db.commit()
+        
+        return [row for row in claimed if row.id in reserved]
+    
+    async def dispatch_loop(self):
+        """
+        Fire queued reminders at their due time.
+        
+        Sleeps until the earliest queued reminder is due, or until the
+        queue signals that an earlier reminder was inserted.
+        """
+        logger.info("Dispatch loop started")
+        
+        while True:
+            try:
+                now = datetime.now(timezone.utc)
+                
+                due = self.queue.pop_due(now)
+                if due:
+                    task = asyncio.create_task(self.dispatch_batch(due))
+                    self._batch_tasks.add(task)
+                    task.add_done_callback(self._batch_tasks.discard)
+                
+                next_due = self.queue.next_due_at()
+                timeout = None
+                if next_due is not None:
+                    timeout = max(0.0, (next_due - datetime.now(timezone.utc)).total_seconds())
+                
+                await self.queue.wait(timeout)
+            
+            except asyncio.CancelledError:
+                logger.info("Dispatch loop stopped")
+                raise
+            except Exception as e:
+                logger.error(f"Error in dispatch loop: {e}")
+                await asyncio.sleep(1)
+    
+    async def dispatch_batch(self, due: List[Tuple[UUID, datetime]], late: bool = False):
+        """
+        Dispatch reminders that came due together, concurrently.
+        
+        The whole batch is claimed in one statement; each claimed
+        reminder then runs in its own task, and outcomes go to the
+        write-behind buffer. The shared semaphore caps calls in flight
+        across all batches, so a large batch cannot delay reminders that
+        come due after it.
+        
+        Args:
+            due: (reminder id, due time) pairs popped from the queue
+            late: Whether these are missed reminders delivered by the
+                catch-up (kept out of the lateness metric)
+        """
+        started = asyncio.get_running_loop().time()
+        reminder_ids = [reminder_id for reminder_id, _ in due]
+        requeue: Dict[UUID, datetime] = {}
+        
+        try:
+            # A reminder coming back for a retry may still have its
+            # previous outcome in the buffer; the claim must see it.
+            if self.status_writer.has_pending(reminder_ids):
+                await self.status_writer.flush()
             
-            logger.info(f"Found {len(due_reminders)} due reminders")
+            async with AsyncSessionLocal() as db:
+                claimed = await self.claim_for_dispatch(db, due)
+                
+                skipped = set(reminder_ids) - {row.id for row in claimed}
+                if skipped:
+                    # Rescheduled, deleted, finished or leased elsewhere;
+                    # requeue the ones this node may still call.
+                    result = await db.execute(
+                        select(Reminder.id, Reminder.next_attempt_at).where(
+                            Reminder.id.in_(skipped),
+                            Reminder.status == ReminderStatus.SCHEDULED,
+                            Reminder.next_attempt_at.isnot(None),
+                            self.claimable()
+                        )
+                    )
+                    requeue.update(result.all())
+                    logger.info(f"Skipped {len(skipped)} reminders no longer due here")
             
-            for reminder in due_reminders:
-                await self.process_reminder(db, reminder)
+            results = await asyncio.gather(
+                *(self.dispatch_bounded(reminder, late=late) for reminder in claimed)
+            )
+            requeue.update(
+                (reminder.id, retry_at)
+                for reminder, retry_at in zip(claimed, results)
+                if retry_at
+            )
         
         except Exception as e:
-            logger.error(f"Error checking due reminders: {e}")
+            logger.error(f"Error dispatching batch of {len(due)} reminders: {e}")
         finally:
-            db.close()
+            for reminder_id in reminder_ids:
+                self.queue.release(reminder_id)
+        
+        for reminder_id, retry_at in requeue.items():
+            self.queue.schedule(reminder_id, retry_at)
+        
+        elapsed = asyncio.get_running_loop().time() - started
+        if elapsed > 0 and not late:
+            self.throughput.add(len(due) / elapsed)
+        logger.info(f"Dispatched {len(due)} reminders in {elapsed:.2f}s")
     
-    async def process_reminder(self, db: Session, reminder: Reminder):
+    async def dispatch_bounded(self, reminder: Row, late: bool = False) -> Optional[datetime]:
+        """Process a claimed reminder once a call slot is free."""
+        async with self._call_slots:
+            self._in_flight_calls += 1
+            try:
+                if not late:
+                    lateness = (datetime.now(timezone.utc) - reminder.next_attempt_at).total_seconds()
+                    self.lateness.add(lateness)
+                
+                return await self.process_reminder(reminder)
+            except Exception as e:
+                logger.error(f"Error dispatching reminder {reminder.id}: {e}")
+                return None
+            finally:
+                self._in_flight_calls -= 1
+    
+    async def process_reminder(self, reminder: Row) -> Optional[datetime]:
         """
-        Process a single reminder by triggering a call.
+        Process a single claimed reminder by triggering a call.
+        
+        The attempt was already counted by the claim. Outcomes are
+        recorded in the write-behind buffer, which flushes them in bulk.
+        
+        Failed attempts are retried after an exponential backoff with
+        jitter (SCHEDULER_RETRY_BASE_DELAY, SCHEDULER_RETRY_MAX_DELAY).
+        Once a call is placed, next_attempt_at is cleared so the reminder
+        leaves the due set while its outcome is pending.
+        
+        The call carries the attempt's idempotency key. If the request
+        was sent but its answer lost, the attempt is not retried; the
+        reconciler looks the key up at the provider instead.
         
         Args:
-            db: Database session
-            reminder: Reminder to process
+            reminder: Claimed reminder row (see claim_for_dispatch)
+        
+        Returns:
+            When the next attempt is due, or None if no retry is pending
         """
+        reminder_id = reminder.id
+        key = dispatch_key(reminder_id, reminder.call_attempts)
+        
         try:
-            logger.info(f"Processing reminder {reminder.id}: {reminder.title}")
+            logger.info(f"Processing reminder {reminder_id}: {reminder.title}")
             
-            # Check retry limit
-            if reminder.call_attempts >= self.max_retries:
-                logger.warning(f"Reminder {reminder.id} exceeded max retries")
-                reminder.status = ReminderStatus.FAILED
-                reminder.last_error = f"Exceeded maximum retries ({self.max_retries})"
-                db.commit()
-                return
+            # Check retry limit (the claim already counted this attempt)
+            if reminder.call_attempts > self.max_retries:
+                logger.warning(f"Reminder {reminder_id} exceeded max retries")
+                await call_dedup.mark_failed(key)
+                self.status_writer.add(
+                    reminder_id,
+                    reminder.call_attempts,
+                    reminder.version,
+                    status=ReminderStatus.FAILED,
+                    call_attempts=reminder.call_attempts - 1,
+                    last_error=f"Exceeded maximum retries ({self.max_retries})",
+                    next_attempt_at=None
+                )
+                return None
             
-            # Increment attempt counter
-            reminder.call_attempts += 1
-            db.commit()
+            cached = call_dedup.lookup(key)
+            if cached is not None and cached.status != "pending":
+                logger.warning(f"Reminder {reminder_id} attempt {reminder.call_attempts} was already dispatched")
+                return None
             
-            # Trigger Vapi call
-            call_result = await vapi_service.create_call(
+            # Trigger the call through the best available provider
+            provider, call_result = await call_router.create_call(
                 phone_number=reminder.phone_number,
                 message=reminder.message,
-                reminder_id=str(reminder.id),
-                title=reminder.title
+                reminder_id=str(reminder_id),
+                title=reminder.title,
+                idempotency_key=key
             )
+            await call_dedup.mark_placed(key, provider.name, call_result.get('id'))
             
-            # Store the Vapi call ID for tracking
-            reminder.vapi_call_id = call_result.get('id')
+            # Store the provider's call ID for tracking
+            now = datetime.now(timezone.utc)
+            changes = {
+                "vapi_call_id": call_result.get('id'),
+                "call_provider": provider.name,
+                "next_attempt_at": None,
+                "call_placed_at": now,
+            }
             
             # Update reminder status based on call initiation
             # Note: If webhook is configured, the webhook will update to COMPLETED
@@ -110,46 +514,157 @@ class ReminderScheduler:
             if call_status in ['queued', 'ringing', 'in-progress', 'started']:
                 # If no webhook configured, mark as completed immediately
                 # If webhook IS configured, it will update the status when call actually ends
-                if not settings.VAPI_WEBHOOK_URL:
-                    reminder.status = ReminderStatus.COMPLETED
-                    reminder.completed_at = datetime.now(timezone.utc)
-                    logger.info(f"Reminder {reminder.id} marked as COMPLETED (no webhook)")
+                if not provider.awaits_outcome:
+                    changes["status"] = ReminderStatus.COMPLETED
+                    changes["completed_at"] = now
+                    logger.info(f"Reminder {reminder_id} marked as COMPLETED (no webhook)")
                 else:
-                    logger.info(f"Reminder {reminder.id} call initiated. Waiting for webhook to update status.")
+                    # Polled by the reconciler if the webhook never arrives
+                    changes["status_check_at"] = now + self.reconciler.threshold
+                    logger.info(f"Reminder {reminder_id} call initiated. Waiting for webhook to update status.")
             else:
                 raise Exception(f"Call failed with status: {call_status}")
             
-            db.commit()
+            self.status_writer.add(reminder_id, reminder.call_attempts, reminder.version, **changes)
+            return None
+        
+        except CallDeferredError as e:
+            # Not dialed (e.g. provider rate limit): give the attempt back
+            logger.warning(f"Call for reminder {reminder_id} deferred: {e}")
+            await call_dedup.release(key)
+            retry_at = datetime.now(timezone.utc) + timedelta(seconds=e.retry_after)
+            self.status_writer.add(
+                reminder_id,
+                reminder.call_attempts,
+                reminder.version,
+                call_attempts=reminder.call_attempts - 1,
+                next_attempt_at=retry_at
+            )
+            return retry_at
+        
+        except CallOutcomeUnknownError as e:
+            # May have been dialed: look it up by key rather than call again
+            logger.warning(f"Call for reminder {reminder_id} may have been placed: {e}")
+            await call_dedup.mark_unknown(key, e.provider.name)
+            now = datetime.now(timezone.utc)
+            self.status_writer.add(
+                reminder_id,
+                reminder.call_attempts,
+                reminder.version,
+                vapi_call_id=None,
+                call_provider=e.provider.name,
+                call_placed_at=now,
+                last_error=str(e),
+                next_attempt_at=None,
+                status_check_at=now + timedelta(seconds=settings.CALL_DEDUP_RESOLVE_DELAY)
+            )
+            return None
         
         except Exception as e:
-            logger.error(f"Error processing reminder {reminder.id}: {e}")
-            reminder.last_error = str(e)
+            logger.error(f"Error processing reminder {reminder_id}: {e}")
+            await call_dedup.mark_failed(key)
             
-            # Mark as failed if max retries reached
+            # Mark as failed if max retries reached, otherwise back off
             if reminder.call_attempts >= self.max_retries:
-                reminder.status = ReminderStatus.FAILED
+                self.status_writer.add(
+                    reminder_id,
+                    reminder.call_attempts,
+                    reminder.version,
+                    status=ReminderStatus.FAILED,
+                    last_error=str(e),
+                    next_attempt_at=None
+                )
+                return None
             
-            db.commit()
+            retry_at = next_attempt_time(reminder.call_attempts)
+            logger.info(f"Reminder {reminder_id} will be retried at {retry_at.isoformat()}")
+            self.status_writer.add(reminder_id, reminder.call_attempts, reminder.version, last_error=str(e), next_attempt_at=retry_at)
+            return retry_at
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get dispatch metrics.
+        
+        Lateness is the delay in seconds between a reminder's due time
+        and the moment the dispatcher picked it up. Throughput is the
+        number of reminders per second for each batch that came due
+        together.
+        """
+        next_due = self.queue.next_due_at()
+        return {
+            "node_id": self.node_id,
+            "notifications_connected": bool(self.listener and self.listener.connected),
+            "queue_size": len(self.queue),
+            "next_due_at": next_due.isoformat() if next_due else None,
+            "dispatch_lateness_seconds": self.lateness.summary(),
+            "max_concurrent_calls": self.max_concurrent_calls,
+            "in_flight_calls": self._in_flight_calls,
+            "batch_throughput_per_second": self.throughput.summary(),
+            "catch_up": self.catch_up.progress(),
+            "call_reconciliation": self.reconciler.get_metrics(),
+            "call_providers": call_router.get_metrics(),
+            "call_dedup": call_dedup.get_metrics(),
+            "webhook_events": self.webhook_consumer.get_metrics(),
+            "status_writes": self.status_writer.get_metrics(),
+        }
     
     def start(self):
         """Start the scheduler."""
-        logger.info(f"Starting reminder scheduler (interval: {self.check_interval}s)")
+        logger.info(f"Starting reminder scheduler (refill interval: {self.check_interval}s)")
+        
+        loop = asyncio.get_running_loop()
+        self.queue.bind(loop)
+        self._call_slots = asyncio.Semaphore(self.max_concurrent_calls)
         
         self.scheduler.add_job(
             self.check_due_reminders,
             trigger=IntervalTrigger(seconds=self.check_interval),
             id='check_reminders',
             replace_existing=True,
+            max_instances=1,
+            next_run_time=datetime.now(timezone.utc)
+        )
+        
+        # Sweeps up reminders whose lease expired on a node that went away
+        self.scheduler.add_job(
+            self.catch_up.sweep,
+            trigger=IntervalTrigger(seconds=self.lease_duration.total_seconds() / 2),
+            id='catch_up_missed',
+            replace_existing=True,
+            max_instances=1
+        )
+        
+        self.scheduler.add_job(
+            self.reconciler.run,
+            trigger=IntervalTrigger(seconds=settings.SCHEDULER_RECONCILE_INTERVAL),
+            id='reconcile_calls',
+            replace_existing=True,
             max_instances=1
         )
         
         self.scheduler.start()
+        self.status_writer.start()
+        self.webhook_consumer.start()
+        self._dispatch_task = loop.create_task(self.dispatch_loop())
+        if self.listener:
+            self.listener.start()
+        self.catch_up.start()
         logger.info("Reminder scheduler started")
     
-    def shutdown(self):
-        """Stop the scheduler."""
+    async def shutdown(self):
+        """Stop the scheduler and write any buffered outcomes."""
         logger.info("Stopping reminder scheduler...")
+        if self.listener:
+            self.listener.stop()
+        self.catch_up.stop()
         self.scheduler.shutdown()
+        if self._dispatch_task:
+            self._dispatch_task.cancel()
+            self._dispatch_task = None
+        for task in list(self._batch_tasks):
+            task.cancel()
+        await self.webhook_consumer.stop()
+        await self.status_writer.stop()
         logger.info("Reminder scheduler stopped")
 
 
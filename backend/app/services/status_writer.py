@@ -0,0 +1,199 @@
+"""
+Write-behind buffer for reminder status updates.
+
+Collects per-reminder changes made by the dispatcher (status, attempts,
+call ID, errors, next attempt time) and writes them in bulk with
+``UPDATE ... FROM (VALUES ...)`` instead of one transaction per change.
+"""
+
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set
+from uuid import UUID
+import asyncio
+import logging
+import time
+
+from sqlalchemy import cast, column, update, values
+
+from app.core.database import AsyncSessionLocal
+from app.models.reminder import Reminder
+from app.services.metrics import RollingStats
+
+logger = logging.getLogger(__name__)
+
+BUFFERED_COLUMNS = (
+    "status",
+    "call_attempts",
+    "vapi_call_id",
+    "call_provider",
+    "last_error",
+    "next_attempt_at",
+    "completed_at",
+    "call_placed_at",
+    "status_check_at",
+)
+
+
+class StatusWriteBuffer:
+    """
+    Buffers reminder updates and flushes them in bulk.
+    
+    A flush happens when ``max_batch`` reminders have pending changes,
+    or every ``flush_interval`` seconds otherwise. Changes to the same
+    reminder are merged, later values winning.
+    
+    The buffer never holds the attempt increment: that is written by
+    the dispatch claim before the call is placed, so a crash can lose
+    an outcome but never an attempt. Each change is tied to the attempt
+    and the row version it was based on, and dropped if the row has
+    moved on by the time it is flushed (e.g. a call.failed webhook
+    already re-armed the retry, or a new attempt was claimed). Every
+    write bumps the version.
+    """
+    
+    def __init__(self, max_batch: int, flush_interval: float):
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._pending: Dict[UUID, Dict[str, Any]] = {}
+        self._attempts: Dict[UUID, int] = {}
+        self._versions: Dict[UUID, int] = {}
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+        self.flush_seconds = RollingStats(maxlen=200)
+        self.rows_flushed = 0
+    
+    def add(self, reminder_id: UUID, attempt: int, version: int, **changes: Any):
+        """
+        Record changes for a reminder.
+        
+        Args:
+            reminder_id: Reminder to update
+            attempt: call_attempts value the changes belong to
+            version: Row version the changes were based on
+            **changes: Column values, limited to BUFFERED_COLUMNS
+        """
+        unknown = set(changes) - set(BUFFERED_COLUMNS)
+        if unknown:
+            raise ValueError(f"Cannot buffer updates to {', '.join(sorted(unknown))}")
+        
+        self._pending.setdefault(reminder_id, {}).update(changes)
+        self._attempts[reminder_id] = attempt
+        self._versions[reminder_id] = version
+        
+        if len(self._pending) >= self.max_batch:
+            task = asyncio.get_running_loop().create_task(self._flush_pending())
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+    
+    def has_pending(self, reminder_ids: Iterable[UUID]) -> bool:
+        """Check whether any of the given reminders has unwritten changes."""
+        return any(reminder_id in self._pending for reminder_id in reminder_ids)
+    
+    async def flush(self):
+        """Write all pending changes and wait for size-triggered flushes still running."""
+        await self._flush_pending()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+    
+    async def _flush_pending(self):
+        async with self._lock:
+            batch, attempts, versions = self._take()
+            if batch:
+                await self._write(batch, attempts, versions)
+    
+    def _take(self):
+        """Swap out the pending changes."""
+        batch, self._pending = self._pending, {}
+        attempts, self._attempts = self._attempts, {}
+        versions, self._versions = self._versions, {}
+        return batch, attempts, versions
+    
+    async def _write(self, batch: Dict[UUID, Dict[str, Any]], attempts: Dict[UUID, int], versions: Dict[UUID, int]):
+        """
+        Write a batch with one UPDATE per distinct set of changed columns.
+        
+        Failed writes are put back in the buffer (unless newer changes
+        arrived meanwhile) and retried on the next flush.
+        """
+        started = time.monotonic()
+        
+        groups: Dict[FrozenSet[str], List[UUID]] = {}
+        for reminder_id, changes in batch.items():
+            groups.setdefault(frozenset(changes), []).append(reminder_id)
+        
+        db = AsyncSessionLocal()
+        try:
+            for columns, reminder_ids in groups.items():
+                names = [name for name in BUFFERED_COLUMNS if name in columns]
+                table_columns = Reminder.__table__.c
+                
+                rows = values(
+                    column("id", table_columns.id.type),
+                    column("attempt", table_columns.call_attempts.type),
+                    column("version", table_columns.version.type),
+                    *(column(name, table_columns[name].type) for name in names),
+                    name="changes"
+                ).data([
+                    (reminder_id, attempts[reminder_id], versions[reminder_id], *(batch[reminder_id][name] for name in names))
+                    for reminder_id in reminder_ids
+                ])
+                
+                # VALUES columns are untyped in Postgres; cast them to
+                # the column types so enums, UUIDs and NULLs line up.
+                await db.execute(
+                    update(Reminder)
+                    .where(
+                        Reminder.id == cast(rows.c.id, table_columns.id.type),
+                        Reminder.call_attempts == cast(rows.c.attempt, table_columns.call_attempts.type),
+                        Reminder.version == cast(rows.c.version, table_columns.version.type)
+                    )
+                    .values({
+                        **{name: cast(rows.c[name], table_columns[name].type) for name in names},
+                        "version": Reminder.version + 1,
+                    })
+                    .execution_options(synchronize_session=False)
+                )
+            
+            await db.commit()
+            self.rows_flushed += len(batch)
+            self.flush_seconds.add(time.monotonic() - started)
+        
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error flushing {len(batch)} reminder updates: {e}")
+            for reminder_id, changes in batch.items():
+                if reminder_id not in self._pending:
+                    self._pending[reminder_id] = changes
+                    self._attempts[reminder_id] = attempts[reminder_id]
+                    self._versions[reminder_id] = versions[reminder_id]
+        finally:
+            await db.close()
+    
+    async def _run(self):
+        """Flush on the time threshold."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error in status write-back loop: {e}")
+    
+    def start(self):
+        """Start the periodic flush."""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self):
+        """Stop the periodic flush and write whatever is still pending."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        
+        await self.flush()
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get buffer metrics for the metrics endpoint."""
+        return {
+            "pending": len(self._pending),
+            "rows_flushed": self.rows_flushed,
+            "flush_seconds": self.flush_seconds.summary(),
+        }
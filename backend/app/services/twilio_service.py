@@ -0,0 +1,329 @@
+"""
+Twilio service for placing reminder calls with text-to-speech.
+
+Used as a second telephony provider next to Vapi: the reminder is read
+out with TwiML <Say> instead of an AI assistant.
+"""
+
+import base64
+import hashlib
+import hmac
+import logging
+import time
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+import httpx
+
+from app.core.config import settings
+from app.services.call_provider import (
+    CALL_ENDED,
+    CALL_FAILED,
+    OUTCOME_UNKNOWN_ERRORS,
+    CallNotFoundError,
+    CallOutcomeUnknownError,
+    CallProvider,
+    CallRateLimitError,
+    ProviderUnavailableError,
+)
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.rate_limiter import create_call_rate_limiter, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+# Twilio call statuses mapped to the normalized ones (see CallProvider)
+TWILIO_STATUSES = {
+    "queued": "queued",
+    "initiated": "queued",
+    "ringing": "ringing",
+    "in-progress": "in-progress",
+    "completed": CALL_ENDED,
+    "busy": CALL_FAILED,
+    "no-answer": CALL_FAILED,
+    "failed": CALL_FAILED,
+    "canceled": CALL_FAILED,
+}
+
+
+def build_twiml(message: str) -> str:
+    """TwiML that reads the reminder out and hangs up."""
+    return (
+        f"<Response><Say voice={quoteattr(settings.TWILIO_VOICE)}>{escape(message)}</Say></Response>"
+    )
+
+
+def normalize_call(call: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a Twilio call resource to the normalized status shape."""
+    twilio_status = call.get("status", "")
+    status = TWILIO_STATUSES.get(twilio_status, twilio_status)
+    end_time = call.get("end_time")
+    
+    return {
+        "id": call.get("sid"),
+        "status": status,
+        "endedReason": twilio_status if status in (CALL_ENDED, CALL_FAILED) else None,
+        "endedAt": parsedate_to_datetime(end_time).isoformat() if end_time else None,
+    }
+
+
+def compute_signature(auth_token: str, url: str, params: Mapping[str, str]) -> str:
+    """
+    Compute the X-Twilio-Signature of a request.
+    
+    Twilio signs the full URL followed by the POST parameters sorted by
+    name, with HMAC-SHA1 keyed by the account's auth token.
+    """
+    data = url + "".join(f"{key}{params[key]}" for key in sorted(params))
+    digest = hmac.new(auth_token.encode(), data.encode(), hashlib.sha1).digest()
+    return base64.b64encode(digest).decode()
+
+
+def validate_signature(url: str, params: Mapping[str, str], signature: str) -> bool:
+    """
+    Check a status callback's X-Twilio-Signature header.
+    
+    Without TWILIO_AUTH_TOKEN nothing can be verified, so every
+    callback is rejected.
+    """
+    if not settings.TWILIO_AUTH_TOKEN:
+        return False
+    expected = compute_signature(settings.TWILIO_AUTH_TOKEN, url, params)
+    return hmac.compare_digest(expected, signature or "")
+
+
+class TwilioService(CallProvider):
+    """
+    Service for interacting with the Twilio Voice API.
+    
+    Calls are created with inline TwiML, so no TwiML app or hosted
+    document is needed. Like VapiService, call creation goes through a
+    rate limiter (TWILIO_CALLS_PER_SECOND, TWILIO_MAX_CONCURRENT_CALLS)
+    and a circuit breaker (TWILIO_BREAKER_*), over one shared HTTP
+    client.
+    
+    Outcomes arrive at the status callback (/api/v1/webhooks/twilio)
+    when TWILIO_STATUS_CALLBACK_URL is set.
+    """
+    
+    name = "twilio"
+    
+    def __init__(self):
+        self.account_sid = settings.TWILIO_ACCOUNT_SID
+        self.auth_token = settings.TWILIO_AUTH_TOKEN
+        self.from_number = settings.TWILIO_PHONE_NUMBER
+        self.base_url = f"{settings.TWILIO_BASE_URL}/2010-04-01/Accounts/{self.account_sid}"
+        self.rate_limiter = create_call_rate_limiter(
+            "twilio_calls",
+            calls_per_second=settings.TWILIO_CALLS_PER_SECOND,
+            burst=settings.TWILIO_RATE_LIMIT_BURST,
+            max_concurrent_calls=settings.TWILIO_MAX_CONCURRENT_CALLS
+        )
+        self.breaker = CircuitBreaker(
+            "twilio",
+            failure_rate=settings.TWILIO_BREAKER_FAILURE_RATE,
+            min_calls=settings.TWILIO_BREAKER_MIN_CALLS,
+            window=settings.TWILIO_BREAKER_WINDOW,
+            open_seconds=settings.TWILIO_BREAKER_OPEN_SECONDS,
+            half_open_calls=settings.TWILIO_BREAKER_HALF_OPEN_CALLS
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    @property
+    def is_configured(self) -> bool:
+        return bool(self.account_sid and self.auth_token and self.from_number)
+    
+    @property
+    def awaits_outcome(self) -> bool:
+        return bool(settings.TWILIO_STATUS_CALLBACK_URL)
+    
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            auth=(self.account_sid, self.auth_token),
+            limits=httpx.Limits(
+                max_connections=settings.TWILIO_MAX_CONCURRENT_CALLS * 2,
+                keepalive_expiry=settings.TWILIO_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(
+                settings.TWILIO_READ_TIMEOUT,
+                connect=settings.TWILIO_CONNECT_TIMEOUT,
+                pool=settings.TWILIO_POOL_TIMEOUT
+            )
+        )
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP client, created on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+    
+    async def start(self):
+        """Open the shared HTTP client."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+    
+    async def close(self):
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def create_call(
+        self,
+        phone_number: str,
+        message: str,
+        reminder_id: str,
+        title: Optional[str] = None,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Initiate a phone call using Twilio.
+        
+        Args:
+            phone_number: E.164 formatted phone number (e.g., +1234567890)
+            message: Message to be spoken
+            reminder_id: ID for tracking purposes
+            title: Optional reminder title for logging
+            idempotency_key: Key of this call attempt, for find_call
+        
+        Returns:
+            Twilio call resource, with its SID also under ``id``
+        
+        Raises:
+            CallRateLimitError: If Twilio rate limited the request
+            CircuitOpenError: If calls to Twilio are failing and on hold
+            CallOutcomeUnknownError: If the request was sent but its answer was lost
+            ProviderUnavailableError: If Twilio could not be reached or failed
+            Exception: If API call fails
+        """
+        form = {
+            "To": phone_number,
+            "From": self.from_number,
+            "Twiml": build_twiml(f"Hello! This is your reminder: {message}"),
+        }
+        if settings.TWILIO_STATUS_CALLBACK_URL:
+            form["StatusCallback"] = f"{settings.TWILIO_STATUS_CALLBACK_URL}?reminder_id={reminder_id}"
+            form["StatusCallbackMethod"] = "POST"
+        
+        logger.info(f"Initiating Twilio call for reminder {reminder_id} to {phone_number}")
+        
+        self.acquire_circuit()
+        
+        recorded = False
+        try:
+            async with self.rate_limiter.slot():
+                started = time.monotonic()
+                try:
+                    response = await self.client.post("/Calls.json", data=form)
+                except OUTCOME_UNKNOWN_ERRORS as e:
+                    self.record_call(started, None)
+                    recorded = True
+                    logger.error(f"Lost the answer to Twilio call creation for reminder {reminder_id}: {str(e)}")
+                    raise CallOutcomeUnknownError(f"Call outcome unknown: {type(e).__name__} {str(e)}")
+                except httpx.RequestError as e:
+                    self.record_call(started, None)
+                    recorded = True
+                    logger.error(f"Network error calling Twilio: {str(e)}")
+                    raise ProviderUnavailableError(f"Network error: {str(e)}")
+                self.record_call(started, response.status_code)
+                recorded = True
+        finally:
+            if not recorded:
+                # Never reached Twilio (e.g. cancelled while waiting for a slot)
+                self.breaker.release()
+        
+        if response.status_code == 429:
+            retry_after = parse_retry_after(
+                response.headers.get("Retry-After"),
+                default=settings.TWILIO_RETRY_AFTER_DEFAULT
+            )
+            await self.rate_limiter.on_rate_limited(retry_after)
+            raise CallRateLimitError(
+                f"Twilio rate limit hit, retry after {retry_after:.0f}s",
+                retry_after=retry_after
+            )
+        if response.status_code >= 500 or response.status_code in (401, 403):
+            # Outage or bad credentials: nothing this call can fix
+            logger.error(f"Twilio API error: {response.status_code} - {response.text}")
+            raise ProviderUnavailableError(f"Failed to create call: {response.text}")
+        if response.status_code >= 400:
+            logger.error(f"Twilio API error: {response.status_code} - {response.text}")
+            raise Exception(f"Failed to create call: {response.text}")
+        
+        result = response.json()
+        logger.info(f"Twilio call created successfully. Call SID: {result.get('sid')}")
+        return {**result, "id": result.get("sid")}
+    
+    async def get_call_status(self, call_id: str) -> Dict[str, Any]:
+        """
+        Get the normalized status of a call.
+        
+        Args:
+            call_id: Twilio call SID
+        
+        Returns:
+            Dictionary with id, status, endedReason and endedAt
+        
+        Raises:
+            CallNotFoundError: If Twilio has no call with this SID
+            Exception: If API call fails
+        """
+        response = await self.client.get(f"/Calls/{call_id}.json")
+        if response.status_code == 404:
+            raise CallNotFoundError(f"Twilio call {call_id} not found")
+        if response.status_code >= 400:
+            logger.error(f"Error fetching Twilio call status: {response.status_code}")
+            raise Exception(f"Failed to get call status: {response.text}")
+        
+        return normalize_call(response.json())
+    
+    async def find_call(
+        self,
+        idempotency_key: str,
+        phone_number: str,
+        since: datetime,
+        until: datetime
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the call of an attempt whose creation answer was lost.
+        
+        Twilio calls cannot carry our key, so this matches the first
+        call to the same number from our number created between
+        ``since`` and ``until``. Twilio filters by day only; every page
+        of those days is read (next_page_uri).
+        
+        Returns:
+            Normalized call status, or None if there is no such call
+        """
+        response = await self.client.get(
+            "/Calls.json",
+            params={
+                "To": phone_number,
+                "From": self.from_number,
+                "StartTime>": since.date().isoformat(),
+                "StartTime<": (until + timedelta(days=1)).date().isoformat(),
+                "PageSize": 1000
+            }
+        )
+        calls = []
+        while True:
+            response.raise_for_status()
+            page = response.json()
+            calls.extend(
+                call for call in page.get("calls", [])
+                if call.get("date_created") and since <= parsedate_to_datetime(call["date_created"]) <= until
+            )
+            if not page.get("next_page_uri"):
+                break
+            response = await self.client.get(f"{settings.TWILIO_BASE_URL}{page['next_page_uri']}")
+        
+        if not calls:
+            return None
+        return normalize_call(min(calls, key=lambda call: parsedate_to_datetime(call["date_created"])))
+
+
+# Singleton instance
+twilio_service = TwilioService()
@@ -4,22 +4,131 @@ Vapi service for making AI-powered phone calls.
 Integrates with Vapi API to trigger reminder calls.
 """
 
+import asyncio
+import hashlib
 import httpx
+import json
 import logging
+import time
+from datetime import datetime
 from typing import Dict, Any, Optional
 from app.core.config import settings
+from app.services.call_provider import (
+    CALL_ENDED,
+    CALL_FAILED,
+    OUTCOME_UNKNOWN_ERRORS,
+    CallLookupInconclusiveError,
+    CallNotFoundError,
+    CallOutcomeUnknownError,
+    CallProvider,
+    CallRateLimitError,
+    ProviderUnavailableError,
+)
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.rate_limiter import create_call_rate_limiter, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
+# GET /call page size (the API's maximum) and pages read by find_call
+FIND_CALL_PAGE_SIZE = 1000
+FIND_CALL_MAX_PAGES = 20
 
-class VapiService:
+ASSISTANT_NAME_PREFIX = "call-me-reminder"
+
+# Seconds calls send the assistant inline after a failed registration
+ASSISTANT_RETRY_DELAY = 30
+
+# endedReason fragments that mean the reminder was not delivered
+FAILED_END_REASONS = ("error", "failed", "did-not-answer", "busy", "no-answer")
+
+ASSISTANT_SYSTEM_PROMPT = (
+    "You are a helpful reminder assistant. After delivering the reminder message, "
+    "briefly confirm the user heard it and say goodbye. Keep the conversation short and friendly."
+)
+
+
+def build_assistant_config() -> Dict[str, Any]:
+    """
+    Build the parts of the reminder assistant shared by every call.
+    
+    Per-call values (the spoken reminder) are sent as overrides.
+    """
+    return {
+        "model": {
+            "provider": settings.VAPI_ASSISTANT_MODEL_PROVIDER,
+            "model": settings.VAPI_ASSISTANT_MODEL,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": ASSISTANT_SYSTEM_PROMPT
+                }
+            ]
+        },
+        "voice": {
+            "provider": settings.VAPI_ASSISTANT_VOICE_PROVIDER,
+            "voiceId": settings.VAPI_ASSISTANT_VOICE_ID
+        }
+    }
+
+
+def is_failed_end_reason(ended_reason: Optional[str]) -> bool:
+    """Whether a Vapi endedReason means the reminder was not delivered."""
+    reason = (ended_reason or "").lower()
+    return any(marker in reason for marker in FAILED_END_REASONS)
+
+
+def normalize_call(call: Dict[str, Any]) -> Dict[str, Any]:
+    """Report calls that ended without reaching the user as failed."""
+    if call.get("status") == CALL_ENDED and is_failed_end_reason(call.get("endedReason")):
+        call["status"] = CALL_FAILED
+    return call
+
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """Short, stable hash of an assistant configuration."""
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:12]
+
+
+class VapiRateLimitError(CallRateLimitError):
+    """Raised when Vapi answers 429 Too Many Requests."""
+
+
+class AssistantUnavailableError(Exception):
+    """Raised while assistant registration is backing off after a failure."""
+
+
+class VapiService(CallProvider):
     """
     Service for interacting with Vapi API.
     
     Vapi provides AI-powered voice calls that can speak
     custom messages to users.
+    
+    Call creation goes through a shared rate limiter
+    (VAPI_CALLS_PER_SECOND, VAPI_MAX_CONCURRENT_CALLS) that also backs
+    off when Vapi answers 429, and whose in-flight cap shrinks when Vapi
+    gets slow or fails.
+    
+    A circuit breaker opens when too many calls fail with network errors
+    or 5xx responses. While it is open, calls are deferred immediately
+    (CircuitOpenError) instead of waiting for timeouts.
+    
+    Outcomes arrive by webhook when VAPI_WEBHOOK_URL is set.
+    
+    All requests share one long-lived HTTP client, so connections (and
+    their TLS sessions) are reused across calls. The app and the worker
+    open it with start() and close it with close(); it is also created
+    on first use for standalone scripts.
+    
+    The assistant (model, prompt, voice) is registered with Vapi once and
+    referenced by ID; calls only send the reminder as an override. Its
+    name carries a hash of the configuration, so changing the settings
+    registers a new assistant instead of reusing a stale one.
     """
     
+    name = "vapi"
+    
     def __init__(self):
         self.api_key = settings.VAPI_API_KEY
         self.base_url = settings.VAPI_BASE_URL
@@ -28,13 +137,148 @@ class VapiService:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        self.rate_limiter = create_call_rate_limiter()
+        self.breaker = CircuitBreaker(
+            "vapi",
+            failure_rate=settings.VAPI_BREAKER_FAILURE_RATE,
+            min_calls=settings.VAPI_BREAKER_MIN_CALLS,
+            window=settings.VAPI_BREAKER_WINDOW,
+            open_seconds=settings.VAPI_BREAKER_OPEN_SECONDS,
+            half_open_calls=settings.VAPI_BREAKER_HALF_OPEN_CALLS
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self.assistant_config = build_assistant_config()
+        self.assistant_name = f"{ASSISTANT_NAME_PREFIX}-{config_hash(self.assistant_config)}"
+        self._assistant_id: Optional[str] = settings.VAPI_ASSISTANT_ID or None
+        self._assistant_lock = asyncio.Lock()
+        self._assistant_retry_at = 0.0
+    
+    @property
+    def is_configured(self) -> bool:
+        return bool(self.api_key and self.phone_number_id)
+    
+    @property
+    def awaits_outcome(self) -> bool:
+        return bool(settings.VAPI_WEBHOOK_URL)
+    
+    def _create_client(self) -> httpx.AsyncClient:
+        """Build the pooled client from settings."""
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            http2=settings.VAPI_HTTP2,
+            limits=httpx.Limits(
+                max_connections=settings.VAPI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.VAPI_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.VAPI_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(
+                settings.VAPI_READ_TIMEOUT,
+                connect=settings.VAPI_CONNECT_TIMEOUT,
+                pool=settings.VAPI_POOL_TIMEOUT
+            )
+        )
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP client, created on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+    
+    async def start(self):
+        """Open the shared HTTP client."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        logger.info(f"Vapi HTTP client ready (http2={settings.VAPI_HTTP2}, max_connections={settings.VAPI_MAX_CONNECTIONS})")
+    
+    async def close(self):
+        """Close the shared HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def get_assistant_id(self) -> str:
+        """
+        Get the ID of the reminder assistant, registering it if needed.
+        
+        An assistant already registered under the current configuration
+        name (e.g. by another node or a previous run) is reused. After a
+        failure, registration is not tried again for
+        ASSISTANT_RETRY_DELAY seconds, so calls waiting on the lock do
+        not each wait out the same timeout.
+        
+        Returns:
+            Vapi assistant ID
+        
+        Raises:
+            AssistantUnavailableError: If registration failed recently
+            httpx.HTTPError: If the assistant could not be looked up or created
+        """
+        if self._assistant_id:
+            return self._assistant_id
+        
+        async with self._assistant_lock:
+            if self._assistant_id:
+                return self._assistant_id
+            if time.monotonic() < self._assistant_retry_at:
+                raise AssistantUnavailableError("Assistant registration failed recently")
+            
+            try:
+                return await self._register_assistant()
+            except httpx.HTTPError:
+                self._assistant_retry_at = time.monotonic() + ASSISTANT_RETRY_DELAY
+                raise
+    
+    async def _register_assistant(self) -> str:
+        """Look the assistant up by name, or create it."""
+        response = await self.client.get("/assistant", params={"limit": 1000})
+        response.raise_for_status()
+        existing = next(
+            (assistant for assistant in response.json() if assistant.get("name") == self.assistant_name),
+            None
+        )
+        
+        if existing:
+            self._assistant_id = existing["id"]
+            logger.info(f"Using Vapi assistant {self.assistant_name} ({self._assistant_id})")
+        else:
+            response = await self.client.post(
+                "/assistant",
+                json={"name": self.assistant_name, **self.assistant_config}
+            )
+            response.raise_for_status()
+            self._assistant_id = response.json()["id"]
+            logger.info(f"Registered Vapi assistant {self.assistant_name} ({self._assistant_id})")
+        
+        return self._assistant_id
+    
+    async def _assistant_fields(self, first_message: str) -> Dict[str, Any]:
+        """
+        Assistant part of a call payload.
+        
+        References the registered assistant; falls back to sending the
+        full assistant inline if it cannot be registered right now.
+        """
+        try:
+            assistant_id = await self.get_assistant_id()
+        except (httpx.HTTPError, AssistantUnavailableError) as e:
+            if isinstance(e, httpx.HTTPError):
+                logger.warning(f"Could not register Vapi assistant, sending it inline for {ASSISTANT_RETRY_DELAY}s: {e}")
+            return {"assistant": {"firstMessage": first_message, **self.assistant_config}}
+        
+        return {
+            "assistantId": assistant_id,
+            "assistantOverrides": {"firstMessage": first_message}
+        }
     
     async def create_call(
         self, 
         phone_number: str, 
         message: str,
         reminder_id: str,
-        title: Optional[str] = None
+        title: Optional[str] = None,
+        idempotency_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Initiate a phone call using Vapi.
@@ -44,11 +288,16 @@ class VapiService:
             message: Message to be spoken
             reminder_id: ID for tracking purposes
             title: Optional reminder title for logging
-            
+            idempotency_key: Key of this call attempt, for find_call
+        
         Returns:
             Dictionary with call details including call_id and status
-            
+        
         Raises:
+            VapiRateLimitError: If Vapi rate limited the request
+            CircuitOpenError: If calls to Vapi are failing and on hold
+            CallOutcomeUnknownError: If the request was sent but its answer was lost
+            ProviderUnavailableError: If Vapi could not be reached or failed
             Exception: If API call fails
         """
         try:
@@ -60,26 +309,10 @@ class VapiService:
                 "customer": {
                     "number": phone_number
                 },
-                "assistant": {
-                    "firstMessage": full_message,
-                    "model": {
-                        "provider": "openai",
-                        "model": "gpt-3.5-turbo",
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a helpful reminder assistant. After delivering the reminder message, briefly confirm the user heard it and say goodbye. Keep the conversation short and friendly."
-                            }
-                        ]
-                    },
-                    "voice": {
-                        "provider": "11labs",
-                        "voiceId": "adam"
-                    }
-                },
                 "metadata": {
                     "reminder_id": reminder_id,
-                    "title": title or "Reminder"
+                    "title": title or "Reminder",
+                    "idempotency_key": idempotency_key
                 }
             }
             
@@ -92,25 +325,64 @@ class VapiService:
             
             logger.info(f"Initiating Vapi call for reminder {reminder_id} to {phone_number}")
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/call",
-                    json=payload,
-                    headers=self.headers,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                result = response.json()
-                
-                logger.info(f"Vapi call created successfully. Call ID: {result.get('id')}")
-                return result
-                
+            self.acquire_circuit()
+            
+            recorded = False
+            try:
+                async with self.rate_limiter.slot():
+                    # Registering the assistant is a Vapi request too: only once
+                    # the breaker and the limiter let this call through
+                    payload.update(await self._assistant_fields(full_message))
+                    
+                    started = time.monotonic()
+                    try:
+                        response = await self.client.post("/call", json=payload)
+                    except httpx.RequestError:
+                        self.record_call(started, None)
+                        recorded = True
+                        raise
+                    self.record_call(started, response.status_code)
+                    recorded = True
+                    
+                    if response.status_code == 429:
+                        retry_after = parse_retry_after(
+                            response.headers.get("Retry-After"),
+                            default=settings.VAPI_RETRY_AFTER_DEFAULT
+                        )
+                        await self.rate_limiter.on_rate_limited(retry_after)
+                        raise VapiRateLimitError(
+                            f"Vapi rate limit hit, retry after {retry_after:.0f}s",
+                            retry_after=retry_after
+                        )
+                    
+                    response.raise_for_status()
+                    result = response.json()
+                    
+                    logger.info(f"Vapi call created successfully. Call ID: {result.get('id')}")
+                    return result
+            finally:
+                if not recorded:
+                    # Never reached Vapi (e.g. cancelled while waiting for a slot)
+                    self.breaker.release()
+        
         except httpx.HTTPStatusError as e:
             logger.error(f"Vapi API error: {e.response.status_code} - {e.response.text}")
+            if (
+                e.response.status_code in (400, 404)
+                and "assistant" in e.response.text.lower()
+                and not settings.VAPI_ASSISTANT_ID
+            ):
+                # Registered assistant was deleted; register again on the next call
+                self._assistant_id = None
+            if e.response.status_code >= 500 or e.response.status_code in (401, 403):
+                raise ProviderUnavailableError(f"Failed to create call: {e.response.text}")
             raise Exception(f"Failed to create call: {e.response.text}")
+        except OUTCOME_UNKNOWN_ERRORS as e:
+            logger.error(f"Lost the answer to Vapi call creation for reminder {reminder_id}: {str(e)}")
+            raise CallOutcomeUnknownError(f"Call outcome unknown: {type(e).__name__} {str(e)}")
         except httpx.RequestError as e:
             logger.error(f"Network error calling Vapi: {str(e)}")
-            raise Exception(f"Network error: {str(e)}")
+            raise ProviderUnavailableError(f"Network error: {str(e)}")
         except Exception as e:
             logger.error(f"Unexpected error creating call: {str(e)}")
             raise
@@ -121,32 +393,90 @@ class VapiService:
         
         Args:
             call_id: ID of the call to check
-            
+        
         Returns:
             Dictionary with call status information
-            
+        
         Raises:
+            CallNotFoundError: If Vapi has no call with this ID
             Exception: If API call fails
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/call/{call_id}",
-                    headers=self.headers,
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                result = response.json()
-                
-                logger.debug(f"Call {call_id} status: {result.get('status')}")
-                return result
-                
+            response = await self.client.get(f"/call/{call_id}")
+            if response.status_code == 404:
+                raise CallNotFoundError(f"Vapi call {call_id} not found")
+            response.raise_for_status()
+            result = normalize_call(response.json())
+            
+            logger.debug(f"Call {call_id} status: {result.get('status')}")
+            return result
+        
         except httpx.HTTPStatusError as e:
             logger.error(f"Error fetching call status: {e.response.status_code}")
             raise Exception(f"Failed to get call status: {e.response.text}")
+        except CallNotFoundError:
+            raise
         except Exception as e:
             logger.error(f"Error getting call status: {str(e)}")
             raise
+    
+    async def find_call(
+        self,
+        idempotency_key: str,
+        phone_number: str,
+        since: datetime,
+        until: datetime
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find a call by the idempotency key sent in its metadata.
+        
+        GET /call lists calls newest first, so the window is read page
+        by page, moving its upper bound down to the oldest call seen.
+        
+        Args:
+            idempotency_key: Key of the call attempt
+            phone_number: Number that was called
+            since: Calls created before this are not searched
+            until: Calls created after this are not searched
+        
+        Returns:
+            Normalized call status, or None if no call carries the key
+        
+        Raises:
+            CallLookupInconclusiveError: If the window holds more than
+                FIND_CALL_MAX_PAGES pages of calls, or more than a page
+                created at the same instant
+        """
+        upper = until.isoformat()
+        seen = set()
+        for _ in range(FIND_CALL_MAX_PAGES):
+            response = await self.client.get(
+                "/call",
+                params={"createdAtGe": since.isoformat(), "createdAtLe": upper, "limit": FIND_CALL_PAGE_SIZE}
+            )
+            response.raise_for_status()
+            page = response.json()
+            
+            for call in page:
+                if (call.get("metadata") or {}).get("idempotency_key") == idempotency_key:
+                    return normalize_call(call)
+            
+            if len(page) < FIND_CALL_PAGE_SIZE:
+                # Short page: the window is exhausted
+                return None
+            
+            # createdAtLe is inclusive, so the calls at the oldest timestamp come back
+            # on the next page; a page of nothing but those cannot move the bound
+            if all(call.get("id") in seen for call in page):
+                raise CallLookupInconclusiveError(
+                    f"More than {FIND_CALL_PAGE_SIZE} Vapi calls created at {upper}"
+                )
+            seen.update(call.get("id") for call in page)
+            upper = min(call["createdAt"] for call in page)
+        
+        raise CallLookupInconclusiveError(
+            f"More than {FIND_CALL_MAX_PAGES * FIND_CALL_PAGE_SIZE} Vapi calls between {since.isoformat()} and {until.isoformat()}"
+        )
 
 
 # Singleton instance
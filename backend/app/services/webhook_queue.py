@@ -0,0 +1,502 @@
+"""
+Durable queue for call webhooks.
+
+Webhook endpoints only validate an event and append it to the
+webhook_events table, so they answer 202 without waiting on reminder
+lookups or row locks. Appends from concurrent requests are grouped into
+one multi-row INSERT. A consumer running next to the scheduler applies
+queued events to their reminders in batches.
+
+Providers redeliver events, and deliveries can arrive out of order.
+Events are keyed per call (see event_key): redeliveries are dropped at
+ingestion by an in-process LRU and at consumption by the
+processed_webhook_events table. Outcomes only move a reminder forward:
+settled reminders and events about an earlier call attempt are left
+alone.
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+import asyncio
+import logging
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.call_dispatch import CallDispatch
+from app.models.processed_webhook_event import ProcessedWebhookEvent
+from app.models.reminder import Reminder, ReminderStatus
+from app.models.webhook_event import WebhookEvent
+from app.services.metrics import RollingStats
+from app.services.reminder_notifications import notify_reminder_changed_async
+from app.utils.backoff import next_attempt_time
+
+logger = logging.getLogger(__name__)
+
+CALL_ENDED = "call.ended"
+CALL_FAILED = "call.failed"
+
+
+def event_key(provider: str, call_id: Optional[str]) -> Optional[str]:
+    """
+    Identity of a call outcome event across redeliveries.
+    
+    A call has a single outcome, so call.ended and call.failed for the
+    same call share a key: whichever is applied first wins and the
+    other is dropped as a duplicate.
+    
+    Returns:
+        The key, or None if the event carries no call ID
+    """
+    return f"{provider}:{call_id}:outcome" if call_id else None
+
+
+def apply_call_ended(reminder: Reminder, call_id: Optional[str]) -> bool:
+    """
+    Complete a reminder whose call went through.
+    
+    Returns:
+        Whether the reminder changed
+    """
+    if reminder.status != ReminderStatus.SCHEDULED:
+        return False
+    
+    reminder.status = ReminderStatus.COMPLETED
+    reminder.completed_at = datetime.now(timezone.utc)
+    reminder.vapi_call_id = call_id
+    reminder.next_attempt_at = None
+    reminder.status_check_at = None
+    reminder.version = (reminder.version or 0) + 1
+    logger.info(f"Reminder {reminder.id} marked as COMPLETED")
+    return True
+
+
+def apply_call_failed(reminder: Reminder, call_id: Optional[str], error_message: str) -> bool:
+    """
+    Retry a reminder whose call failed with backoff, or give up.
+    
+    The attempt was already counted when the scheduler claimed it. The
+    row version is bumped so buffered writes based on the earlier state
+    (e.g. the dispatcher's "placed" update) no longer apply.
+    
+    Returns:
+        Whether the reminder changed
+    """
+    if reminder.status != ReminderStatus.SCHEDULED:
+        return False
+    
+    attempts = reminder.call_attempts or 0
+    reminder.last_error = f"Call failed: {error_message}"
+    reminder.vapi_call_id = call_id or reminder.vapi_call_id
+    reminder.status_check_at = None
+    reminder.version = (reminder.version or 0) + 1
+    
+    # Check if max retries exceeded, otherwise schedule a retry with backoff
+    if attempts >= settings.SCHEDULER_MAX_RETRIES:
+        reminder.status = ReminderStatus.FAILED
+        reminder.next_attempt_at = None
+        logger.warning(f"Reminder {reminder.id} marked as FAILED after {attempts} attempts")
+    else:
+        reminder.next_attempt_at = next_attempt_time(attempts)
+        logger.info(f"Reminder {reminder.id} will be retried at {reminder.next_attempt_at.isoformat()}")
+    return True
+
+
+class WebhookEventQueue:
+    """
+    Appends webhook events to the queue table with group commit.
+    
+    Each append waits until its event is durable, but events arriving
+    within WEBHOOK_INGEST_FLUSH_INTERVAL seconds of each other (up to
+    WEBHOOK_INGEST_BATCH_SIZE) share one INSERT and one commit.
+    
+    Keys of the last WEBHOOK_DEDUP_CACHE_SIZE queued events are kept so
+    redeliveries to this node are answered without a write.
+    """
+    
+    def __init__(self, max_batch: int, flush_interval: float, cache_size: int):
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.cache_size = cache_size
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.flush_seconds = RollingStats(maxlen=200)
+        self.batch_sizes = RollingStats(maxlen=200)
+        self.appended = 0
+        self.duplicates = 0
+    
+    def seen(self, key: Optional[str]) -> bool:
+        """Whether this node already queued an event with this key."""
+        if key is None or key not in self._seen:
+            return False
+        self._seen.move_to_end(key)
+        self.duplicates += 1
+        return True
+    
+    def _remember(self, key: str):
+        self._seen[key] = None
+        self._seen.move_to_end(key)
+        while len(self._seen) > self.cache_size:
+            self._seen.popitem(last=False)
+    
+    async def append(self, event: Dict[str, Any]):
+        """
+        Queue an event durably.
+        
+        Args:
+            event: WebhookEvent column values
+        
+        Raises:
+            Exception: If the event could not be stored
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((event, future))
+        
+        if len(self._pending) >= self.max_batch:
+            self._spawn(self.flush())
+        elif self._timer is None:
+            self._timer = self._spawn(self._flush_later())
+        
+        await future
+    
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+    
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        self._timer = None
+        await self.flush()
+    
+    async def flush(self):
+        """Insert all pending events in one statement and resolve their appends."""
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        
+        started = asyncio.get_running_loop().time()
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(WebhookEvent), [event for event, _ in batch])
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Could not queue {len(batch)} webhook events: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        self.flush_seconds.add(asyncio.get_running_loop().time() - started)
+        self.batch_sizes.add(len(batch))
+        self.appended += len(batch)
+        for event, future in batch:
+            if event.get("event_key"):
+                self._remember(event["event_key"])
+            if not future.done():
+                future.set_result(None)
+    
+    async def close(self):
+        """Store events still waiting for their group commit."""
+        await self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get ingestion stats for the metrics endpoint."""
+        return {
+            "appended": self.appended,
+            "duplicates": self.duplicates,
+            "pending": len(self._pending),
+            "insert_seconds": self.flush_seconds.summary(),
+            "insert_batch_size": self.batch_sizes.summary(),
+        }
+
+
+class WebhookEventConsumer:
+    """
+    Applies queued webhook events to reminders in batches.
+    
+    Each batch is claimed with FOR UPDATE SKIP LOCKED (so several
+    workers can consume in parallel), its reminders are loaded and
+    locked in one query, events are applied in arrival order, and the
+    events are deleted in the same transaction as the reminder updates.
+    
+    Before any reminder is touched, the batch's keys are recorded in
+    processed_webhook_events; events whose key is already there are
+    redeliveries and are dropped. Events without a reminder ID are
+    matched to their reminder by call ID.
+    
+    If a batch fails, its events are retried one by one; an event that
+    fails WEBHOOK_MAX_ATTEMPTS times is set aside with failed_at.
+    """
+    
+    def __init__(self, batch_size: int, interval: float, max_attempts: int):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_attempts = max_attempts
+        self._task: Optional[asyncio.Task] = None
+        self.applied = 0
+        self.ignored = 0
+        self.duplicates = 0
+        self.stale = 0
+        self.failed = 0
+        self.batch_seconds = RollingStats(maxlen=200)
+        self.lag_seconds = RollingStats(maxlen=1000)
+    
+    def start(self):
+        """Start consuming in the background."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self):
+        """Stop consuming; unapplied events stay queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self):
+        while True:
+            try:
+                consumed = await self.consume_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error consuming webhook events: {e}")
+                consumed = 0
+            
+            if consumed < self.batch_size:
+                await asyncio.sleep(self.interval)
+    
+    def _claim(self, limit: int):
+        return (
+            select(WebhookEvent)
+            .where(WebhookEvent.failed_at.is_(None))
+            .order_by(WebhookEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+    
+    async def consume_batch(self) -> int:
+        """
+        Apply the next batch of events.
+        
+        Returns:
+            Number of events claimed
+        """
+        started = asyncio.get_running_loop().time()
+        
+        try:
+            async with AsyncSessionLocal() as db:
+                events = (await db.execute(self._claim(self.batch_size))).scalars().all()
+                if not events:
+                    return 0
+                
+                await self.apply(db, events)
+                await db.execute(delete(WebhookEvent).where(WebhookEvent.id.in_([event.id for event in events])))
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Webhook event batch failed, retrying events one by one: {e}")
+            return await self.consume_one_by_one()
+        
+        self.batch_seconds.add(asyncio.get_running_loop().time() - started)
+        self.record_lag(events)
+        return len(events)
+    
+    async def consume_one_by_one(self) -> int:
+        """Apply events in separate transactions so one bad event cannot block the rest."""
+        consumed = 0
+        
+        for _ in range(self.batch_size):
+            async with AsyncSessionLocal() as db:
+                event = (await db.execute(self._claim(1))).scalar_one_or_none()
+                if event is None:
+                    break
+                event_id, attempts = event.id, event.attempts
+                
+                try:
+                    await self.apply(db, [event])
+                    await db.delete(event)
+                    await db.commit()
+                    self.record_lag([event])
+                except Exception as e:
+                    await db.rollback()
+                    attempts += 1
+                    give_up = attempts >= self.max_attempts
+                    await db.execute(
+                        update(WebhookEvent)
+                        .where(WebhookEvent.id == event_id)
+                        .values(
+                            attempts=attempts,
+                            last_error=str(e),
+                            failed_at=func.now() if give_up else None
+                        )
+                    )
+                    await db.commit()
+                    if give_up:
+                        self.failed += 1
+                        logger.error(f"Giving up on webhook event {event_id} after {attempts} attempts: {e}")
+                    else:
+                        # Leave it for a later round rather than spin on it now
+                        break
+            consumed += 1
+        
+        return consumed
+    
+    async def record_processed(self, db: AsyncSession, events: List[WebhookEvent]) -> List[WebhookEvent]:
+        """
+        Record the events' keys as processed, in the caller's transaction.
+        
+        Returns:
+            The events seen for the first time, in arrival order
+        """
+        first: Dict[str, WebhookEvent] = {}
+        fresh = []
+        for event in events:
+            if event.event_key is None:
+                fresh.append(event)
+            elif event.event_key not in first:
+                first[event.event_key] = event
+        
+        if first:
+            result = await db.execute(
+                pg_insert(ProcessedWebhookEvent)
+                .values([
+                    {"event_key": key, "event_type": event.event_type, "call_id": event.call_id}
+                    for key, event in first.items()
+                ])
+                .on_conflict_do_nothing()
+                .returning(ProcessedWebhookEvent.event_key)
+            )
+            recorded = set(result.scalars().all())
+            fresh.extend(event for key, event in first.items() if key in recorded)
+        
+        self.duplicates += len(events) - len(fresh)
+        return sorted(fresh, key=lambda event: event.id)
+    
+    async def resolve_reminders(self, db: AsyncSession, events: List[WebhookEvent]) -> Dict[int, UUID]:
+        """Map event IDs to reminder IDs, looking up events without one by call ID."""
+        call_ids = {event.call_id for event in events if event.reminder_id is None and event.call_id}
+        by_call: Dict[str, UUID] = {}
+        if call_ids:
+            result = await db.execute(
+                select(Reminder.vapi_call_id, Reminder.id).where(Reminder.vapi_call_id.in_(call_ids))
+            )
+            by_call = {row.vapi_call_id: row.id for row in result}
+        
+        return {
+            event.id: event.reminder_id or by_call.get(event.call_id)
+            for event in events
+            if event.reminder_id or event.call_id in by_call
+        }
+    
+    async def call_attempts(self, db: AsyncSession, events: List[WebhookEvent]) -> Dict[str, int]:
+        """Attempt number of each event's call, where the dispatch is still recorded."""
+        call_ids = {event.call_id for event in events if event.call_id}
+        if not call_ids:
+            return {}
+        result = await db.execute(
+            select(CallDispatch.call_id, CallDispatch.attempt).where(CallDispatch.call_id.in_(call_ids))
+        )
+        return {row.call_id: row.attempt for row in result}
+    
+    @staticmethod
+    def is_current(reminder: Reminder, event: WebhookEvent, attempts: Dict[str, int]) -> bool:
+        """
+        Whether an event is about the reminder's latest call.
+        
+        The call's dispatch record decides; the reminder's call ID may
+        still lag behind a just-placed call. Without a record, the call
+        ID must match.
+        """
+        if not event.call_id:
+            return True
+        if event.call_id in attempts:
+            return attempts[event.call_id] >= (reminder.call_attempts or 0)
+        return not reminder.vapi_call_id or reminder.vapi_call_id == event.call_id
+    
+    async def apply(self, db: AsyncSession, events: List[WebhookEvent]):
+        """Apply events to their reminders in arrival order (no commit)."""
+        events = await self.record_processed(db, events)
+        if not events:
+            return
+        
+        reminder_ids = await self.resolve_reminders(db, events)
+        attempts = await self.call_attempts(db, events)
+        result = await db.execute(
+            select(Reminder)
+            .where(Reminder.id.in_(set(reminder_ids.values())))
+            .order_by(Reminder.id)  # Same lock order in every consumer
+            .with_for_update()
+        )
+        reminders = {reminder.id: reminder for reminder in result.scalars()}
+        rescheduled: Set[Reminder] = set()
+        
+        for event in events:
+            reminder = reminders.get(reminder_ids.get(event.id))
+            if reminder is None:
+                logger.warning(f"No reminder found for webhook event {event.id} (call {event.call_id})")
+                self.ignored += 1
+                continue
+            
+            # Outcomes only move forward: settled reminders and earlier calls stay as they are
+            if reminder.status != ReminderStatus.SCHEDULED or not self.is_current(reminder, event, attempts):
+                logger.info(f"Dropping stale {event.event_type} for reminder {reminder.id} (call {event.call_id})")
+                self.stale += 1
+                continue
+            
+            if event.event_type == CALL_ENDED:
+                apply_call_ended(reminder, event.call_id)
+            elif event.event_type == CALL_FAILED:
+                apply_call_failed(reminder, event.call_id, event.error_message or "Unknown error")
+                rescheduled.add(reminder)
+            self.applied += 1
+        
+        for reminder in rescheduled:
+            await notify_reminder_changed_async(db, reminder)
+    
+    async def purge(self, db: AsyncSession, before: datetime) -> int:
+        """Forget processed event keys recorded before ``before``."""
+        result = await db.execute(
+            delete(ProcessedWebhookEvent).where(ProcessedWebhookEvent.processed_at < before)
+        )
+        return result.rowcount
+    
+    def record_lag(self, events: List[WebhookEvent]):
+        now = datetime.now(timezone.utc)
+        for event in events:
+            self.lag_seconds.add((now - event.received_at).total_seconds())
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get consumer stats for the metrics endpoint."""
+        return {
+            "applied": self.applied,
+            "ignored": self.ignored,
+            "duplicates": self.duplicates,
+            "stale": self.stale,
+            "failed": self.failed,
+            "batch_seconds": self.batch_seconds.summary(),
+            "lag_seconds": self.lag_seconds.summary(),
+        }
+
+
+# Singleton instance
+webhook_queue = WebhookEventQueue(
+    max_batch=settings.WEBHOOK_INGEST_BATCH_SIZE,
+    flush_interval=settings.WEBHOOK_INGEST_FLUSH_INTERVAL,
+    cache_size=settings.WEBHOOK_DEDUP_CACHE_SIZE
+)
@@ -0,0 +1,48 @@
+"""
+Retry backoff helpers.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import random
+
+from app.core.config import settings
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Exponential backoff with jitter.
+    
+    Half of the delay is fixed and half is random ("equal jitter"), so
+    retries never fire immediately but still spread out instead of
+    arriving in lockstep.
+    
+    Args:
+        attempt: Number of attempts made so far (1 for the first retry)
+        base: Delay in seconds after the first attempt
+        cap: Maximum delay in seconds
+    
+    Returns:
+        Delay in seconds
+    """
+    delay = min(cap, base * 2 ** max(attempt - 1, 0))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def next_attempt_time(attempt: int, now: Optional[datetime] = None) -> datetime:
+    """
+    Get when the next call attempt is due after a failed one.
+    
+    Uses SCHEDULER_RETRY_BASE_DELAY and SCHEDULER_RETRY_MAX_DELAY.
+    
+    Args:
+        attempt: Number of attempts made so far
+        now: Reference time (defaults to the current UTC time)
+    """
+    now = now or datetime.now(timezone.utc)
+    delay = backoff_delay(
+        attempt,
+        base=settings.SCHEDULER_RETRY_BASE_DELAY,
+        cap=settings.SCHEDULER_RETRY_MAX_DELAY
+    )
+    return now + timedelta(seconds=delay)
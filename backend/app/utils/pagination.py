@@ -0,0 +1,45 @@
+"""
+Keyset pagination helpers.
+
+A cursor points just past the last row of a page by its sort key,
+(scheduled_datetime, id), so the next page is read straight from the
+index instead of skipping every earlier row with OFFSET.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+import base64
+import binascii
+
+import orjson
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Position in a reminder listing."""
+    
+    sort: str
+    scheduled_datetime: datetime
+    id: UUID
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """Encode a cursor as an opaque, URL-safe string."""
+    data = orjson.dumps([cursor.sort, cursor.scheduled_datetime.isoformat(), str(cursor.id)])
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(value: str) -> Cursor:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        data = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+        sort, scheduled_datetime, reminder_id = orjson.loads(data)
+        return Cursor(sort, datetime.fromisoformat(scheduled_datetime), UUID(reminder_id))
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
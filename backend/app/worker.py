@@ -0,0 +1,140 @@
+"""
+Standalone reminder dispatch worker.
+
+Runs only the reminder scheduler, outside the API process:
+    
+    python -m app.worker
+
+Set SCHEDULER_IN_PROCESS=False on the API so its workers don't start
+schedulers of their own. With WORKER_SINGLETON enabled, only the worker
+holding a Postgres advisory lock dispatches; the others wait on standby
+and take over if the leader goes away.
+"""
+
+import asyncio
+import logging
+import signal
+
+import asyncpg
+
+from app.core.config import settings
+from app.core.database import async_engine, asyncpg_dsn
+from app.services.scheduler import reminder_scheduler
+from app.services.call_router import call_router
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderLock:
+    """
+    Session-level Postgres advisory lock held on a dedicated connection.
+    
+    The lock is released by Postgres as soon as the connection drops,
+    so a crashed leader never blocks a standby for longer than it takes
+    the server to notice.
+    """
+    
+    def __init__(self, key: int):
+        self.key = key
+        self._connection = None
+    
+    async def try_acquire(self) -> bool:
+        """Try to take the lock without waiting."""
+        if self._connection is None or self._connection.is_closed():
+            self._connection = await asyncpg.connect(asyncpg_dsn(settings.DATABASE_URL))
+        
+        acquired = await self._connection.fetchval("SELECT pg_try_advisory_lock($1)", self.key)
+        if not acquired:
+            await self.release()
+        return acquired
+    
+    async def is_held(self) -> bool:
+        """Check that the lock connection is still alive."""
+        if self._connection is None or self._connection.is_closed():
+            return False
+        try:
+            await self._connection.fetchval("SELECT 1", timeout=10)
+            return True
+        except Exception as e:
+            logger.error(f"Leader lock connection lost: {e}")
+            return False
+    
+    async def release(self):
+        """Release the lock by closing its connection."""
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+
+async def run_worker(stop: asyncio.Event):
+    """
+    Run the scheduler until ``stop`` is set.
+    
+    Args:
+        stop: Event set on SIGINT/SIGTERM
+    """
+    lock = LeaderLock(settings.WORKER_LOCK_KEY) if settings.WORKER_SINGLETON else None
+    interval = settings.WORKER_LEADER_CHECK_INTERVAL
+    running = False
+    await call_router.start()
+    
+    try:
+        while not stop.is_set():
+            if lock is None:
+                leader = True
+            elif running:
+                leader = await lock.is_held()
+            else:
+                try:
+                    leader = await lock.try_acquire()
+                except Exception as e:
+                    logger.error(f"Could not acquire leader lock: {e}")
+                    leader = False
+            
+            if leader and not running:
+                logger.info("Acquired leadership, starting reminder scheduler")
+                reminder_scheduler.start()
+                running = True
+            elif not leader and running:
+                logger.warning("Lost leadership, stopping reminder scheduler")
+                await reminder_scheduler.shutdown()
+                await lock.release()
+                running = False
+            elif not leader:
+                logger.info("Standing by; another worker holds the leader lock")
+            
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        if running:
+            await reminder_scheduler.shutdown()
+        if lock is not None:
+            await lock.release()
+        await call_router.close()
+        await async_engine.dispose()
+
+
+def main():
+    """Entry point for ``python -m app.worker``."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s [%(name)s] %(message)s"
+    )
+    
+    async def _main():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        
+        logger.info(f"Starting reminder worker (node {reminder_scheduler.node_id})")
+        await run_worker(stop)
+        logger.info("Reminder worker stopped")
+    
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
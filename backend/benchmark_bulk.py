@@ -0,0 +1,113 @@
+"""
+Benchmark reminder ingest: one POST per reminder against bulk create.
+
+Creates the same reminders through the in-process API app twice:
+- single: POST /api/v1/reminders/ per reminder (one INSERT and commit each)
+- bulk: POST /api/v1/reminders/bulk/create in batches (one validation
+  pass and multi-row INSERT ... RETURNING per batch)
+
+Then times bulk update and bulk delete of the bulk-created reminders.
+
+Needs a database migrated to head. Created reminders are deleted
+afterwards.
+
+Usage:
+    python benchmark_bulk.py [--reminders 5000] [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import httpx
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.main import app
+
+TITLE_PREFIX = "bulk-benchmark"
+
+
+def build_items(total: int, label: str):
+    """Reminder payloads spread over the next days."""
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    return [
+        {
+            "title": f"{TITLE_PREFIX} {label} {i}",
+            "message": "Pick up the prescription at the pharmacy before it closes at 6pm.",
+            "phone_number": "+15555550100",
+            "scheduled_datetime": (start + timedelta(minutes=i)).isoformat(),
+            "timezone": "America/New_York",
+        }
+        for i in range(total)
+    ]
+
+
+def cleanup():
+    """Delete every reminder the benchmark created."""
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM reminders WHERE title LIKE :prefix"), {"prefix": f"{TITLE_PREFIX} %"})
+    print("🧹 Benchmark reminders deleted")
+
+
+def report(name: str, total: int, elapsed: float, baseline: float = None):
+    line = f"   {name + ':':<13} {total / elapsed:>9,.0f} reminders/s ({elapsed:.2f}s)"
+    if baseline:
+        line += f", {baseline / elapsed:.1f}x single"
+    print(line)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reminders", type=int, default=5000, help="reminders created per variant")
+    parser.add_argument("--batch-size", type=int, default=1000, help="items per bulk request")
+    args = parser.parse_args()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        try:
+            print(f"🔍 Creating {args.reminders:,} reminders per variant (bulk batches of {args.batch_size:,})")
+
+            started = time.perf_counter()
+            for item in build_items(args.reminders, "single"):
+                (await client.post("/api/v1/reminders/", json=item)).raise_for_status()
+            single = time.perf_counter() - started
+            report("Single POST", args.reminders, single)
+
+            items = build_items(args.reminders, "bulk")
+            ids = []
+            started = time.perf_counter()
+            for start in range(0, len(items), args.batch_size):
+                response = await client.post("/api/v1/reminders/bulk/create", json=items[start:start + args.batch_size])
+                response.raise_for_status()
+                body = response.json()
+                assert body["failed"] == 0, body["results"][:5]
+                ids.extend(result["id"] for result in body["results"])
+            report("Bulk create", args.reminders, time.perf_counter() - started, single)
+
+            changes = [{"id": reminder_id, "message": "Updated in bulk"} for reminder_id in ids]
+            started = time.perf_counter()
+            for start in range(0, len(changes), args.batch_size):
+                response = await client.post("/api/v1/reminders/bulk/update", json=changes[start:start + args.batch_size])
+                response.raise_for_status()
+                assert response.json()["failed"] == 0
+            report("Bulk update", len(changes), time.perf_counter() - started)
+
+            started = time.perf_counter()
+            for start in range(0, len(ids), args.batch_size):
+                response = await client.post("/api/v1/reminders/bulk/delete", json={"ids": ids[start:start + args.batch_size]})
+                response.raise_for_status()
+                assert response.json()["failed"] == 0
+            report("Bulk delete", len(ids), time.perf_counter() - started)
+        finally:
+            cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
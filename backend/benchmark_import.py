@@ -0,0 +1,157 @@
+"""
+Benchmark the streaming reminder import at 1M rows.
+
+Writes a CSV or NDJSON file of reminders (1M rows by default, a share of
+them invalid) and imports it with the import pipeline
+(app.services.reminder_import: incremental validation, COPY into a
+staging table, merge), reporting rows/s and the process's peak memory.
+For comparison, a sample of the same rows is then created through the
+bulk create path (app.services.reminder_bulk: multi-row INSERT in 1000
+row chunks), the fastest way in through the API before imports.
+
+Needs a database migrated to head. Imported reminders, the import record
+and its error report are deleted afterwards unless --keep is given.
+
+Usage:
+    python benchmark_import.py [--rows 1000000] [--format csv|ndjson] [--invalid-rate 0.01] [--bulk-sample 50000] [--keep]
+"""
+
+import argparse
+import csv
+import resource
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import orjson
+from sqlalchemy import text
+
+from app.core.database import engine, SessionLocal
+from app.services.reminder_bulk import bulk_create
+from app.services.reminder_import import COLUMNS, reminder_importer
+
+TITLE_PREFIX = "import-benchmark"
+
+
+def generate_rows(rows: int, invalid_rate: float):
+    """Reminder rows spread over the next weeks; every 1/invalid_rate-th row is invalid."""
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    invalid_every = int(1 / invalid_rate) if invalid_rate else 0
+    for i in range(rows):
+        row = {
+            "title": f"{TITLE_PREFIX} {i}",
+            "message": "Your appointment is tomorrow. Reply to this call if you need to reschedule.",
+            "phone_number": f"+1555{i % 10_000_000:07d}",
+            "scheduled_datetime": (start + timedelta(seconds=i)).isoformat(),
+            "timezone": "America/New_York",
+        }
+        if invalid_every and i % invalid_every == invalid_every - 1:
+            row["phone_number"] = "not-a-number"
+        yield row
+
+
+def write_file(path: Path, format: str, rows: int, invalid_rate: float):
+    """Write the benchmark file."""
+    print(f"🔍 Writing {rows:,} rows to {path}...")
+    started = time.perf_counter()
+    if format == "ndjson":
+        with open(path, "wb") as f:
+            for row in generate_rows(rows, invalid_rate):
+                f.write(orjson.dumps(row) + b"\n")
+    else:
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(generate_rows(rows, invalid_rate))
+    print(f"✅ Written in {time.perf_counter() - started:.1f}s ({path.stat().st_size / 1_048_576:,.0f} MiB)")
+
+
+def peak_memory_mib() -> float:
+    """Peak resident memory of this process (ru_maxrss is KiB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def benchmark_import(path: Path, format: str):
+    """Import the file and print throughput and memory."""
+    memory_before = peak_memory_mib()
+    job = reminder_importer.create(uuid.uuid4(), path.name, format, path.stat().st_size)
+    started = time.perf_counter()
+    last_report = [started]
+
+    def progress(job):
+        now = time.perf_counter()
+        if now - last_report[0] >= 5:
+            last_report[0] = now
+            print(f"   {job.bytes_read / job.bytes_total:6.1%}  {job.rows_read:>10,} rows  {job.rows_read / (now - started):>8,.0f} rows/s")
+
+    job = reminder_importer.run(job.id, path, progress=progress)
+    elapsed = time.perf_counter() - started
+
+    print(f"\nImport ({format}, batches of {reminder_importer.batch_size:,})")
+    print(f"   Status:             {job.status}{f' ({job.error})' if job.error else ''}")
+    print(f"   Rows:               {job.rows_read:,} read, {job.rows_imported:,} imported, {job.rows_rejected:,} rejected")
+    print(f"   Throughput:         {job.rows_read / elapsed:,.0f} rows/s ({elapsed:.1f}s)")
+    print(f"   Peak memory:        {peak_memory_mib():,.0f} MiB (was {memory_before:,.0f} MiB before the import)")
+    return job, job.rows_read / elapsed
+
+
+def benchmark_bulk(rows: int):
+    """Create a sample of rows through the bulk create path."""
+    items = list(generate_rows(rows, 0))
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        for start in range(0, len(items), 1000):
+            bulk_create(db, items[start:start + 1000])
+            db.commit()
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+
+    print("\nBulk create (multi-row INSERT, batches of 1,000)")
+    print(f"   Throughput:         {rows / elapsed:,.0f} rows/s ({elapsed:.1f}s for {rows:,} rows)")
+    return rows / elapsed
+
+
+def cleanup(job):
+    """Delete the benchmark's reminders, import record and error report."""
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM reminders WHERE title LIKE :prefix"), {"prefix": f"{TITLE_PREFIX} %"})
+        connection.execute(text("DELETE FROM reminder_imports WHERE id = :id"), {"id": job.id})
+    if job.error_report:
+        Path(job.error_report).unlink(missing_ok=True)
+    print("🧹 Benchmark reminders deleted")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows in the imported file")
+    parser.add_argument("--format", choices=("csv", "ndjson"), default="csv")
+    parser.add_argument("--invalid-rate", type=float, default=0.01, help="share of invalid rows")
+    parser.add_argument("--bulk-sample", type=int, default=50_000, help="rows created through bulk create (0 to skip)")
+    parser.add_argument("--keep", action="store_true", help="keep the imported reminders")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / f"reminders.{args.format}"
+        write_file(path, args.format, args.rows, args.invalid_rate)
+
+        job = None
+        try:
+            job, import_rate = benchmark_import(path, args.format)
+            if args.bulk_sample:
+                bulk_rate = benchmark_bulk(args.bulk_sample)
+                print(f"\nImport is {import_rate / bulk_rate:.1f}x bulk create")
+        finally:
+            if job is not None and not args.keep:
+                cleanup(job)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Benchmark JSON encoding of API responses and decoding of webhook bodies.
+
+Serves a 100-item /api/v1/reminders page from in-process apps:
+- before: the model returned through response_model and encoded by
+  FastAPI's JSONResponse (json.dumps)
+- orjson default: the same path with ORJSONResponse as the default
+  response class (app.main)
+- after: the list endpoint's path, encoding model_dump() directly with
+  ORJSONResponse (app.api.v1.reminders)
+
+All variants validate the page into ReminderListResponse. The page is
+built from in-memory Reminder objects, so no database is needed.
+
+It also times parsing a Vapi webhook body with json.loads (what
+``await request.json()`` does) against orjson.loads.
+
+Usage:
+    python benchmark_json.py [--requests 2000] [--page-size 100]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import httpx
+import orjson
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.models.reminder import Reminder, ReminderStatus
+from app.schemas.reminder import ReminderListResponse
+from app.services.metrics import RollingStats
+
+
+def build_page(page_size: int):
+    """Reminders shaped like a real list page."""
+    now = datetime.now(timezone.utc)
+    return [
+        Reminder(
+            id=uuid.uuid4(),
+            title=f"Benchmark reminder {i}",
+            message="Pick up the prescription at the pharmacy before it closes at 6pm. " * 3,
+            phone_number="+15555550100",
+            scheduled_datetime=now + timedelta(hours=i),
+            timezone="America/New_York",
+            status=ReminderStatus.COMPLETED if i % 3 else ReminderStatus.SCHEDULED,
+            call_attempts=i % 3,
+            last_error=None if i % 5 else "Call failed: no-answer",
+            created_at=now,
+            updated_at=now,
+            completed_at=now if i % 3 else None,
+        )
+        for i in range(page_size)
+    ]
+
+
+def build_app(response_class, reminders, direct: bool) -> FastAPI:
+    """App serving the list page with the given default response class."""
+    app = FastAPI(default_response_class=response_class)
+
+    @app.get("/api/v1/reminders/", response_model=ReminderListResponse)
+    def list_reminders():
+        response = ReminderListResponse(
+            reminders=reminders,
+            total=len(reminders) * 10,
+            page=1,
+            page_size=len(reminders)
+        )
+        if direct:
+            return ORJSONResponse(response.model_dump())
+        return response
+
+    return app
+
+
+async def benchmark_responses(name: str, response_class, reminders, total: int, direct: bool = False):
+    """Fetch the page ``total`` times and print latency and throughput."""
+    transport = httpx.ASGITransport(app=build_app(response_class, reminders, direct))
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        # Warm up
+        for _ in range(min(total, 50)):
+            (await client.get("/api/v1/reminders/")).raise_for_status()
+
+        latencies = RollingStats(maxlen=total)
+        started = time.perf_counter()
+        for _ in range(total):
+            request_started = time.perf_counter()
+            response = await client.get("/api/v1/reminders/")
+            response.raise_for_status()
+            latencies.add(time.perf_counter() - request_started)
+        elapsed = time.perf_counter() - started
+
+    latency = latencies.summary()
+    print(f"\n{name}")
+    print(f"   Throughput:         {total / elapsed:,.0f} pages/s ({elapsed:.2f}s)")
+    print(f"   Request latency ms: p50 {latency['p50'] * 1000:.2f} / p95 {latency['p95'] * 1000:.2f} / p99 {latency['p99'] * 1000:.2f}")
+    print(f"   Page size:          {len(response.content):,} bytes")
+
+
+def time_encoding(content, total: int):
+    """Time only the final encoding step of both response classes on the same content."""
+    for name, response_class in (("JSONResponse", JSONResponse), ("ORJSONResponse", ORJSONResponse)):
+        encode = response_class(content=None).render
+        started = time.perf_counter()
+        for _ in range(total):
+            encode(content)
+        elapsed = time.perf_counter() - started
+        print(f"   {name + ':':<19} {elapsed / total * 1_000_000:,.1f} µs per page")
+
+
+def time_webhook_parsing(total: int):
+    """Time decoding a call.ended webhook body with json and orjson."""
+    body = json.dumps({
+        "type": "call.ended",
+        "call": {
+            "id": str(uuid.uuid4()),
+            "status": "ended",
+            "endedReason": "customer-ended-call",
+            "metadata": {"reminder_id": str(uuid.uuid4()), "idempotency_key": f"{uuid.uuid4()}:1"},
+            "transcript": "Hello! This is your reminder: pick up the prescription. " * 20,
+            "messages": [{"role": "bot", "message": "Hello!", "time": i} for i in range(30)],
+        },
+    }).encode()
+
+    for name, loads in (("json.loads", json.loads), ("orjson.loads", orjson.loads)):
+        started = time.perf_counter()
+        for _ in range(total):
+            loads(body)
+        elapsed = time.perf_counter() - started
+        print(f"   {name + ':':<19} {elapsed / total * 1_000_000:,.1f} µs per webhook ({len(body):,} bytes)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="page fetches per variant")
+    parser.add_argument("--page-size", type=int, default=100, help="reminders per page")
+    args = parser.parse_args()
+
+    reminders = build_page(args.page_size)
+    print(f"🔍 {args.requests} fetches of a {args.page_size}-item reminders page per variant")
+
+    await benchmark_responses("Before: JSONResponse (json.dumps)", JSONResponse, reminders, args.requests)
+    await benchmark_responses("orjson default: ORJSONResponse via response_model", ORJSONResponse, reminders, args.requests)
+    await benchmark_responses("After: ORJSONResponse(model_dump())", ORJSONResponse, reminders, args.requests, direct=True)
+
+    content = ReminderListResponse(
+        reminders=reminders,
+        total=len(reminders),
+        page=1,
+        page_size=len(reminders)
+    ).model_dump(mode="json")
+    print("\nEncoding only")
+    time_encoding(content, args.requests)
+
+    print("\nWebhook body parsing")
+    time_webhook_parsing(args.requests * 10)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+"""
+Benchmark that verifies reminder search uses its indexes at scale.
+
+Seeds a large number of reminders (1M by default) directly in SQL,
+then runs EXPLAIN ANALYZE on the same search queries the list endpoint
+builds (app.services.reminder_search) and checks that the plans use the
+full-text and trigram indexes instead of a sequential scan.
+
+Needs a database migrated to head (pg_trgm available). Seeded rows are
+deleted afterwards unless --keep is given.
+
+Usage:
+    python benchmark_search_plans.py [--rows 1000000] [--keep]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import desc, text
+from sqlalchemy.dialects import postgresql
+
+from app.core.database import engine, SessionLocal
+from app.models.reminder import Reminder
+from app.services.reminder_search import search_filter, search_rank
+
+SEED_TITLE_PREFIX = "search-seed"
+
+SEARCH_INDEXES = ("ix_reminders_search_vector", "ix_reminders_title_trgm", "ix_reminders_message_trgm")
+
+# (search term, what it exercises)
+CASES = [
+    ("dentist", "word"),
+    ("pick up prescription", "several words, stemmed"),
+    ('"call mom"', "phrase"),
+    ("pharm", "substring"),
+    ("dentsit", "typo"),
+]
+
+
+def seed(rows: int):
+    """Insert reminders with varied titles and messages."""
+    print(f"🔍 Seeding {rows:,} reminders...")
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        connection.execute(text("""
+            INSERT INTO reminders (id, title, message, phone_number, scheduled_datetime, timezone, status, call_attempts)
+            SELECT
+                gen_random_uuid(),
+                :prefix || ' ' || (ARRAY['Dentist appointment', 'Call mom', 'Team standup', 'Pay rent',
+                    'Pick up prescription', 'Gym session', 'Water the plants', 'Renew passport'])[1 + i % 8]
+                    || ' #' || i,
+                (ARRAY['Bring the insurance card', 'Ask about the weekend plans', 'Prepare the sprint notes',
+                    'Transfer before the 5th', 'Pharmacy closes at 6pm', 'Leg day, do not skip',
+                    'Only the ones on the balcony', 'Check the photo requirements'])[1 + (i / 8) % 8]
+                    || ' ' || md5(i::text),
+                '+15555550100',
+                now() + (i || ' minutes')::interval,
+                'UTC',
+                'COMPLETED',
+                0
+            FROM generate_series(1, :rows) AS i
+        """), {"prefix": SEED_TITLE_PREFIX, "rows": rows})
+        connection.execute(text("ANALYZE reminders"))
+    print(f"✅ Seeded in {time.perf_counter() - started:.1f}s")
+
+
+def cleanup():
+    """Delete the seeded reminders."""
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM reminders WHERE title LIKE :prefix"), {"prefix": f"{SEED_TITLE_PREFIX} %"})
+        connection.execute(text("ANALYZE reminders"))
+    print("🧹 Seeded reminders deleted")
+
+
+def explain(term: str) -> str:
+    """EXPLAIN ANALYZE the listing's search query for one term."""
+    db = SessionLocal()
+    try:
+        query = (
+            db.query(Reminder)
+            .filter(search_filter(term))
+            .order_by(desc(search_rank(term)), desc(Reminder.scheduled_datetime), desc(Reminder.id))
+            .limit(50)
+        )
+        compiled = query.statement.compile(dialect=postgresql.dialect())
+        cursor = db.connection().connection.cursor()
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {compiled}", compiled.params)
+        return "\n".join(row[0] for row in cursor.fetchall())
+    finally:
+        db.close()
+
+
+def check_search_plans() -> bool:
+    """Check every search case is served by the search indexes."""
+    ok = True
+    for term, kind in CASES:
+        plan = explain(term)
+        used = [index for index in SEARCH_INDEXES if index in plan]
+        seq_scan = "Seq Scan on reminders" in plan
+        execution = next((line.strip() for line in plan.splitlines() if "Execution Time" in line), "")
+
+        print(f"\n🔍 search={term!r} ({kind})")
+        print("   " + plan.replace("\n", "\n   "))
+        if used and not seq_scan:
+            print(f"✅ Uses {', '.join(used)}; {execution}")
+        else:
+            print(f"❌ Not served by the search indexes; {execution}")
+            ok = False
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="reminders to seed")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded reminders")
+    args = parser.parse_args()
+
+    seed(args.rows)
+    try:
+        ok = check_search_plans()
+    finally:
+        if not args.keep:
+            cleanup()
+
+    print("\n" + ("✅ All search queries use the indexes" if ok else "❌ Some search queries scan the table"))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Benchmark per-call HTTP overhead of VapiService.
+
+Compares a fresh httpx.AsyncClient per request (the previous behavior)
+with the service's shared pooled client, against a local stub server
+that answers like the Vapi API after a fixed delay. Per-call overhead
+is the request latency minus that delay; the stub also counts how many
+TCP connections each variant opened.
+
+The stub speaks plain HTTP/1.1, so this measures connection setup and
+pool reuse; against the real API the fresh-client variant additionally
+pays a TLS handshake per call.
+
+Usage:
+    python benchmark_vapi_client.py [--concurrency 1 100 1000] [--delay-ms 20]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import httpx
+
+from app.core.config import settings
+from app.services.metrics import RollingStats
+from app.services.vapi_service import VapiService
+
+
+class StubVapiServer:
+    """
+    Minimal keep-alive HTTP/1.1 server in a child process.
+    
+    It runs in its own process so it does not compete with the client
+    for the GIL and skew the measurements.
+    """
+    
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._connections = multiprocessing.Value("i", 0)
+        self._port = multiprocessing.Value("i", 0)
+        self._ready = multiprocessing.Event()
+        self._process = multiprocessing.Process(target=self._serve, daemon=True)
+    
+    def start(self):
+        self._process.start()
+        self._ready.wait()
+    
+    def stop(self):
+        self._process.terminate()
+        self._process.join()
+    
+    @property
+    def connections(self) -> int:
+        return self._connections.value
+    
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._port.value}"
+    
+    def _serve(self):
+        async def serve():
+            server = await asyncio.start_server(self._handle, "127.0.0.1", 0, backlog=4096)
+            self._port.value = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await server.serve_forever()
+        
+        asyncio.run(serve())
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        with self._connections.get_lock():
+            self._connections.value += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                
+                length = 0
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b""):
+                        break
+                    name, _, value = header.decode().partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value.strip())
+                if length:
+                    await reader.readexactly(length)
+                
+                await asyncio.sleep(self.delay)
+                
+                body = json.dumps({"id": "stub-call", "status": "queued"}).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                    b"\r\n" + body
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def fresh_client_call(base_url: str):
+    """One request the way the service used to make it."""
+    async with httpx.AsyncClient() as client:
+        response = await client.get(f"{base_url}/call/stub-call", timeout=10.0)
+        response.raise_for_status()
+
+
+async def run(name: str, server: StubVapiServer, call, concurrency: int, total: int):
+    """Run ``total`` calls, ``concurrency`` at a time, and print the overhead."""
+    slots = asyncio.Semaphore(concurrency)
+    latencies = RollingStats(maxlen=total)
+    errors = {}
+    
+    async def one():
+        async with slots:
+            started = time.perf_counter()
+            try:
+                await call()
+            except Exception as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                return
+            latencies.add(time.perf_counter() - started - server.delay)
+    
+    connections_before = server.connections
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    
+    overhead = latencies.summary()
+    opened = server.connections - connections_before
+    if overhead["count"]:
+        print(
+            f"   {name:<14} overhead ms: mean {overhead['mean'] * 1000:7.2f}  "
+            f"p50 {overhead['p50'] * 1000:7.2f}  p99 {overhead['p99'] * 1000:7.2f}  "
+            f"| {total / elapsed:8,.0f} calls/s  | {opened:5} connections"
+        )
+    if errors:
+        print(f"   {name:<14} errors: {errors}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--calls", type=int, default=2000, help="calls per run (at least 2x concurrency)")
+    parser.add_argument("--delay-ms", type=float, default=20.0, help="stub response delay")
+    args = parser.parse_args()
+    
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = min(hard, max(args.concurrency) * 4 + 256)
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+    
+    server = StubVapiServer(delay=args.delay_ms / 1000)
+    server.start()
+    
+    # Calls beyond the pool size queue for a connection; that wait is
+    # part of the measured overhead rather than a failure here
+    settings.VAPI_POOL_TIMEOUT = 300.0
+    settings.VAPI_CONNECT_TIMEOUT = 30.0
+    
+    service = VapiService()
+    service.base_url = server.url
+    service.headers["Authorization"] = "Bearer benchmark"
+    await service.start()
+    
+    try:
+        for concurrency in args.concurrency:
+            total = max(args.calls, concurrency * 2) if concurrency > 1 else min(args.calls, 200)
+            print(f"\n🔍 {concurrency} concurrent, {total} calls")
+            await run("fresh client", server, lambda: fresh_client_call(server.url), concurrency, total)
+            await asyncio.sleep(1)
+            await run("shared client", server, lambda: service.get_call_status("stub-call"), concurrency, total)
+            await asyncio.sleep(1)
+    finally:
+        await service.close()
+        server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,173 @@
+"""
+Benchmark event-loop stalls under concurrent webhook load.
+
+Fires concurrent Vapi webhooks at two in-process copies of the handler:
+- before: the previous handler, querying through the sync Session
+  from inside ``async def`` (every query blocks the event loop)
+- after: the current handler on the async engine (app.api.v1.webhooks)
+
+While the load runs, a probe task sleeps in short ticks on the same
+event loop and records how late it wakes up. That lateness is the time
+the loop was stalled and could not serve anything else.
+
+Needs a migrated database (DATABASE_URL). Test reminders are created
+before the run and deleted afterwards.
+
+Usage:
+    python benchmark_webhook_loop.py [--requests 2000] [--concurrency 100]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import httpx
+from fastapi import Depends, FastAPI, Request
+from sqlalchemy.orm import Session
+
+from app.api.v1 import webhooks
+from app.core.database import SessionLocal, async_engine, get_db
+from app.models.reminder import Reminder, ReminderStatus
+from app.services.metrics import RollingStats
+
+PROBE_INTERVAL = 0.005
+
+
+def build_app() -> FastAPI:
+    """App serving the previous handler at /before and the current one at /after."""
+    app = FastAPI()
+
+    @app.post("/before/vapi")
+    async def legacy_vapi_webhook(request: Request, db: Session = Depends(get_db)):
+        payload = await request.json()
+        reminder_id = payload.get("call", {}).get("metadata", {}).get("reminder_id")
+        reminder = db.query(Reminder).filter(Reminder.id == reminder_id).first()
+        return {"status": "processed", "found": reminder is not None}
+
+    app.include_router(webhooks.router, prefix="/after")
+    return app
+
+
+def create_reminders(count: int):
+    """Insert reminders for the webhooks to look up."""
+    db = SessionLocal()
+    try:
+        scheduled = datetime.now(timezone.utc) + timedelta(days=365)
+        reminders = [
+            Reminder(
+                title=f"Webhook benchmark {i}",
+                message="Benchmark reminder",
+                phone_number="+15555550100",
+                scheduled_datetime=scheduled,
+                timezone="UTC",
+                status=ReminderStatus.COMPLETED,
+            )
+            for i in range(count)
+        ]
+        db.add_all(reminders)
+        db.commit()
+        return [str(reminder.id) for reminder in reminders]
+    finally:
+        db.close()
+
+
+def delete_reminders(reminder_ids):
+    """Remove the benchmark reminders."""
+    db = SessionLocal()
+    try:
+        db.query(Reminder).filter(Reminder.id.in_(reminder_ids)).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def probe_loop(stalls: RollingStats, stop: asyncio.Event) -> float:
+    """Record how late each short sleep wakes up; returns the total."""
+    loop = asyncio.get_running_loop()
+    total = 0.0
+    while not stop.is_set():
+        expected = loop.time() + PROBE_INTERVAL
+        await asyncio.sleep(PROBE_INTERVAL)
+        stall = max(0.0, loop.time() - expected)
+        stalls.add(stall)
+        total += stall
+    return total
+
+
+async def run_load(client: httpx.AsyncClient, path: str, reminder_ids, total: int, concurrency: int):
+    """Send ``total`` call.started webhooks, ``concurrency`` at a time."""
+    slots = asyncio.Semaphore(concurrency)
+    latencies = RollingStats(maxlen=total)
+
+    async def send(i: int):
+        payload = {
+            "type": "call.started",
+            "call": {
+                "id": f"benchmark-{i}",
+                "status": "in-progress",
+                "metadata": {"reminder_id": reminder_ids[i % len(reminder_ids)]},
+            },
+        }
+        async with slots:
+            started = time.perf_counter()
+            response = await client.post(path, json=payload)
+            response.raise_for_status()
+            latencies.add(time.perf_counter() - started)
+
+    await asyncio.gather(*(send(i) for i in range(total)))
+    return latencies
+
+
+async def benchmark(name: str, path: str, reminder_ids, total: int, concurrency: int):
+    """Run one variant and print its stall and latency summary."""
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        # Warm up connection pools
+        await run_load(client, path, reminder_ids, min(total, concurrency), concurrency)
+
+        stalls = RollingStats(maxlen=1_000_000)
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_loop(stalls, stop))
+
+        started = time.perf_counter()
+        latencies = await run_load(client, path, reminder_ids, total, concurrency)
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        stalled_total = await probe
+
+    stall = stalls.summary()
+    latency = latencies.summary()
+
+    print(f"\n{name} ({path})")
+    print(f"   Throughput:         {total / elapsed:,.0f} webhooks/s ({elapsed:.2f}s)")
+    print(f"   Request latency ms: p50 {latency['p50'] * 1000:.1f} / p95 {latency['p95'] * 1000:.1f} / p99 {latency['p99'] * 1000:.1f}")
+    print(f"   Loop stall ms:      p50 {stall['p50'] * 1000:.1f} / p95 {stall['p95'] * 1000:.1f} / p99 {stall['p99'] * 1000:.1f} / max {stall['max'] * 1000:.1f}")
+    print(f"   Loop stalled:       {stalled_total:.2f}s of {elapsed:.2f}s ({stalled_total / elapsed:.0%})")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="webhooks per variant")
+    parser.add_argument("--concurrency", type=int, default=100, help="webhooks in flight")
+    parser.add_argument("--reminders", type=int, default=200, help="reminders to spread lookups over")
+    args = parser.parse_args()
+
+    print(f"🔍 {args.requests} webhooks per variant, {args.concurrency} concurrent")
+    reminder_ids = create_reminders(args.reminders)
+    try:
+        await benchmark("Before: sync Session on the event loop", "/before/vapi", reminder_ids, args.requests, args.concurrency)
+        await benchmark("After: AsyncSession (asyncpg)", "/after/vapi", reminder_ids, args.requests, args.concurrency)
+    finally:
+        delete_reminders(reminder_ids)
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,248 @@
+"""
+Fake Vapi API for offline load and soak testing.
+
+Implements the parts of the Vapi API the backend uses (POST /call,
+GET /call, GET /call/{id}, GET/POST /assistant) with configurable latency, error
+rate and rate limiting. Each accepted call later sends call.started and
+then call.ended or call.failed webhooks back to the backend, like the
+real service would.
+
+Point the backend at it:
+    VAPI_BASE_URL=http://localhost:8100
+    VAPI_API_KEY=fake
+    VAPI_WEBHOOK_URL=http://localhost:8000/api/v1/webhooks/vapi
+
+Usage:
+    python fake_vapi_server.py [--port 8100] [--latency-ms 150] [--latency-p99-ms 800]
+        [--error-rate 0.01] [--rate-limit 50] [--call-failure-rate 0.05]
+
+Counters are available at GET /stats and reset with POST /stats/reset.
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import random
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger("fake_vapi")
+
+# Standard normal quantile for p99
+Z_99 = 2.326
+
+
+class FakeVapiConfig:
+    """Behavior of the fake server, set from the command line."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.latency = args.latency_ms / 1000
+        self.latency_p99 = max(args.latency_p99_ms, args.latency_ms) / 1000
+        self.error_rate = args.error_rate
+        self.rate_limit = args.rate_limit
+        self.retry_after = args.retry_after
+        self.webhook_url = None if args.no_webhooks else args.webhook_url
+        self.ring_delay = args.ring_delay
+        self.call_duration = args.call_duration
+        self.call_failure_rate = args.call_failure_rate
+
+    def sample_latency(self) -> float:
+        """Draw a response time from a lognormal fitted to the median and p99."""
+        if self.latency <= 0:
+            return 0.0
+        sigma = math.log(self.latency_p99 / self.latency) / Z_99
+        return random.lognormvariate(math.log(self.latency), sigma)
+
+
+class FakeVapiState:
+    """Calls, assistants, rate limit bucket and counters."""
+
+    def __init__(self, config: FakeVapiConfig):
+        self.config = config
+        self.calls: Dict[str, Dict[str, Any]] = {}
+        self.assistants: Dict[str, Dict[str, Any]] = {}
+        self.tokens = float(config.rate_limit or 0)
+        self.refilled_at = time.monotonic()
+        self.webhook_client: Optional[httpx.AsyncClient] = None
+        self.tasks = set()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {
+            "calls_created": 0,
+            "errors_injected": 0,
+            "rate_limited": 0,
+            "webhooks_sent": 0,
+            "webhooks_failed": 0,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def take_token(self) -> bool:
+        """Token bucket holding one second worth of calls."""
+        if not self.config.rate_limit:
+            return True
+        now = time.monotonic()
+        rate = self.config.rate_limit
+        self.tokens = min(rate, self.tokens + (now - self.refilled_at) * rate)
+        self.refilled_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def spawn(self, coro):
+        task = asyncio.get_running_loop().create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+
+def create_app(config: FakeVapiConfig) -> FastAPI:
+    """Build the fake Vapi app."""
+    state = FakeVapiState(config)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        state.webhook_client = httpx.AsyncClient(timeout=10.0)
+        yield
+        for task in list(state.tasks):
+            task.cancel()
+        await state.webhook_client.aclose()
+
+    app = FastAPI(title="Fake Vapi API", lifespan=lifespan)
+
+    async def send_webhook(event_type: str, call: Dict[str, Any]):
+        try:
+            response = await state.webhook_client.post(
+                config.webhook_url,
+                json={"type": event_type, "call": call}
+            )
+            response.raise_for_status()
+            state.stats["webhooks_sent"] += 1
+        except httpx.HTTPError as e:
+            state.stats["webhooks_failed"] += 1
+            logger.warning(f"Webhook {event_type} for call {call['id']} failed: {e}")
+
+    async def run_call(call: Dict[str, Any]):
+        """Move a call through its lifecycle and report it by webhook."""
+        await asyncio.sleep(config.ring_delay)
+        call["status"] = "in-progress"
+        if config.webhook_url:
+            await send_webhook("call.started", call)
+
+        await asyncio.sleep(config.call_duration)
+        call["endedAt"] = datetime.now(timezone.utc).isoformat()
+        if random.random() < config.call_failure_rate:
+            call["status"] = "failed"
+            call["error"] = {"message": "Simulated call failure (no answer)"}
+            event_type = "call.failed"
+        else:
+            call["status"] = "ended"
+            event_type = "call.ended"
+        if config.webhook_url:
+            await send_webhook(event_type, call)
+
+    @app.post("/call")
+    async def create_call(request: Request):
+        payload = await request.json()
+        await asyncio.sleep(config.sample_latency())
+
+        if not state.take_token():
+            state.stats["rate_limited"] += 1
+            return JSONResponse(
+                status_code=429,
+                content={"message": "Too Many Requests"},
+                headers={"Retry-After": str(config.retry_after)}
+            )
+
+        if random.random() < config.error_rate:
+            state.stats["errors_injected"] += 1
+            return JSONResponse(status_code=503, content={"message": "Simulated upstream error"})
+
+        call = {
+            "id": str(uuid.uuid4()),
+            "status": "queued",
+            "createdAt": datetime.now(timezone.utc).isoformat(),
+            "customer": payload.get("customer", {}),
+            "assistantId": payload.get("assistantId"),
+            "metadata": payload.get("metadata", {}),
+        }
+        state.calls[call["id"]] = call
+        state.stats["calls_created"] += 1
+        state.spawn(run_call(call))
+
+        return JSONResponse(status_code=201, content=call)
+
+    @app.get("/call")
+    async def list_calls(createdAtGe: Optional[str] = None, createdAtLe: Optional[str] = None, limit: int = 100):
+        # Like Vapi: both bounds inclusive, newest first
+        await asyncio.sleep(config.sample_latency())
+        calls = [
+            call for call in state.calls.values()
+            if (not createdAtGe or datetime.fromisoformat(call["createdAt"]) >= datetime.fromisoformat(createdAtGe))
+            and (not createdAtLe or datetime.fromisoformat(call["createdAt"]) <= datetime.fromisoformat(createdAtLe))
+        ]
+        calls.sort(key=lambda call: datetime.fromisoformat(call["createdAt"]), reverse=True)
+        return calls[:limit]
+
+    @app.get("/call/{call_id}")
+    async def get_call(call_id: str):
+        await asyncio.sleep(config.sample_latency())
+        call = state.calls.get(call_id)
+        if call is None:
+            return JSONResponse(status_code=404, content={"message": "Call not found"})
+        return call
+
+    @app.get("/assistant")
+    async def list_assistants():
+        return list(state.assistants.values())
+
+    @app.post("/assistant")
+    async def create_assistant(request: Request):
+        assistant = {"id": str(uuid.uuid4()), **(await request.json())}
+        state.assistants[assistant["id"]] = assistant
+        return JSONResponse(status_code=201, content=assistant)
+
+    @app.get("/stats")
+    async def get_stats():
+        in_progress = sum(1 for call in state.calls.values() if call["status"] in ("queued", "in-progress"))
+        return {**state.stats, "calls_in_progress": in_progress}
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        state.reset_stats()
+        return state.stats
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="median API response time")
+    parser.add_argument("--latency-p99-ms", type=float, default=600.0, help="p99 API response time")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of POST /call answered with 503")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="POST /call per second before 429 (0 = off)")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429")
+    parser.add_argument("--webhook-url", default="http://localhost:8000/api/v1/webhooks/vapi")
+    parser.add_argument("--no-webhooks", action="store_true", help="do not send call webhooks")
+    parser.add_argument("--ring-delay", type=float, default=2.0, help="seconds until call.started")
+    parser.add_argument("--call-duration", type=float, default=10.0, help="seconds from call.started to the end")
+    parser.add_argument("--call-failure-rate", type=float, default=0.0, help="fraction of calls ending in call.failed")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    uvicorn.run(create_app(FakeVapiConfig(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Tests for the provider circuit breaker.
+"""
+
+import pytest
+
+from app.services import circuit_breaker
+from app.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class Clock:
+    """Stands in for the time module so tests control monotonic()."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    return clock
+
+
+def make_breaker(**overrides):
+    options = dict(failure_rate=0.5, min_calls=4, window=60, open_seconds=30, half_open_calls=2)
+    options.update(overrides)
+    return CircuitBreaker("test", **options)
+
+
+def trip(breaker):
+    for _ in range(breaker.min_calls):
+        assert breaker.try_acquire() == 0
+        breaker.record_failure()
+
+
+def test_opens_at_the_failure_rate_once_enough_calls_were_seen(clock):
+    breaker = make_breaker()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.opened_count == 1
+
+
+def test_few_failures_do_not_open(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+
+    assert breaker.state == CLOSED
+
+
+def test_old_outcomes_leave_the_window(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 61
+    breaker.record_failure()
+
+    assert breaker.state == CLOSED
+
+
+def test_open_circuit_rejects_and_reports_the_wait(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 10
+
+    assert breaker.blocked_for() == pytest.approx(20)
+    assert 20 <= breaker.try_acquire() <= 22
+
+
+def test_half_open_lets_a_limited_number_of_probes_through(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 30
+
+    assert breaker.blocked_for() == 0
+    assert breaker.try_acquire() == 0
+    assert breaker.state == HALF_OPEN
+    assert breaker.try_acquire() == 0
+    assert breaker.try_acquire() > 0
+
+
+def test_successful_probes_close_the_circuit(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 30
+    breaker.try_acquire()
+    breaker.try_acquire()
+
+    breaker.record_success()
+    assert breaker.state == HALF_OPEN
+    breaker.record_success()
+
+    assert breaker.state == CLOSED
+    assert breaker.try_acquire() == 0
+
+
+def test_failed_probe_reopens_the_circuit(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 30
+    breaker.try_acquire()
+
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.opened_count == 2
+    assert breaker.blocked_for() == pytest.approx(30)
+
+
+def test_released_probe_frees_its_place(clock):
+    breaker = make_breaker(half_open_calls=1)
+    trip(breaker)
+    clock.now += 30
+    assert breaker.try_acquire() == 0
+    assert breaker.try_acquire() > 0
+
+    breaker.release()
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.try_acquire() == 0
@@ -0,0 +1,92 @@
+"""
+Tests for the in-memory dispatch queue.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.services.dispatch_queue import DispatchQueue
+
+
+def make_queue() -> DispatchQueue:
+    return DispatchQueue(horizon_seconds=600)
+
+
+def test_pop_due_returns_entries_in_due_order():
+    queue = make_queue()
+    now = datetime.now(timezone.utc)
+    first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    queue.schedule(third, now - timedelta(seconds=1))
+    queue.schedule(first, now - timedelta(seconds=30))
+    queue.schedule(second, now - timedelta(seconds=10))
+
+    assert [reminder_id for reminder_id, _ in queue.pop_due(now)] == [first, second, third]
+    assert len(queue) == 0
+
+
+def test_pop_due_leaves_future_entries():
+    queue = make_queue()
+    now = datetime.now(timezone.utc)
+    due, later = uuid.uuid4(), uuid.uuid4()
+    queue.schedule(due, now)
+    queue.schedule(later, now + timedelta(seconds=60))
+
+    assert queue.pop_due(now) == [(due, now)]
+    assert queue.next_due_at() == now + timedelta(seconds=60)
+
+
+def test_naive_times_are_taken_as_utc():
+    queue = make_queue()
+    due_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    reminder_id = uuid.uuid4()
+    queue.schedule(reminder_id, due_at)
+
+    assert queue.next_due_at() == due_at.replace(tzinfo=timezone.utc)
+
+
+def test_cancel_drops_entry():
+    queue = make_queue()
+    now = datetime.now(timezone.utc)
+    cancelled, kept = uuid.uuid4(), uuid.uuid4()
+    queue.schedule(cancelled, now - timedelta(seconds=5))
+    queue.schedule(kept, now - timedelta(seconds=1))
+    queue.cancel(cancelled)
+
+    assert len(queue) == 1
+    assert queue.next_due_at() == now - timedelta(seconds=1)
+    assert [reminder_id for reminder_id, _ in queue.pop_due(now)] == [kept]
+
+
+def test_reschedule_moves_entry():
+    queue = make_queue()
+    now = datetime.now(timezone.utc)
+    reminder_id = uuid.uuid4()
+    queue.schedule(reminder_id, now - timedelta(seconds=5))
+    queue.schedule(reminder_id, now + timedelta(seconds=60))
+
+    assert queue.pop_due(now) == []
+    assert len(queue) == 1
+    assert queue.next_due_at() == now + timedelta(seconds=60)
+
+
+def test_entries_beyond_horizon_are_dropped():
+    queue = make_queue()
+    now = datetime.now(timezone.utc)
+    reminder_id = uuid.uuid4()
+    queue.schedule(reminder_id, now + timedelta(seconds=60))
+
+    assert not queue.schedule(reminder_id, now + timedelta(hours=1))
+    assert len(queue) == 0
+    assert queue.next_due_at() is None
+
+
+def test_in_flight_reminders_are_not_queued_again():
+    queue = make_queue()
+    now = datetime.now(timezone.utc)
+    reminder_id = uuid.uuid4()
+    queue.schedule(reminder_id, now)
+    queue.pop_due(now)
+
+    assert not queue.schedule(reminder_id, now)
+    queue.release(reminder_id)
+    assert queue.schedule(reminder_id, now)
@@ -0,0 +1,73 @@
+"""
+Tests for keyset pagination cursors.
+"""
+
+import base64
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.pagination import Cursor, decode_cursor, encode_cursor
+
+SCHEDULED = datetime(2026, 3, 1, 9, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def make_cursor(sort="date_desc") -> Cursor:
+    return Cursor(sort, SCHEDULED, uuid.UUID("6f1c2a7e-8d44-4b0e-9a51-3c2f7d9e1b20"))
+
+
+def raw(*fields) -> str:
+    """A cursor-shaped string around arbitrary JSON fields."""
+    data = ", ".join(f'"{field}"' for field in fields)
+    return base64.urlsafe_b64encode(f"[{data}]".encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("sort", ["date_asc", "date_desc"])
+def test_cursor_round_trip(sort):
+    cursor = make_cursor(sort)
+
+    assert decode_cursor(encode_cursor(cursor)) == cursor
+
+
+def test_cursor_is_url_safe_without_padding():
+    encoded = encode_cursor(make_cursor())
+
+    assert "=" not in encoded
+    assert "+" not in encoded and "/" not in encoded
+
+
+@pytest.mark.parametrize("value", [
+    "",
+    encode_cursor(make_cursor())[:-6],
+    raw("date_desc", SCHEDULED.isoformat()),
+    raw("date_desc", "yesterday", "6f1c2a7e-8d44-4b0e-9a51-3c2f7d9e1b20"),
+    raw("date_desc", SCHEDULED.isoformat(), "not-a-uuid"),
+    raw("date_desc", SCHEDULED.isoformat(), "6f1c2a7e-8d44-4b0e-9a51-3c2f7d9e1b20", "extra"),
+])
+def test_malformed_cursor_raises_value_error(value):
+    with pytest.raises(ValueError):
+        decode_cursor(value)
+
+
+def test_listing_rejects_a_malformed_cursor():
+    response = TestClient(app).get("/api/v1/reminders/", params={"cursor": encode_cursor(make_cursor())[:-6]})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.parametrize("issued_for, params", [
+    ("date_desc", {"sort": "date_asc"}),
+    ("date_asc", {"sort": "date_desc"}),
+    ("date_asc", {}),  # date_desc is the default
+])
+def test_listing_rejects_a_cursor_issued_for_another_sort(issued_for, params):
+    cursor = encode_cursor(make_cursor(issued_for))
+
+    response = TestClient(app).get("/api/v1/reminders/", params={**params, "cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor was issued for a different sort order"
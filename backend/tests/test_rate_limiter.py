@@ -0,0 +1,201 @@
+"""
+Tests for the in-process token bucket.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.rate_limiter import AdaptiveConcurrencyLimit, TokenBucket, parse_retry_after
+
+
+def available(bucket: TokenBucket) -> float:
+    """Tokens the bucket would hold now, without taking one."""
+    now = time.monotonic()
+    return min(bucket.capacity, bucket._tokens + max(0.0, now - bucket._updated) * bucket._current_rate(now))
+
+
+def drain(bucket: TokenBucket):
+    async def take_all():
+        for _ in range(int(bucket.capacity)):
+            await bucket.acquire()
+    asyncio.run(take_all())
+
+
+def test_bucket_starts_full_and_refills_at_rate():
+    bucket = TokenBucket(rate=20, capacity=10, cooldown=0)
+    drain(bucket)
+    assert available(bucket) < 1
+
+    time.sleep(0.1)
+    assert 1.5 <= available(bucket) <= 5
+
+
+def test_refill_is_capped_at_capacity():
+    bucket = TokenBucket(rate=1000, capacity=5, cooldown=0)
+    drain(bucket)
+    time.sleep(0.05)
+
+    assert available(bucket) == 5
+
+
+def test_acquire_waits_for_a_token():
+    bucket = TokenBucket(rate=20, capacity=1, cooldown=0)
+    drain(bucket)
+
+    started = time.monotonic()
+    asyncio.run(bucket.acquire())
+    assert time.monotonic() - started >= 0.04
+
+
+def test_nothing_accrues_during_a_pause():
+    bucket = TokenBucket(rate=100, capacity=100, cooldown=0)
+    asyncio.run(bucket.penalize(0.1))
+    time.sleep(0.15)
+
+    # Only the time since the pause ended counts
+    assert available(bucket) < 10
+
+
+def test_cooldown_halves_the_rate():
+    bucket = TokenBucket(rate=20, capacity=20, cooldown=60)
+    asyncio.run(bucket.penalize(0))
+
+    assert bucket._current_rate(time.monotonic()) == 10
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7", default=5) == 7
+    assert parse_retry_after(None, default=5) == 5
+    assert parse_retry_after("soon", default=5) == 5
+
+
+def make_limit(**overrides):
+    options = dict(min_limit=2, max_limit=10, latency_target=1.0, backoff=0.5)
+    options.update(overrides)
+    return AdaptiveConcurrencyLimit(**options)
+
+
+def test_limit_starts_at_the_maximum_and_stays_there_on_success():
+    limit = make_limit()
+    limit.record(0.1, ok=True)
+
+    assert limit.limit == 10
+
+
+def test_slow_or_failed_calls_decrease_the_limit_multiplicatively():
+    limit = make_limit()
+    limit.record(5.0, ok=True)
+    assert limit.limit == 5
+
+    limit.record(0.1, ok=False)
+    assert limit.limit == 2.5
+
+
+def test_limit_is_clamped_to_the_minimum():
+    limit = make_limit()
+    for _ in range(10):
+        limit.record(0.1, ok=False)
+
+    assert limit.limit == 2
+
+
+def test_fast_calls_increase_the_limit_additively():
+    limit = make_limit()
+    for _ in range(3):
+        limit.record(0.1, ok=False)
+    assert limit.limit == 2
+
+    limit.record(0.1, ok=True)
+    assert limit.limit == 2.5
+    limit.record(0.1, ok=True)
+    assert limit.limit == pytest.approx(2.9)
+
+
+def test_fixed_limit_ignores_outcomes():
+    limit = make_limit(adaptive=False)
+    limit.record(5.0, ok=False)
+
+    assert limit.limit == 10
+
+
+def test_waiters_get_slots_in_order_as_they_free_up():
+    async def run():
+        limit = make_limit(min_limit=1, max_limit=1)
+        order = []
+        await limit.acquire()
+
+        async def worker(name):
+            await limit.acquire()
+            order.append(name)
+
+        tasks = [asyncio.create_task(worker(name)) for name in ("first", "second")]
+        await asyncio.sleep(0)
+        assert order == [] and limit.active == 1
+
+        limit.release()
+        await asyncio.sleep(0)
+        assert order == ["first"]
+
+        limit.release()
+        await asyncio.gather(*tasks)
+        assert order == ["first", "second"]
+        assert limit.active == 1
+
+    asyncio.run(run())
+
+
+def test_shrinking_limit_holds_back_waiters():
+    async def run():
+        limit = make_limit(min_limit=1, max_limit=2, backoff=0.5)
+        await limit.acquire()
+        limit.record(5.0, ok=False)
+
+        waiter = asyncio.create_task(limit.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        limit.release()
+        await waiter
+        assert limit.active == 1
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_gives_back_a_slot_granted_before_cancellation():
+    async def run():
+        limit = make_limit(min_limit=1, max_limit=1)
+        await limit.acquire()
+
+        waiter = asyncio.create_task(limit.acquire())
+        await asyncio.sleep(0)
+
+        # Grant the slot and cancel before the waiter gets to run
+        limit.release()
+        assert limit.active == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert limit.active == 0
+        await asyncio.wait_for(limit.acquire(), timeout=1)
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_without_a_slot_takes_nothing():
+    async def run():
+        limit = make_limit(min_limit=1, max_limit=1)
+        await limit.acquire()
+
+        waiter = asyncio.create_task(limit.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        limit.release()
+        assert limit.active == 0
+
+    asyncio.run(run())
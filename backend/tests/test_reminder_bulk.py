@@ -0,0 +1,77 @@
+"""
+Tests for bulk validation helpers.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.schemas.reminder import ReminderBulkUpdateItem, ReminderCreate
+from app.services.reminder_bulk import chunks, drop_duplicates, validate_items
+
+
+def reminder(**overrides):
+    item = {
+        "title": "Dentist",
+        "message": "Appointment at 3pm",
+        "phone_number": "+15551234567",
+        "scheduled_datetime": (datetime.now(timezone.utc) + timedelta(days=1)).isoformat(),
+        "timezone": "America/New_York",
+    }
+    item.update(overrides)
+    return item
+
+
+def test_validate_items_all_valid():
+    valid, errors = validate_items(ReminderCreate, [reminder(), reminder(title="Gym")])
+
+    assert errors == {}
+    assert list(valid) == [0, 1]
+    assert valid[1].title == "Gym"
+
+
+def test_validate_items_keys_errors_by_position():
+    items = [
+        reminder(),
+        reminder(phone_number="not-a-number"),
+        reminder(title=""),
+        reminder(),
+    ]
+    valid, errors = validate_items(ReminderCreate, items)
+
+    assert sorted(valid) == [0, 3]
+    assert sorted(errors) == [1, 2]
+    assert errors[1][0]["loc"] == ["phone_number"]
+    assert errors[2][0]["loc"] == ["title"]
+
+
+def test_validate_items_collects_every_error_of_an_item():
+    items = [reminder(phone_number="x", title="")]
+    valid, errors = validate_items(ReminderCreate, items)
+
+    assert valid == {}
+    assert sorted(error["loc"][0] for error in errors[0]) == ["phone_number", "title"]
+
+
+def test_validate_items_rejects_past_times():
+    past = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+    valid, errors = validate_items(ReminderCreate, [reminder(scheduled_datetime=past)])
+
+    assert valid == {}
+    assert errors[0][0]["loc"] == ["scheduled_datetime"]
+
+
+def test_drop_duplicates_keeps_first_occurrence():
+    first, second = uuid.uuid4(), uuid.uuid4()
+    items = [{"id": str(first)}, {"id": str(second)}, {"id": str(first), "title": "Again"}, {"id": "bad"}]
+    valid, errors = validate_items(ReminderBulkUpdateItem, items)
+
+    unique = drop_duplicates(valid, errors, lambda item: item.id)
+
+    assert sorted(unique) == [0, 1]
+    assert errors[2] == "Duplicate id in batch"
+    assert 3 in errors and errors[3] != "Duplicate id in batch"
+
+
+def test_chunks():
+    assert list(chunks(list(range(5)), size=2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunks([], size=2)) == []
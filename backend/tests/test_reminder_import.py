@@ -0,0 +1,272 @@
+"""
+Tests for the import file readers and the error report.
+"""
+
+import csv
+import io
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from app.services import reminder_import
+from app.services.reminder_import import (
+    _MERGE,
+    ErrorReport,
+    ImportFileError,
+    ReminderImporter,
+    batched,
+    describe_errors,
+    detect_format,
+    read_csv,
+    read_ndjson,
+)
+
+HEADER = "title,message,phone_number,scheduled_datetime,timezone\n"
+
+ROWS = [
+    {"title": "Dentist", "message": "At 3pm", "phone_number": "+15551234567", "scheduled_datetime": "2030-01-01T15:00:00+00:00", "timezone": "UTC"},
+    {"title": "Gym", "message": "Leg day", "phone_number": "not-a-number", "scheduled_datetime": "2030-01-02T08:00:00+00:00", "timezone": "UTC"},
+    {"title": "Call mum", "message": "Birthday", "phone_number": "+15557654321", "scheduled_datetime": "2030-01-03T18:00:00+00:00", "timezone": "UTC"},
+    {"title": "Vet", "message": "Annual check", "phone_number": "+15550001111", "scheduled_datetime": "2030-01-04T10:00:00+00:00", "timezone": "UTC"},
+    {"title": "", "message": "No title", "phone_number": "+15550002222", "scheduled_datetime": "2030-01-05T10:00:00+00:00", "timezone": "UTC"},
+]
+
+
+class FakeDatabase:
+    """
+    In-memory stand-in for the import's database sessions.
+
+    Merged rows become reminders when their transaction commits and are
+    dropped on rollback; ``fail_commit`` makes that commit (counting
+    from 1) raise.
+    """
+
+    def __init__(self, fail_commit=None):
+        self.jobs = {}
+        self.reminders = []
+        self.pending = []
+        self.copied = []
+        self.commits = 0
+        self.fail_commit = fail_commit
+
+    def session(self):
+        return FakeSession(self)
+
+
+class FakeSession:
+    def __init__(self, database):
+        self.database = database
+
+    def add(self, job):
+        self.database.jobs[job.id] = job
+
+    def get(self, model, key):
+        return self.database.jobs.get(key)
+
+    def refresh(self, instance):
+        pass
+
+    def execute(self, statement, params=None):
+        pass  # Change notifications
+
+    def connection(self):
+        return FakeConnection(self.database)
+
+    def commit(self):
+        self.database.commits += 1
+        if self.database.commits == self.database.fail_commit:
+            raise RuntimeError("commit failed")
+        self.database.reminders.extend(self.database.pending)
+        self.database.pending.clear()
+
+    def rollback(self):
+        self.database.pending.clear()
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, database):
+        self.database = database
+        self.connection = self
+
+    def cursor(self):
+        return self
+
+    def copy_expert(self, sql, buffer):
+        self.database.copied = list(csv.reader(buffer))
+
+    def execute(self, statement, params=None):
+        if statement is not _MERGE:
+            return None
+        merged = [
+            SimpleNamespace(id=uuid.UUID(row[0]), title=row[1], next_attempt_at=datetime.fromisoformat(row[4]))
+            for row in self.database.copied
+        ]
+        self.database.pending.extend(merged)
+        return SimpleNamespace(all=lambda: merged)
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(reminder_import, "SessionLocal", database.session)
+    return database
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_ndjson(path, rows):
+    path.write_bytes(b"".join(orjson.dumps(row) + b"\n" for row in rows))
+
+
+def run_import(tmp_path, format, rows, batch_size=2):
+    importer = ReminderImporter(str(tmp_path), batch_size=batch_size, max_concurrent=1)
+    path = tmp_path / f"upload.{format}"
+    (write_csv if format == "csv" else write_ndjson)(path, rows)
+    job = importer.create(uuid.uuid4(), path.name, format, path.stat().st_size)
+    return importer.run(job.id, path), importer
+
+
+def report_rows(importer, job):
+    with open(importer.report_path(job.id), newline="") as f:
+        return list(csv.reader(f))[1:]
+
+
+def test_detect_format():
+    assert detect_format("campaign.CSV") == "csv"
+    assert detect_format("campaign.ndjson") == "ndjson"
+    assert detect_format("campaign.jsonl") == "ndjson"
+    with pytest.raises(ImportFileError):
+        detect_format("campaign.xlsx")
+
+
+def test_read_csv_yields_rows_with_line_numbers():
+    raw = io.BytesIO((
+        HEADER
+        + "Dentist,Appointment at 3pm,+15551234567,2030-01-01T15:00:00Z,UTC\n"
+        + 'Gym,"Leg day, bring shoes",+15557654321,2030-01-02T08:00:00Z,UTC\n'
+    ).encode())
+
+    rows = list(read_csv(raw))
+
+    assert [line for line, _, _ in rows] == [2, 3]
+    assert rows[1][1]["message"] == "Leg day, bring shoes"
+    assert all(error is None for _, _, error in rows)
+
+
+def test_read_csv_counts_lines_of_multiline_values():
+    raw = io.BytesIO((
+        HEADER
+        + 'Dentist,"Line one\nline two",+15551234567,2030-01-01T15:00:00Z,UTC\n'
+        + "Gym,Leg day,+15557654321,2030-01-02T08:00:00Z,UTC\n"
+    ).encode())
+
+    assert [line for line, _, _ in read_csv(raw)] == [3, 4]
+
+
+def test_read_csv_strips_bom_and_extra_values():
+    raw = io.BytesIO(("﻿" + HEADER + "Dentist,Hi,+15551234567,2030-01-01T15:00:00Z,UTC,extra\n").encode())
+
+    (_, row, _), = read_csv(raw)
+
+    assert set(row) == {"title", "message", "phone_number", "scheduled_datetime", "timezone"}
+
+
+def test_read_csv_rejects_missing_columns():
+    raw = io.BytesIO(b"title,message\nDentist,Hi\n")
+
+    with pytest.raises(ImportFileError, match="phone_number"):
+        list(read_csv(raw))
+
+
+def test_read_ndjson_skips_blank_lines_and_reports_bad_json():
+    raw = io.BytesIO(
+        b'{"title": "Dentist"}\n'
+        b"\n"
+        b"{not json\n"
+        b'{"title": "Gym"}\r\n'
+    )
+
+    rows = list(read_ndjson(raw))
+
+    assert [(line, error is None) for line, _, error in rows] == [(1, True), (3, False), (4, True)]
+    assert rows[0][1] == {"title": "Dentist"}
+    assert rows[1][1] == "{not json"
+    assert rows[1][2].startswith("Invalid JSON")
+    assert rows[2][1] == {"title": "Gym"}
+
+
+def test_batched():
+    assert list(batched(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(batched(iter([]), 2)) == []
+
+
+def test_describe_errors():
+    errors = [
+        {"loc": ["phone_number"], "msg": "Invalid phone number"},
+        {"loc": [], "msg": "Input should be an object"},
+    ]
+
+    assert describe_errors(errors) == "phone_number: Invalid phone number; Input should be an object"
+    assert describe_errors("Invalid JSON") == "Invalid JSON"
+
+
+def test_error_report_is_created_on_first_rejection(tmp_path):
+    report = ErrorReport(tmp_path / "import.errors.csv")
+    assert not report.written
+
+    report.add(3, "Invalid JSON", "{not json")
+    report.add(7, "title: too short", {"title": ""})
+    report.close()
+
+    assert report.written
+    with open(report.path, newline="") as f:
+        assert list(csv.reader(f)) == [
+            ["line", "error", "data"],
+            ["3", "Invalid JSON", "{not json"],
+            ["7", "title: too short", '{"title":""}'],
+        ]
+
+
+@pytest.mark.parametrize("format", ["csv", "ndjson"])
+def test_run_imports_every_batch(tmp_path, database, format):
+    job, importer = run_import(tmp_path, format, ROWS)
+
+    assert job.status == "completed", job.error
+    assert (job.rows_read, job.rows_imported, job.rows_rejected) == (5, 3, 2)
+    assert job.bytes_read == job.bytes_total
+    assert [reminder.title for reminder in database.reminders] == ["Dentist", "Call mum", "Vet"]
+
+    first_line = 2 if format == "csv" else 1
+    assert [int(line) for line, _, _ in report_rows(importer, job)] == [first_line + 1, first_line + 4]
+    assert job.error_report == str(importer.report_path(job.id))
+
+
+@pytest.mark.parametrize("format", ["csv", "ndjson"])
+def test_run_imports_a_file_smaller_than_a_batch(tmp_path, database, format):
+    job, _ = run_import(tmp_path, format, ROWS[:1], batch_size=1000)
+
+    assert job.status == "completed", job.error
+    assert job.rows_imported == 1
+    assert job.error_report is None
+
+
+def test_run_reports_only_rejections_of_committed_batches(tmp_path, database):
+    # Commits: 1 creates the import, 2 marks it running, 3 is the first batch, 4 the second
+    database.fail_commit = 4
+    job, importer = run_import(tmp_path, "csv", ROWS)
+
+    assert job.status == "failed"
+    assert job.error == "commit failed"
+    assert [reminder.title for reminder in database.reminders] == ["Dentist"]
+    assert [int(line) for line, _, _ in report_rows(importer, job)] == [3]
@@ -0,0 +1,26 @@
+"""
+Tests for the scheduler metrics endpoint.
+"""
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+
+
+def test_metrics_come_from_the_in_process_scheduler(monkeypatch):
+    monkeypatch.setattr(settings, "SCHEDULER_IN_PROCESS", True)
+
+    metrics = TestClient(app).get("/api/v1/scheduler/metrics").json()
+
+    assert metrics["in_process"] is True
+    assert "queue_size" in metrics
+
+
+def test_metrics_say_the_scheduler_runs_out_of_process(monkeypatch):
+    monkeypatch.setattr(settings, "SCHEDULER_IN_PROCESS", False)
+
+    metrics = TestClient(app).get("/api/v1/scheduler/metrics").json()
+
+    assert metrics["in_process"] is False
+    assert "queue_size" not in metrics
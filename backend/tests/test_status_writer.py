@@ -0,0 +1,138 @@
+"""
+Tests for the status write-behind buffer.
+
+The version guard tests run against the database in DATABASE_URL and
+are skipped when it is unreachable or has no schema.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+
+from app.core.database import SessionLocal, async_engine
+from app.main import app
+from app.models.reminder import Reminder
+from app.services import status_writer
+from app.services.status_writer import StatusWriteBuffer
+
+
+@pytest.fixture(scope="module")
+def client():
+    try:
+        with SessionLocal() as db:
+            db.execute(select(Reminder.id).limit(1))
+    except Exception:
+        pytest.skip("needs a Postgres database with the schema applied")
+    return TestClient(app)
+
+
+@pytest.fixture
+def reminder_id(client):
+    response = client.post("/api/v1/reminders/", json={
+        "title": "Dentist",
+        "message": "Appointment at 3pm",
+        "phone_number": "+15551234567",
+        "scheduled_datetime": (datetime.now(timezone.utc) + timedelta(days=1)).isoformat(),
+        "timezone": "America/New_York",
+    })
+    assert response.status_code == 201
+    reminder_id = response.json()["id"]
+    yield reminder_id
+
+    with SessionLocal() as db:
+        db.execute(delete(Reminder).where(Reminder.id == reminder_id))
+        db.commit()
+
+
+def load(reminder_id) -> Reminder:
+    with SessionLocal() as db:
+        return db.get(Reminder, reminder_id)
+
+
+def flush(reminder: Reminder, **changes):
+    """Buffer changes based on ``reminder`` as loaded, then flush them."""
+    async def run():
+        buffer = StatusWriteBuffer(max_batch=100, flush_interval=60)
+        buffer.add(reminder.id, reminder.call_attempts, reminder.version, **changes)
+        try:
+            await buffer.flush()
+        finally:
+            # The pool's connections belong to this event loop
+            await async_engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_flush_applies_changes_to_an_unchanged_row(reminder_id):
+    before = load(reminder_id)
+
+    flush(before, last_error="Call failed: busy")
+
+    after = load(reminder_id)
+    assert after.last_error == "Call failed: busy"
+    assert after.version == before.version + 1
+
+
+def test_flush_based_on_a_row_edited_since_is_ignored(client, reminder_id):
+    before = load(reminder_id)
+    client.put(f"/api/v1/reminders/{reminder_id}", json={"title": "Dentist (moved)"})
+
+    flush(before, last_error="Call failed: busy")
+
+    after = load(reminder_id)
+    assert after.title == "Dentist (moved)"
+    assert after.last_error is None
+
+
+def test_flush_based_on_a_row_bulk_edited_since_is_ignored(client, reminder_id):
+    before = load(reminder_id)
+    client.post("/api/v1/reminders/bulk/update", json=[{"id": reminder_id, "title": "Dentist (moved)"}])
+
+    flush(before, last_error="Call failed: busy")
+
+    after = load(reminder_id)
+    assert after.title == "Dentist (moved)"
+    assert after.last_error is None
+
+
+class SlowSession:
+    """Session whose writes take a while, recording what was committed."""
+
+    def __init__(self, committed):
+        self.committed = committed
+        self.statements = 0
+
+    async def execute(self, statement):
+        await asyncio.sleep(0.05)
+        self.statements += 1
+
+    async def commit(self):
+        self.committed.append(self.statements)
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+def test_stop_waits_for_a_size_triggered_flush(monkeypatch):
+    committed = []
+    monkeypatch.setattr(status_writer, "AsyncSessionLocal", lambda: SlowSession(committed))
+
+    async def run():
+        buffer = StatusWriteBuffer(max_batch=2, flush_interval=60)
+        buffer.add(uuid.uuid4(), 1, 0, last_error="busy")
+        buffer.add(uuid.uuid4(), 1, 0, last_error="busy")
+        await buffer.stop()
+        return buffer, [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    buffer, running = asyncio.run(run())
+
+    assert running == []
+    assert committed == [1]
+    assert buffer.rows_flushed == 2
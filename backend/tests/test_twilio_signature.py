@@ -0,0 +1,79 @@
+"""
+Tests for Twilio request signature validation.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.services.twilio_service import compute_signature, validate_signature
+
+# Request-signing example from Twilio's security documentation
+AUTH_TOKEN = "12345"
+URL = "https://mycompany.com/myapp.php?foo=1&bar=2"
+PARAMS = {
+    "CallSid": "CA1234567890ABCDE",
+    "Caller": "+12349013030",
+    "Digits": "1234",
+    "From": "+12349013030",
+    "To": "+18005551212",
+}
+SIGNATURE = "0/KCTR6DLpKmkAf8muzZqo1nDgQ="
+
+
+@pytest.fixture
+def auth_token(monkeypatch):
+    monkeypatch.setattr(settings, "TWILIO_AUTH_TOKEN", AUTH_TOKEN)
+
+
+def test_compute_signature_matches_twilio_example():
+    assert compute_signature(AUTH_TOKEN, URL, PARAMS) == SIGNATURE
+
+
+def test_params_are_signed_sorted_by_name():
+    shuffled = dict(reversed(list(PARAMS.items())))
+
+    assert compute_signature(AUTH_TOKEN, URL, shuffled) == SIGNATURE
+
+
+def test_valid_signature_is_accepted(auth_token):
+    assert validate_signature(URL, PARAMS, SIGNATURE)
+
+
+@pytest.mark.parametrize("url, params", [
+    ("https://mycompany.com/myapp.php?foo=1&bar=3", PARAMS),
+    ("http://mycompany.com/myapp.php?foo=1&bar=2", PARAMS),
+    (URL, {**PARAMS, "Digits": "4321"}),
+    (URL, {**PARAMS, "CallStatus": "completed"}),
+])
+def test_tampered_request_is_rejected(auth_token, url, params):
+    assert not validate_signature(url, params, SIGNATURE)
+
+
+def test_missing_signature_is_rejected(auth_token):
+    assert not validate_signature(URL, PARAMS, "")
+
+
+def test_nothing_is_accepted_without_an_auth_token(monkeypatch):
+    monkeypatch.setattr(settings, "TWILIO_AUTH_TOKEN", "")
+
+    assert not validate_signature(URL, PARAMS, SIGNATURE)
+
+
+def test_status_callback_with_a_bad_signature_is_forbidden(auth_token):
+    response = TestClient(app).post(
+        "/api/v1/webhooks/twilio?reminder_id=00000000-0000-0000-0000-000000000001",
+        data={"CallSid": "CA1", "CallStatus": "completed"},
+        headers={"X-Twilio-Signature": SIGNATURE}
+    )
+
+    assert response.status_code == 403
+
+
+def test_status_callback_is_forbidden_when_twilio_is_not_configured(monkeypatch):
+    monkeypatch.setattr(settings, "TWILIO_AUTH_TOKEN", "")
+
+    response = TestClient(app).post("/api/v1/webhooks/twilio", data={"CallSid": "CA1", "CallStatus": "completed"})
+
+    assert response.status_code == 403
@@ -0,0 +1,75 @@
+"""
+Tests for assistant registration on the Vapi call path.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.call_provider import CircuitOpenError
+from app.services.vapi_service import VapiService
+
+
+def make_service(handler):
+    service = VapiService()
+    service._assistant_id = None
+    service._client = httpx.AsyncClient(base_url="https://vapi.test", transport=httpx.MockTransport(handler))
+    return service
+
+
+def place_calls(service, count):
+    async def run():
+        try:
+            return [
+                await service.create_call("+15551234567", "Dentist at 3pm", reminder_id=f"r{i}", idempotency_key=f"r{i}:1")
+                for i in range(count)
+            ]
+        finally:
+            await service.close()
+
+    return asyncio.run(run())
+
+
+def test_open_circuit_defers_before_registering_the_assistant():
+    requests = []
+    service = make_service(lambda request: requests.append(request) or httpx.Response(500))
+    service.breaker._open(time.monotonic())
+
+    with pytest.raises(CircuitOpenError):
+        place_calls(service, 1)
+    assert requests == []
+
+
+def test_failed_registration_is_not_retried_by_every_call():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.url.path == "/assistant":
+            return httpx.Response(503)
+        return httpx.Response(201, json={"id": f"call-{len(requests)}", "status": "queued"})
+
+    service = make_service(handler)
+    place_calls(service, 3)
+
+    assert [request.url.path for request in requests] == ["/assistant", "/call", "/call", "/call"]
+    # Calls go out with the assistant inline meanwhile
+    assert all(b'"assistant"' in request.content for request in requests[1:])
+
+
+def test_registered_assistant_is_referenced_by_id():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.url.path == "/assistant" and request.method == "GET":
+            return httpx.Response(200, json=[{"id": "assistant-1", "name": service.assistant_name}])
+        return httpx.Response(201, json={"id": "call-1", "status": "queued"})
+
+    service = make_service(handler)
+    place_calls(service, 2)
+
+    assert [request.url.path for request in requests] == ["/assistant", "/call", "/call"]
+    assert all(b'"assistantId":"assistant-1"' in request.content.replace(b" ", b"") for request in requests[1:])
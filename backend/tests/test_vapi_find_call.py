@@ -0,0 +1,97 @@
+"""
+Tests for looking Vapi calls up by idempotency key.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from app.services.call_provider import CallLookupInconclusiveError
+from app.services.vapi_service import FIND_CALL_PAGE_SIZE, VapiService
+
+START = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+def make_calls(count, key_at=None, same_time=False):
+    """Calls one millisecond apart (or all at START), the one at ``key_at`` carrying the key."""
+    return [
+        {
+            "id": f"call-{i}",
+            "status": "ended",
+            "createdAt": (START if same_time else START + timedelta(milliseconds=i)).isoformat(),
+            "metadata": {"idempotency_key": "reminder:1" if i == key_at else f"other:{i}"},
+        }
+        for i in range(count)
+    ]
+
+
+def find(calls, until=START + timedelta(hours=1)):
+    """Run find_call against a fake GET /call with Vapi's paging: inclusive bounds, newest first."""
+    requests = []
+
+    def list_calls(request):
+        requests.append(request)
+        params = request.url.params
+        since = datetime.fromisoformat(params["createdAtGe"])
+        upper = datetime.fromisoformat(params["createdAtLe"])
+        page = sorted(
+            (call for call in calls if since <= datetime.fromisoformat(call["createdAt"]) <= upper),
+            key=lambda call: datetime.fromisoformat(call["createdAt"]),
+            reverse=True
+        )
+        return httpx.Response(200, json=page[:int(params["limit"])])
+
+    service = VapiService()
+    service._client = httpx.AsyncClient(base_url="https://vapi.test", transport=httpx.MockTransport(list_calls))
+
+    async def run():
+        try:
+            return await service.find_call("reminder:1", "+15551234567", START - timedelta(minutes=1), until)
+        finally:
+            await service.close()
+
+    return asyncio.run(run()), requests
+
+
+def test_finds_call_on_a_later_page():
+    calls = make_calls(FIND_CALL_PAGE_SIZE * 2 + 500, key_at=0)
+
+    found, requests = find(calls)
+
+    assert found["id"] == "call-0"
+    assert len(requests) == 3
+
+
+def test_returns_none_once_the_window_is_exhausted():
+    calls = make_calls(FIND_CALL_PAGE_SIZE * 3 + 10)
+
+    found, requests = find(calls)
+
+    assert found is None
+    assert len(requests) == 4
+
+
+def test_full_page_that_ends_the_window_is_followed_by_one_more_request():
+    calls = make_calls(FIND_CALL_PAGE_SIZE)
+
+    found, requests = find(calls)
+
+    assert found is None
+    assert len(requests) == 2
+
+
+def test_calls_after_until_are_not_searched():
+    calls = make_calls(10, key_at=9)
+
+    found, _ = find(calls, until=START + timedelta(milliseconds=5))
+
+    assert found is None
+
+
+def test_more_than_a_page_at_one_instant_is_inconclusive():
+    calls = make_calls(FIND_CALL_PAGE_SIZE + 1, same_time=True)
+
+    with pytest.raises(CallLookupInconclusiveError):
+        find(calls)
@@ -0,0 +1,243 @@
+"""
+Tests for webhook event deduplication and ordering.
+"""
+
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.dml import Insert
+
+from app.main import app
+from app.models.call_dispatch import CallDispatch
+from app.models.reminder import Reminder, ReminderStatus
+from app.models.webhook_event import WebhookEvent
+from app.services import webhook_queue
+from app.services.webhook_queue import CALL_ENDED, CALL_FAILED, WebhookEventConsumer, event_key
+
+
+class FakeResult:
+    def __init__(self, rows=(), scalars=()):
+        self.rows = list(rows)
+        self._scalars = list(scalars)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def scalars(self):
+        return FakeResult(rows=self._scalars, scalars=self._scalars)
+
+    def all(self):
+        return list(self._scalars)
+
+
+class FakeSession:
+    """Answers the consumer's queries from in-memory reminders, dispatches and processed keys."""
+
+    def __init__(self, reminders=(), dispatches=None):
+        self.reminders = {reminder.id: reminder for reminder in reminders}
+        self.dispatches = dispatches or {}
+        self.processed = set()
+        self.inserted = []
+
+    async def execute(self, statement, params=None):
+        if isinstance(statement, Insert):
+            if params is not None:
+                # Ingestion: WebhookEvent rows as executemany parameters
+                self.inserted.extend(params)
+                return FakeResult()
+            values = statement.compile(dialect=postgresql.dialect()).params
+            keys = [value for name, value in values.items() if name.startswith("event_key")]
+            recorded = [key for key in keys if key not in self.processed]
+            self.processed.update(recorded)
+            return FakeResult(scalars=recorded)
+
+        names = [column["name"] for column in statement.column_descriptions]
+        if statement.column_descriptions[0]["entity"] is CallDispatch:
+            return FakeResult(rows=[
+                SimpleNamespace(call_id=call_id, attempt=attempt) for call_id, attempt in self.dispatches.items()
+            ])
+        if names == ["vapi_call_id", "id"]:
+            return FakeResult(rows=[
+                SimpleNamespace(vapi_call_id=reminder.vapi_call_id, id=reminder.id)
+                for reminder in self.reminders.values()
+                if reminder.vapi_call_id
+            ])
+        return FakeResult(scalars=self.reminders.values())
+
+    async def commit(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture(autouse=True)
+def no_notifications(monkeypatch):
+    async def notify(db, reminder, deleted=False):
+        pass
+
+    monkeypatch.setattr(webhook_queue, "notify_reminder_changed_async", notify)
+
+
+def make_reminder(**overrides) -> Reminder:
+    values = {
+        "id": uuid.uuid4(),
+        "status": ReminderStatus.SCHEDULED,
+        "call_attempts": 1,
+        "vapi_call_id": None,
+        "version": 3,
+    }
+    values.update(overrides)
+    return Reminder(**values)
+
+
+event_ids = iter(range(1, 1_000_000))
+
+
+def make_event(reminder_id, event_type=CALL_ENDED, call_id="call-1") -> WebhookEvent:
+    return WebhookEvent(
+        id=next(event_ids),
+        provider="vapi",
+        event_type=event_type,
+        reminder_id=reminder_id,
+        call_id=call_id,
+        event_key=event_key("vapi", call_id),
+        error_message="Busy" if event_type == CALL_FAILED else None,
+    )
+
+
+def make_consumer() -> WebhookEventConsumer:
+    return WebhookEventConsumer(batch_size=100, interval=1.0, max_attempts=3)
+
+
+def test_outcomes_of_one_call_share_a_key():
+    assert event_key("vapi", "call-1") == event_key("vapi", "call-1")
+    assert event_key("vapi", "call-1") != event_key("twilio", "call-1")
+    assert event_key("vapi", "call-1") != event_key("vapi", "call-2")
+    assert event_key("vapi", None) is None
+
+
+def test_repeated_delivery_is_acknowledged_without_queueing(monkeypatch):
+    db = FakeSession()
+    monkeypatch.setattr(webhook_queue, "AsyncSessionLocal", lambda: db)
+    payload = {"type": CALL_ENDED, "call": {"id": f"call-{uuid.uuid4()}", "metadata": {"reminder_id": str(uuid.uuid4())}}}
+    client = TestClient(app)
+
+    first = client.post("/api/v1/webhooks/vapi", json=payload)
+    second = client.post("/api/v1/webhooks/vapi", json=payload)
+
+    assert first.status_code == 202
+    assert second.status_code == 200
+    assert second.json() == {"status": "duplicate"}
+    assert len(db.inserted) == 1
+
+
+def test_event_with_neither_reminder_nor_call_id_is_ignored(monkeypatch):
+    db = FakeSession()
+    monkeypatch.setattr(webhook_queue, "AsyncSessionLocal", lambda: db)
+
+    response = TestClient(app).post("/api/v1/webhooks/vapi", json={"type": CALL_ENDED, "call": {}})
+
+    assert response.json() == {"status": "ignored", "reason": "no_reminder_id"}
+    assert db.inserted == []
+
+
+def test_redelivered_event_is_applied_once():
+    reminder = make_reminder(call_attempts=1)
+    db = FakeSession([reminder])
+    consumer = make_consumer()
+
+    asyncio.run(consumer.apply(db, [make_event(reminder.id, CALL_FAILED)]))
+    asyncio.run(consumer.apply(db, [make_event(reminder.id, CALL_FAILED)]))
+
+    assert reminder.version == 4
+    assert consumer.applied == 1
+    assert consumer.duplicates == 1
+
+
+def test_duplicates_within_a_batch_are_applied_once():
+    reminder = make_reminder()
+    db = FakeSession([reminder])
+    consumer = make_consumer()
+
+    asyncio.run(consumer.apply(db, [make_event(reminder.id), make_event(reminder.id)]))
+
+    assert consumer.applied == 1
+    assert consumer.duplicates == 1
+
+
+def test_failure_arriving_after_completion_is_dropped():
+    reminder = make_reminder()
+    db = FakeSession([reminder])
+    consumer = make_consumer()
+
+    asyncio.run(consumer.apply(db, [make_event(reminder.id, CALL_ENDED, "call-1")]))
+    # A different key, so only the state check can stop it
+    asyncio.run(consumer.apply(db, [make_event(reminder.id, CALL_FAILED, "call-1b")]))
+
+    assert reminder.status == ReminderStatus.COMPLETED
+    assert reminder.last_error is None
+    assert consumer.stale == 1
+
+
+def test_outcome_of_an_earlier_attempt_is_dropped():
+    reminder = make_reminder(call_attempts=2, vapi_call_id="call-2")
+    db = FakeSession([reminder], dispatches={"call-1": 1, "call-2": 2})
+    consumer = make_consumer()
+
+    asyncio.run(consumer.apply(db, [make_event(reminder.id, CALL_ENDED, "call-1")]))
+
+    assert reminder.status == ReminderStatus.SCHEDULED
+    assert reminder.version == 3
+    assert consumer.stale == 1
+
+
+def test_outcome_of_the_latest_attempt_applies_before_the_call_id_is_recorded():
+    reminder = make_reminder(call_attempts=2, vapi_call_id="call-1")
+    db = FakeSession([reminder], dispatches={"call-1": 1, "call-2": 2})
+    consumer = make_consumer()
+
+    asyncio.run(consumer.apply(db, [make_event(reminder.id, CALL_ENDED, "call-2")]))
+
+    assert reminder.status == ReminderStatus.COMPLETED
+    assert reminder.vapi_call_id == "call-2"
+
+
+def test_outcome_for_another_call_without_a_dispatch_record_is_dropped():
+    reminder = make_reminder(vapi_call_id="call-2")
+    db = FakeSession([reminder])
+    consumer = make_consumer()
+
+    asyncio.run(consumer.apply(db, [make_event(reminder.id, CALL_ENDED, "call-1")]))
+
+    assert reminder.status == ReminderStatus.SCHEDULED
+    assert consumer.stale == 1
+
+
+def test_event_without_reminder_id_is_matched_by_call_id():
+    reminder = make_reminder(vapi_call_id="call-1")
+    db = FakeSession([reminder])
+    consumer = make_consumer()
+
+    asyncio.run(consumer.apply(db, [make_event(None, CALL_ENDED, "call-1")]))
+
+    assert reminder.status == ReminderStatus.COMPLETED
+    assert consumer.applied == 1
+
+
+def test_event_without_reminder_id_for_an_unknown_call_is_ignored():
+    reminder = make_reminder(vapi_call_id="call-1")
+    db = FakeSession([reminder])
+    consumer = make_consumer()
+
+    asyncio.run(consumer.apply(db, [make_event(None, CALL_ENDED, "call-9")]))
+
+    assert reminder.status == ReminderStatus.SCHEDULED
+    assert consumer.ignored == 1
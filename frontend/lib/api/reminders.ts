@@ -93,6 +93,7 @@ function buildQueryString(filters: ReminderFilters): string {
   if (filters.page) params.append("page", filters.page.toString());
   if (filters.page_size)
     params.append("page_size", filters.page_size.toString());
+  if (filters.cursor) params.append("cursor", filters.cursor);
 
   const queryString = params.toString();
   return queryString ? `?${queryString}` : "";
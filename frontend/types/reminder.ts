@@ -39,8 +39,10 @@ export interface ReminderUpdate {
 export interface ReminderListResponse {
   reminders: Reminder[];
   total: number;
-  page: number;
+  total_type?: "exact" | "estimated" | "cached";
+  page: number | null;
   page_size: number;
+  next_cursor?: string | null;
 }
 
 export interface ReminderFilters {
@@ -49,4 +51,5 @@ export interface ReminderFilters {
   sort?: "newest" | "oldest" | "title";
   page?: number;
   page_size?: number;
+  cursor?: string;
 }